@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline augmentasi variasi pertanyaan + validasi (dipakai A100_PMB_Augmentation_QLoRA.ipynb)
+
+Versi lama di notebook memproses per batch secara berurutan: generate ->
+parse -> validasi (basic, semantic, domain, dedup) -> tulis, jadi model
+generator menganggur selama validasi berjalan. Di sini tiga tahap berjalan
+bersamaan di thread terpisah, dihubungkan queue berukuran terbatas:
+
+  generate --(queue)--> validasi --(queue)--> tulis
+
+- Back-pressure: jika tahap berikutnya tertinggal, put() ke queue yang penuh
+  menahan tahap sebelumnya (maks queue_size batch menunggu per queue), jadi
+  memori tetap terbatas
+- Validasi satu thread dan batch diproses sesuai urutan, jadi output dan
+  statistik (termasuk dedup) identik dengan mode berurutan
+- Per tahap dicatat: jumlah batch/item, waktu kerja, waktu menunggu input,
+  waktu tertahan back-pressure, throughput dan latency per batch
+- Error di salah satu tahap menghentikan semua tahap dan dilempar ulang
+
+Validator cukup berupa objek dengan interface yang sama (check_pairs,
+validate_question, ...), jadi bisa diuji di CPU dengan model kecil dan
+validator stub (lihat benchmark_augmentation_pipeline.py).
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from tqdm.auto import tqdm
+
+_DONE = object()
+
+
+class StageStats:
+    '''Counter throughput/latency satu tahap pipeline'''
+
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.busy = 0.0
+        self.wait_input = 0.0
+        self.blocked = 0.0
+        self.latencies = []
+        self.started = None
+        self.finished = None
+
+    def record(self, items, seconds):
+        self.batches += 1
+        self.items += items
+        self.busy += seconds
+        self.latencies.append(seconds)
+
+    def summary(self):
+        wall = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'busy_s': round(self.busy, 3),
+            'wait_input_s': round(self.wait_input, 3),
+            'blocked_s': round(self.blocked, 3),
+            'utilization': round(self.busy / wall, 3) if wall > 0 else 0.0,
+            'items_per_s': round(self.items / self.busy, 2) if self.busy > 0 else 0.0,
+            'latency_mean_ms': round(float(latencies.mean()) * 1000, 1),
+            'latency_p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 1),
+            'latency_max_ms': round(float(latencies.max()) * 1000, 1),
+        }
+
+
+def print_stage_stats(stages):
+    print(f" {'Tahap':<10} {'Batch':>6} {'Item':>7} {'Item/s':>9} {'Util':>6} {'Tunggu':>8} "
+          f"{'Tertahan':>9} {'Lat mean':>9} {'Lat p95':>8}")
+    for stage in stages:
+        s = stage.summary()
+        print(f" {stage.name:<10} {s['batches']:>6} {s['items']:>7} {s['items_per_s']:>9.1f} "
+              f"{s['utilization']:>6.0%} {s['wait_input_s']:>7.1f}s {s['blocked_s']:>8.1f}s "
+              f"{s['latency_mean_ms']:>7.0f}ms {s['latency_p95_ms']:>6.0f}ms")
+
+
+class EnhancedAugmentationPipeline:
+    def __init__(self, config, model, tokenizer, semantic_validator,
+                 dedup_validator, pmb_validator, quality_validator, gpu_monitor=None,
+                 queue_size=None):
+        self.config = config
+        self.model = model
+        self.tokenizer = tokenizer
+        self.semantic_val = semantic_validator
+        self.dedup_val = dedup_validator
+        self.pmb_val = pmb_validator
+        self.quality_val = quality_validator
+        self.gpu_monitor = gpu_monitor
+        self.queue_size = queue_size or getattr(config, 'pipeline_queue_size', 2)
+
+        self.stats = {
+            'total_processed': 0,
+            'success': 0,
+            'failed': 0,
+            'total_variations': 0,
+            'rejected_basic': 0,
+            'rejected_semantic': 0,
+            'rejected_domain': 0,
+            'rejected_duplicate': 0,
+        }
+        self.stages = []
+
+    def create_prompt(self, question: str) -> str:
+        return f'''Buat 3 variasi pertanyaan BERBEDA struktur tentang topik YANG SAMA:
+
+Pertanyaan asli: {question}
+
+PENTING:
+- Setiap variasi HARUS berbeda struktur
+- Tetap dalam konteks PMB/admisi universitas
+- Jangan ubah maksud pertanyaan
+- Format output WAJIB:
+
+VARIATION 1: [pertanyaan]
+VARIATION 2: [pertanyaan]
+VARIATION 3: [pertanyaan]'''
+
+    def parse_variations(self, text: str) -> List[str]:
+        variations = []
+        text = text.replace('Jawaban:', '').replace('**', '').strip()
+        pattern = r'VARIATION\s*\d+:\s*([^\n]+)'
+        matches = re.findall(pattern, text, re.IGNORECASE)
+
+        for match in matches:
+            q_text = match.strip().strip('"\'-•')
+            q_text = re.sub(r'\([^)]*\)', '', q_text).strip()
+            q_text = ' '.join(q_text.split())
+
+            if len(q_text) > 10:
+                variations.append(q_text)
+
+        return variations
+
+    @torch.inference_mode()
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        try:
+            device = torch.device(self.config.device)
+            encoded = self.tokenizer(
+                prompts,
+                padding=True,
+                truncation=True,
+                max_length=512,
+                return_tensors='pt'
+            )
+
+            input_ids = encoded['input_ids'].to(device)
+            attention_mask = encoded['attention_mask'].to(device)
+
+            autocast = (torch.autocast(device_type='cuda', dtype=torch.bfloat16)
+                        if device.type == 'cuda' else nullcontext())
+            with autocast:
+                outputs = self.model.generate(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    max_new_tokens=self.config.max_new_tokens,
+                    temperature=self.config.temperature,
+                    top_p=self.config.top_p,
+                    top_k=self.config.top_k,
+                    repetition_penalty=self.config.repetition_penalty,
+                    do_sample=True,
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    eos_token_id=self.tokenizer.eos_token_id,
+                    use_cache=True,
+                )
+
+            # Hanya token baru: prompt memuat contoh format 'VARIATION 1: [pertanyaan]'
+            # yang ikut ter-parse jika seluruh output di-decode
+            results = self.tokenizer.batch_decode(
+                outputs[:, input_ids.shape[1]:],
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+
+            return results
+        except Exception as e:
+            print(f'❌ Generation error: {str(e)[:50]}')
+            return [''] * len(prompts)
+
+    def extract_qa(self, entry: Dict) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            if 'messages' not in entry:
+                return None, None
+            q, a = None, None
+            for msg in entry['messages']:
+                if msg.get('role') == 'user':
+                    q = msg.get('content')
+                elif msg.get('role') == 'assistant':
+                    a = msg.get('content')
+            return q, a
+        except Exception:
+            return None, None
+
+    def create_output_entry(self, variation: str, answer: str,
+                            orig_id: str, var_num: int, metadata: Dict = None) -> Dict:
+        base_metadata = {
+            'id': f'{orig_id}_var{var_num}',
+            'format_type': 'variation',
+            'category': 'augmented',
+            'verified': True,
+            'source_id': orig_id
+        }
+        if metadata:
+            base_metadata.update(metadata)
+
+        return {
+            'messages': [
+                {'role': 'user', 'content': variation},
+                {'role': 'assistant', 'content': answer}
+            ],
+            'metadata': base_metadata
+        }
+
+    # ------------------------------------------------------------------
+    # Tahap pipeline (dipakai mode berurutan dan mode bersamaan)
+    # ------------------------------------------------------------------
+
+    def generate_items(self, items: List[Dict]) -> Tuple[List[Tuple[Dict, str, str]], List[str]]:
+        '''Tahap generate: (mapping (item, pertanyaan, jawaban), output model) untuk satu batch'''
+        prompts = []
+        mapping = []
+
+        for item in items:
+            q, a = self.extract_qa(item)
+            if q and a:
+                prompts.append(self.create_prompt(q))
+                mapping.append((item, q, a))
+
+        if not prompts:
+            return mapping, []
+        return mapping, self.generate_batch(prompts)
+
+    def validate_outputs(self, mapping, outputs, processed: int = None) -> List[Dict]:
+        '''Tahap validasi: parse + basic + semantic + domain + dedup -> entry output'''
+        entries = []
+        if not mapping:
+            return entries
+        if processed is None:
+            processed = self.stats['total_processed']
+
+        # 1. PARSE + BASIC VALIDATION (semua item di chunk)
+        parsed = []
+        for (item, original_q, answer), output in zip(mapping, outputs):
+            try:
+                variations = self.parse_variations(output)
+                if not variations:
+                    self.stats['failed'] += 1
+                    continue
+
+                candidates = []
+                for variation in variations:
+                    basic_valid, basic_issues = self.quality_val.validate_question(
+                        variation, original_q
+                    )
+                    if not basic_valid:
+                        self.stats['rejected_basic'] += 1
+                        continue
+                    candidates.append(variation)
+
+                parsed.append((item, original_q, answer, candidates))
+            except Exception:
+                self.stats['failed'] += 1
+
+        # 2. SEMANTIC VALIDATION: satu encode + satu perkalian matriks untuk seluruh chunk
+        semantic_checks = self.semantic_val.check_pairs(
+            [original_q for _, original_q, _, candidates in parsed for _ in candidates],
+            [variation for _, _, _, candidates in parsed for variation in candidates]
+        )
+
+        offset = 0
+        for item, original_q, answer, candidates in parsed:
+            checks = semantic_checks[offset:offset + len(candidates)]
+            offset += len(candidates)
+            try:
+                self.dedup_val.reset()
+                valid_entries = []
+
+                for variation, (semantic_valid, semantic_score) in zip(candidates, checks):
+                    if not semantic_valid:
+                        self.stats['rejected_semantic'] += 1
+                        continue
+
+                    # 3. DOMAIN VALIDATION
+                    domain_valid, lost_entities = self.pmb_val.validate_entity_preservation(
+                        original_q, variation
+                    )
+                    if not domain_valid:
+                        self.stats['rejected_domain'] += 1
+                        continue
+
+                    # 4. DEDUPLICATION
+                    is_duplicate, dup_score = self.dedup_val.is_duplicate(
+                        variation,
+                        threshold=self.config.duplicate_threshold
+                    )
+                    if is_duplicate:
+                        self.stats['rejected_duplicate'] += 1
+                        continue
+
+                    valid_entries.append((variation, semantic_score))
+
+                if not valid_entries:
+                    self.stats['failed'] += 1
+                    continue
+
+                orig_id = item.get('metadata', {}).get('id', f'entry_{processed}')
+
+                for var_num, (variation, sem_score) in enumerate(valid_entries, 1):
+                    entry = self.create_output_entry(
+                        variation, answer, orig_id, var_num,
+                        metadata={'semantic_score': float(sem_score)}
+                    )
+                    entries.append(entry)
+
+                self.stats['success'] += 1
+                self.stats['total_variations'] += len(valid_entries)
+
+            except Exception:
+                self.stats['failed'] += 1
+
+        return entries
+
+    def process_batch_items(self, items: List[Dict]) -> List[Dict]:
+        '''Satu batch secara berurutan (generate lalu validasi)'''
+        mapping, outputs = self.generate_items(items)
+        return self.validate_outputs(mapping, outputs)
+
+    # ------------------------------------------------------------------
+    # Mode bersamaan: thread per tahap + queue terbatas
+    # ------------------------------------------------------------------
+
+    def _batches(self, data):
+        batch_size = self.config.batch_size
+        for batch_idx, batch_start in enumerate(range(0, len(data), batch_size)):
+            yield batch_idx, batch_start, data[batch_start:batch_start + batch_size]
+
+    @staticmethod
+    def _put(q, item, stop, stage):
+        '''put() yang tertahan selama queue penuh (back-pressure), berhenti jika ada tahap error'''
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        stage.blocked += time.perf_counter() - start
+
+    @staticmethod
+    def _get(q, stop, stage):
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                item = q.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        else:
+            item = _DONE
+        stage.wait_input += time.perf_counter() - start
+        return item
+
+    def _generate_stage(self, data, out_q, stop, stage, num_batches):
+        for batch_idx, batch_start, batch in self._batches(data):
+            if stop.is_set():
+                break
+            start = time.perf_counter()
+            mapping, outputs = self.generate_items(batch)
+            stage.record(len(batch), time.perf_counter() - start)
+
+            if batch_idx % self.config.save_every_n_batches == 0 and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+                if self.config.log_memory and self.gpu_monitor is not None:
+                    self.gpu_monitor.log(f'Batch {batch_idx}/{num_batches}')
+
+            self._put(out_q, (batch_start, len(batch), mapping, outputs, start), stop, stage)
+
+    def _validate_stage(self, in_q, out_q, stop, stage):
+        while True:
+            job = self._get(in_q, stop, stage)
+            if job is _DONE:
+                break
+            batch_start, size, mapping, outputs, created = job
+            start = time.perf_counter()
+            entries = self.validate_outputs(mapping, outputs, processed=batch_start)
+            stage.record(size, time.perf_counter() - start)
+            self._put(out_q, (size, entries, created), stop, stage)
+
+    def _write_stage(self, in_q, f, stop, stage, progress, end_to_end):
+        while True:
+            job = self._get(in_q, stop, stage)
+            if job is _DONE:
+                break
+            size, entries, created = job
+            start = time.perf_counter()
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.stats['total_processed'] += size
+            stage.record(size, time.perf_counter() - start)
+            end_to_end.append(time.perf_counter() - created)
+            progress.update(1)
+
+    def _run_stage(self, stage, target, args, out_q, stop, errors):
+        stage.started = time.perf_counter()
+        try:
+            target(*args)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            stage.finished = time.perf_counter()
+            if out_q is not None:
+                # Sentinel: tahap berikutnya selesai setelah menghabiskan queue
+                self._put(out_q, _DONE, stop, stage)
+
+    def run_concurrent(self, data: List[Dict], output_file: str) -> Dict:
+        '''Jalankan generate / validasi / tulis bersamaan. Return ringkasan per tahap.'''
+        num_batches = (len(data) + self.config.batch_size - 1) // self.config.batch_size
+        generated = queue.Queue(maxsize=self.queue_size)
+        validated = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        end_to_end = []
+
+        self.stages = [StageStats('generate'), StageStats('validasi'), StageStats('tulis')]
+        gen_stage, val_stage, write_stage = self.stages
+
+        with open(output_file, 'w', encoding='utf-8') as f, \
+                tqdm(total=num_batches, desc='Processing', unit='batch') as progress:
+            threads = [
+                threading.Thread(target=self._run_stage, name='augment-generate', daemon=True, args=(
+                    gen_stage, self._generate_stage, (data, generated, stop, gen_stage, num_batches),
+                    generated, stop, errors)),
+                threading.Thread(target=self._run_stage, name='augment-validate', daemon=True, args=(
+                    val_stage, self._validate_stage, (generated, validated, stop, val_stage),
+                    validated, stop, errors)),
+            ]
+            for thread in threads:
+                thread.start()
+            # Tahap tulis di thread pemanggil (progress bar & file di thread yang sama)
+            self._run_stage(write_stage, self._write_stage,
+                            (validated, f, stop, write_stage, progress, end_to_end), None, stop, errors)
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        summary = {stage.name: stage.summary() for stage in self.stages}
+        summary['end_to_end'] = {
+            'latency_mean_ms': round(float(np.mean(end_to_end)) * 1000, 1) if end_to_end else 0.0,
+            'latency_max_ms': round(float(np.max(end_to_end)) * 1000, 1) if end_to_end else 0.0,
+        }
+        return summary
+
+    def process_dataset(self, data: List[Dict],
+                        output_file: str = 'pmb_augmented_validated.jsonl'):
+        print(f'\n{"=" * 80}')
+        print('🚀 ENHANCED AUGMENTATION WITH VALIDATION')
+        print(f'{"=" * 80}')
+        print(f' Batch size: {self.config.batch_size}')
+        print(f' Total items: {len(data)}')
+        print(f' Validators: Basic + Semantic + Domain + Dedup')
+        print(f' Pipeline: generate | validasi | tulis (queue {self.queue_size} batch)\n')
+
+        start_time = time.time()
+        stage_summary = self.run_concurrent(data, output_file)
+        elapsed = time.time() - start_time
+
+        print(f'\n{"=" * 80}')
+        print('✅ AUGMENTATION RESULTS')
+        print(f'{"=" * 80}')
+        print(f' Total processed: {self.stats["total_processed"]}')
+        print(f' ✅ Success: {self.stats["success"]}')
+        print(f' ❌ Failed: {self.stats["failed"]}')
+        print(f' 🚫 Rejected (basic): {self.stats["rejected_basic"]}')
+        print(f' 🚫 Rejected (semantic): {self.stats["rejected_semantic"]}')
+        print(f' 🚫 Rejected (domain): {self.stats["rejected_domain"]}')
+        print(f' 🚫 Rejected (duplicate): {self.stats["rejected_duplicate"]}')
+        print(f' 📊 Total variations: {self.stats["total_variations"]}')
+        print(f' ⏱️ Time: {elapsed:.1f}s')
+        if elapsed > 0:
+            print(f' 🏃 Speed: {self.stats["total_processed"]/elapsed:.1f} items/sec')
+        print(f' 💾 Output: {output_file}')
+        print(f' 📈 Quality - Semantic: {self.semantic_val.report()}')
+        print(f' 📈 Quality - Domain: {self.pmb_val.report()}')
+        print(f' 📈 Quality - Dedup: {self.dedup_val.report()}')
+        print('\n ⚙️ Tahap pipeline:')
+        print_stage_stats(self.stages)
+        print(f' Latency end-to-end per batch: {stage_summary["end_to_end"]["latency_mean_ms"]:.0f}ms '
+              f'(maks {stage_summary["end_to_end"]["latency_max_ms"]:.0f}ms)')
+        print(f'{"=" * 80}\n')
+
+        self.stats['stages'] = stage_summary
+        return self.stats
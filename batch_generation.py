@@ -0,0 +1,326 @@
+"""
+Batch inference untuk evaluasi (dipakai yasjks.py)
+
+- generate_answers_batch: batch sesuai urutan file (perilaku lama)
+- generate_answers_bucketed: pertanyaan dikelompokkan berdasarkan panjang prompt
+  (dan opsional perkiraan panjang jawaban dari referensi), batch dijalankan per
+  bucket, lalu output dikembalikan ke urutan asli
+- generate_answers_continuous: continuous batching, sequence yang selesai langsung
+  dikeluarkan dan slot-nya diisi prompt berikutnya di step yang sama
+- Semuanya bisa melaporkan padding efficiency (token asli / token yang diproses)
+"""
+
+from collections import deque
+
+import torch
+import torch.nn.functional as F
+from transformers import DynamicCache
+
+SYSTEM_PROMPT = """Anda adalah asisten virtual untuk Penerimaan Mahasiswa Baru (PMB) di Universitas Sains Al-Qur'an."""
+
+
+def build_prompt(question, system_prompt=SYSTEM_PROMPT):
+    """Prompt format Gemma chat template"""
+    return (
+        f"<start_of_turn>system\n{system_prompt}<end_of_turn>\n"
+        f"<start_of_turn>user\n{question}<end_of_turn>\n"
+        f"<start_of_turn>model\n"
+    )
+
+
+def decode_response(tokenizer, output):
+    """Decode output generate() dan ambil bagian jawaban model"""
+    full_response = tokenizer.decode(output, skip_special_tokens=True)
+
+    # Extract response setelah "model\n" (simple split)
+    if "<start_of_turn>model\n" in full_response:
+        response = full_response.split("<start_of_turn>model\n")[-1].strip()
+    else:
+        response = full_response.strip()
+
+    return response.replace("<end_of_turn>", "").strip()
+
+
+def _new_stats():
+    return {
+        'batches': 0,
+        'prompt_tokens': 0,
+        'prompt_slots': 0,
+        'generated_tokens': 0,
+        'generated_slots': 0,
+    }
+
+
+def padding_efficiency(stats):
+    """Rasio token asli terhadap token yang diproses (prompt, generasi, total)"""
+    real = stats['prompt_tokens'] + stats['generated_tokens']
+    slots = stats['prompt_slots'] + stats['generated_slots']
+    return {
+        'prompt': stats['prompt_tokens'] / stats['prompt_slots'] if stats['prompt_slots'] else 0.0,
+        'generation': stats['generated_tokens'] / stats['generated_slots'] if stats['generated_slots'] else 0.0,
+        'total': real / slots if slots else 0.0,
+    }
+
+
+def _stop_token_ids(model, tokenizer):
+    """Token EOS yang dipakai generate() (generation_config, mis. <end_of_turn> Gemma), fallback ke tokenizer"""
+    eos = getattr(model.generation_config, 'eos_token_id', None)
+    if eos is None:
+        eos = tokenizer.eos_token_id
+    return set(eos if isinstance(eos, (list, tuple)) else [eos])
+
+
+def _run_batches(model, tokenizer, prompts, batches, max_new_tokens, stats):
+    """Generate untuk setiap batch (list index prompt), return jawaban sesuai urutan index"""
+    answers = [None] * len(prompts)
+    stop_ids = _stop_token_ids(model, tokenizer)
+    done = 0
+
+    for batch in batches:
+        print(f"   Processing {done + 1}-{done + len(batch)}/{len(prompts)}...", end='\r')
+        done += len(batch)
+
+        inputs = tokenizer([prompts[i] for i in batch], return_tensors="pt", padding=True,
+                           truncation=True, max_length=2048).to(model.device)
+
+        with torch.no_grad():
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,  # Greedy
+                pad_token_id=tokenizer.eos_token_id
+            )
+
+        input_len = inputs['input_ids'].shape[1]
+        new_tokens = outputs[:, input_len:]
+
+        stats['batches'] += 1
+        stats['prompt_tokens'] += int(inputs['attention_mask'].sum())
+        stats['prompt_slots'] += inputs['attention_mask'].numel()
+        stats['generated_slots'] += new_tokens.numel()
+        for row in new_tokens.tolist():
+            length = next((pos + 1 for pos, tok in enumerate(row) if tok in stop_ids), len(row))
+            stats['generated_tokens'] += length
+
+        for i, output in zip(batch, outputs):
+            answers[i] = decode_response(tokenizer, output)
+
+    print()  # newline
+    return answers
+
+
+def generate_answers_batch(model, tokenizer, questions, batch_size=8, system_prompt=SYSTEM_PROMPT,
+                           max_new_tokens=256, return_stats=False):
+    """Generate answers in batches sesuai urutan file"""
+    prompts = [build_prompt(q, system_prompt) for q in questions]
+    batches = [list(range(i, min(i + batch_size, len(prompts)))) for i in range(0, len(prompts), batch_size)]
+
+    stats = _new_stats()
+    answers = _run_batches(model, tokenizer, prompts, batches, max_new_tokens, stats)
+    return (answers, stats) if return_stats else answers
+
+
+def length_buckets(prompt_lengths, batch_size, expected_lengths=None, bucket_width=16):
+    """
+    Kelompokkan index ke batch berdasarkan panjang prompt (bucket selebar
+    bucket_width token), di dalam bucket diurutkan menurut perkiraan panjang jawaban.
+    """
+    if expected_lengths is None:
+        expected_lengths = [0] * len(prompt_lengths)
+
+    order = sorted(
+        range(len(prompt_lengths)),
+        key=lambda i: (prompt_lengths[i] // bucket_width, expected_lengths[i], prompt_lengths[i])
+    )
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def generate_answers_bucketed(model, tokenizer, questions, batch_size=8, references=None,
+                              system_prompt=SYSTEM_PROMPT, max_new_tokens=256, bucket_width=16,
+                              return_stats=False):
+    """
+    Generate answers dengan batch per bucket panjang; output tetap sesuai urutan `questions`.
+
+    references (opsional): jawaban referensi, panjang token-nya dipakai sebagai
+    perkiraan panjang jawaban sehingga jawaban pendek tidak menunggu jawaban panjang.
+    """
+    prompts = [build_prompt(q, system_prompt) for q in questions]
+    prompt_lengths = [len(ids) for ids in tokenizer(prompts, add_special_tokens=True)['input_ids']]
+
+    expected_lengths = None
+    if references is not None:
+        expected_lengths = [len(ids) for ids in tokenizer(references, add_special_tokens=False)['input_ids']]
+
+    batches = length_buckets(prompt_lengths, batch_size, expected_lengths, bucket_width)
+
+    stats = _new_stats()
+    answers = _run_batches(model, tokenizer, prompts, batches, max_new_tokens, stats)
+    return (answers, stats) if return_stats else answers
+
+
+# ============================================================================
+# CONTINUOUS BATCHING
+# ============================================================================
+def _cache_layers(cache):
+    """List (keys, values) per layer, tensor [batch, heads, seq, dim]"""
+    if hasattr(cache, 'layers'):
+        return [(layer.keys, layer.values) for layer in cache.layers]
+    return list(zip(cache.key_cache, cache.value_cache))
+
+
+def _build_cache(layers):
+    cache = DynamicCache()
+    for layer_idx, (keys, values) in enumerate(layers):
+        cache.update(keys, values, layer_idx)
+    return cache
+
+
+class ContinuousBatcher:
+    """
+    Greedy decoding dengan continuous batching di atas KV cache left-padded.
+
+    Setiap step: sequence yang sudah EOS / max_new_tokens dikeluarkan dari batch,
+    slot kosong diisi prompt baru (prefill lalu cache-nya digabung ke batch aktif),
+    kemudian satu forward pass decode untuk semua sequence aktif. Position id
+    dihitung dari attention mask, jadi hasilnya sama dengan generate() per batch.
+    """
+
+    def __init__(self, model, tokenizer, batch_size=8, max_new_tokens=256, max_length=2048):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_new_tokens = max_new_tokens
+        self.max_length = max_length
+        self.stop_ids = _stop_token_ids(model, tokenizer)
+        self.pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+        self.stats = _new_stats()
+        self.stats['decode_steps'] = 0
+
+        # State batch aktif
+        self.rows = []      # per baris: {'index', 'prompt_ids', 'generated'}
+        self.layers = None  # list (keys, values)
+        self.mask = None    # [batch, seq]
+
+    def _forward(self, input_ids, attention_mask, cache):
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)[:, -input_ids.shape[1]:]
+        with torch.no_grad():
+            out = self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=cache,
+                use_cache=True,
+                logits_to_keep=1,
+            )
+        return out.logits[:, -1, :].argmax(dim=-1).tolist(), _cache_layers(out.past_key_values)
+
+    def _admit(self, items):
+        """Prefill prompt baru (left-padded) lalu gabungkan cache-nya ke batch aktif"""
+        device = self.model.device
+        width = max(len(ids) for _, ids in items)
+        input_ids = torch.full((len(items), width), self.pad_id, dtype=torch.long)
+        mask = torch.zeros((len(items), width), dtype=torch.long)
+        for row, (_, ids) in enumerate(items):
+            input_ids[row, width - len(ids):] = torch.tensor(ids, dtype=torch.long)
+            mask[row, width - len(ids):] = 1
+        mask = mask.to(device)
+
+        next_tokens, layers = self._forward(input_ids.to(device), mask, DynamicCache())
+
+        self.stats['batches'] += 1
+        self.stats['prompt_tokens'] += int(mask.sum())
+        self.stats['prompt_slots'] += mask.numel()
+        self.stats['generated_tokens'] += len(items)
+        self.stats['generated_slots'] += len(items)
+
+        if self.layers is None:
+            self.layers, self.mask = layers, mask
+        else:
+            # Samakan panjang cache dengan padding di kiri, lalu gabung di dimensi batch
+            total = max(self.mask.shape[1], width)
+            pad_old, pad_new = total - self.mask.shape[1], total - width
+            self.layers = [
+                (torch.cat([F.pad(k0, (0, 0, pad_old, 0)), F.pad(k1, (0, 0, pad_new, 0))]),
+                 torch.cat([F.pad(v0, (0, 0, pad_old, 0)), F.pad(v1, (0, 0, pad_new, 0))]))
+                for (k0, v0), (k1, v1) in zip(self.layers, layers)
+            ]
+            self.mask = torch.cat([F.pad(self.mask, (pad_old, 0)), F.pad(mask, (pad_new, 0))])
+
+        for (index, ids), token in zip(items, next_tokens):
+            self.rows.append({'index': index, 'prompt_ids': ids, 'generated': [token]})
+
+    def _is_done(self, row):
+        return row['generated'][-1] in self.stop_ids or len(row['generated']) >= self.max_new_tokens
+
+    def _retire(self):
+        """Keluarkan sequence yang selesai, return [(index, prompt_ids + generated)]"""
+        keep = [i for i, row in enumerate(self.rows) if not self._is_done(row)]
+        finished = [(row['index'], row['prompt_ids'] + row['generated'])
+                    for row in self.rows if self._is_done(row)]
+        if not finished:
+            return finished
+
+        self.rows = [self.rows[i] for i in keep]
+        if not keep:
+            self.layers, self.mask = None, None
+            return finished
+
+        select = torch.tensor(keep, device=self.mask.device)
+        mask = self.mask.index_select(0, select)
+        # Buang kolom kiri yang sudah padding untuk semua baris tersisa
+        start = int((mask.sum(dim=0) > 0).nonzero()[0])
+        self.mask = mask[:, start:]
+        self.layers = [
+            (k.index_select(0, select)[:, :, start:], v.index_select(0, select)[:, :, start:])
+            for k, v in self.layers
+        ]
+        return finished
+
+    def _decode_step(self):
+        device = self.mask.device
+        input_ids = torch.tensor([[row['generated'][-1]] for row in self.rows], device=device)
+        mask = torch.cat([self.mask, torch.ones((len(self.rows), 1), dtype=self.mask.dtype, device=device)], dim=1)
+
+        next_tokens, self.layers = self._forward(input_ids, mask, _build_cache(self.layers))
+        self.mask = mask
+
+        for row, token in zip(self.rows, next_tokens):
+            row['generated'].append(token)
+        self.stats['decode_steps'] += 1
+        self.stats['generated_tokens'] += len(self.rows)
+        self.stats['generated_slots'] += len(self.rows)
+
+    def run(self, prompts):
+        """Yield (index, token ids prompt + jawaban) begitu sebuah sequence selesai"""
+        pending = deque(
+            (i, ids) for i, ids in enumerate(
+                self.tokenizer(prompts, truncation=True, max_length=self.max_length)['input_ids'])
+        )
+
+        while pending or self.rows:
+            free = self.batch_size - len(self.rows)
+            if free and pending:
+                self._admit([pending.popleft() for _ in range(min(free, len(pending)))])
+                yield from self._retire()
+                if not self.rows:
+                    continue
+
+            self._decode_step()
+            yield from self._retire()
+
+
+def generate_answers_continuous(model, tokenizer, questions, batch_size=8, system_prompt=SYSTEM_PROMPT,
+                                max_new_tokens=256, return_stats=False):
+    """Drop-in pengganti generate_answers_batch dengan continuous batching (greedy)"""
+    prompts = [build_prompt(q, system_prompt) for q in questions]
+    batcher = ContinuousBatcher(model, tokenizer, batch_size=batch_size, max_new_tokens=max_new_tokens)
+
+    answers = [None] * len(prompts)
+    done = 0
+    for index, token_ids in batcher.run(prompts):
+        answers[index] = decode_response(tokenizer, token_ids)
+        done += 1
+        print(f"   Finished {done}/{len(prompts)}...", end='\r')
+
+    print()  # newline
+    return (answers, batcher.stats) if return_stats else answers
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark pipeline augmentasi: generate -> validasi -> tulis berurutan per batch (cara lama di notebook)
+vs EnhancedAugmentationPipeline.run_concurrent (tahap bersamaan dengan queue terbatas)
+Jalan di CPU: model causal LM lokal apa pun (--model), atau tanpa --model model Llama kecil
+berbobot acak + tokenizer karakter dibuat di memori. Validator stub menerima semua variasi dan
+menunggu --validate-ms per batch untuk meniru encode model semantik.
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import string
+import tempfile
+import time
+from types import SimpleNamespace
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from augmentation_pipeline import EnhancedAugmentationPipeline, print_stage_stats
+
+
+class StubValidator:
+    '''Pengganti semantic/dedup/domain/quality validator: terima semua, dengan jeda tetap per batch'''
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pairs = 0
+
+    def check_pairs(self, originals, variations):
+        time.sleep(self.delay)
+        self.pairs += len(variations)
+        return [(True, 1.0)] * len(variations)
+
+    def validate_question(self, q, original_q):
+        return True, []
+
+    def validate_entity_preservation(self, original_q, variation_q):
+        return True, []
+
+    def is_duplicate(self, question, threshold=None):
+        return False, 0.0
+
+    def reset(self):
+        pass
+
+    def report(self):
+        return f'stub ({self.pairs} pasangan)'
+
+
+def tiny_model(texts, hidden_size=64, layers=2):
+    '''Model Llama kecil berbobot acak + tokenizer level karakter (tanpa download)'''
+    from tokenizers import Tokenizer, models, pre_tokenizers, decoders
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    chars = sorted(set(''.join(texts)))
+    vocab = {token: i for i, token in enumerate(['<pad>', '<unk>', '<eos>'] + chars)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token='<unk>'))
+    backend.pre_tokenizer = pre_tokenizers.Split('', behavior='isolated')
+    backend.decoder = decoders.Fuse()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, pad_token='<pad>',
+                                        unk_token='<unk>', eos_token='<eos>', padding_side='left')
+
+    config = LlamaConfig(vocab_size=len(vocab), hidden_size=hidden_size, intermediate_size=hidden_size * 2,
+                         num_hidden_layers=layers, num_attention_heads=4, num_key_value_heads=4,
+                         max_position_embeddings=1024, pad_token_id=0, eos_token_id=2, bos_token_id=2)
+    return LlamaForCausalLM(config), tokenizer
+
+
+def load_items(path, limit=None):
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                items.append(json.loads(line))
+            if limit and len(items) >= limit:
+                break
+    return items
+
+
+def make_pipeline(config, model, tokenizer, delay, queue_size):
+    validator = StubValidator(delay)
+    return EnhancedAugmentationPipeline(config, model, tokenizer, validator, validator, validator, validator,
+                                        queue_size=queue_size)
+
+
+def run_sequential(pipeline, data, output_file):
+    '''Cara lama: setiap batch generate -> validasi -> tulis sebelum batch berikutnya'''
+    batch_size = pipeline.config.batch_size
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for batch_start in range(0, len(data), batch_size):
+            batch = data[batch_start:batch_start + batch_size]
+            for entry in pipeline.process_batch_items(batch):
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            pipeline.stats['total_processed'] += len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', help='Path model causal LM lokal (default: model kecil acak)')
+    parser.add_argument('--data', default='data/fix.jsonl')
+    parser.add_argument('--limit', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--max-new-tokens', type=int, default=32)
+    parser.add_argument('--validate-ms', type=float, default=150, help='Jeda validator stub per batch')
+    parser.add_argument('--queue-size', type=int, default=2)
+    args = parser.parse_args()
+
+    data = load_items(args.data, args.limit)
+    if args.model:
+        tokenizer = AutoTokenizer.from_pretrained(args.model)
+        tokenizer.padding_side = 'left'
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        model = AutoModelForCausalLM.from_pretrained(args.model)
+    else:
+        torch.manual_seed(0)
+        texts = [m['content'] for item in data for m in item['messages']]
+        model, tokenizer = tiny_model(texts + [string.printable])
+    model.eval()
+
+    config = SimpleNamespace(
+        device='cpu', batch_size=args.batch_size, max_new_tokens=args.max_new_tokens,
+        temperature=0.5, top_p=0.85, top_k=50, repetition_penalty=1.05,
+        duplicate_threshold=0.90, save_every_n_batches=10, log_memory=False,
+    )
+    delay = args.validate_ms / 1000
+
+    print("=" * 100)
+    print(f"BENCHMARK PIPELINE AUGMENTASI ({len(data)} item, batch {args.batch_size}, "
+          f"max_new_tokens {args.max_new_tokens}, validator stub {args.validate_ms:.0f}ms/batch)")
+    print("=" * 100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential_file = os.path.join(tmp, 'sequential.jsonl')
+        concurrent_file = os.path.join(tmp, 'concurrent.jsonl')
+
+        torch.manual_seed(42)
+        sequential = make_pipeline(config, model, tokenizer, delay, args.queue_size)
+        start = time.perf_counter()
+        run_sequential(sequential, data, sequential_file)
+        sequential_seconds = time.perf_counter() - start
+
+        torch.manual_seed(42)
+        concurrent = make_pipeline(config, model, tokenizer, delay, args.queue_size)
+        start = time.perf_counter()
+        concurrent.run_concurrent(data, concurrent_file)
+        concurrent_seconds = time.perf_counter() - start
+
+        identical = filecmp.cmp(sequential_file, concurrent_file, shallow=False)
+
+    print(f"Berurutan : {sequential_seconds:>7.2f}s {len(data) / sequential_seconds:>7.1f} item/s")
+    print(f"Bersamaan : {concurrent_seconds:>7.2f}s {len(data) / concurrent_seconds:>7.1f} item/s "
+          f"(queue {args.queue_size} batch)")
+    print(f"Speedup   : {sequential_seconds / concurrent_seconds:.2f}x")
+    print(f"Output identik: {'ya' if identical else 'TIDAK'} | stats identik: "
+          f"{'ya' if sequential.stats == concurrent.stats else 'TIDAK'}")
+    print()
+    print_stage_stats(concurrent.stages)
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
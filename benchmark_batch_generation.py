@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark batch inference: urutan file (generate_answers_batch) vs bucket panjang (generate_answers_bucketed)
+vs continuous batching (generate_answers_continuous)
+Input: data/test.jsonl (format messages), model causal LM lokal apa pun (bisa model kecil di CPU)
+"""
+
+import argparse
+import json
+import time
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from batch_generation import (generate_answers_batch, generate_answers_bucketed, generate_answers_continuous,
+                              padding_efficiency)
+
+
+def load_questions(path, limit=None):
+    """Ambil (pertanyaan, jawaban referensi) dari file JSONL format messages"""
+    questions, references = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            messages = json.loads(line)['messages']
+            user = next((m['content'] for m in messages if m['role'] == 'user'), '')
+            answer = next((m['content'] for m in messages if m['role'] == 'assistant'), '')
+            if user and answer:
+                questions.append(user)
+                references.append(answer)
+            if limit and len(questions) >= limit:
+                break
+    return questions, references
+
+
+def report(name, seconds, n, stats):
+    eff = padding_efficiency(stats)
+    print(f"{name:<28} {seconds:>8.2f}s {n / seconds:>8.2f} q/s   "
+          f"padding eff: prompt {eff['prompt']:.1%} | generation {eff['generation']:.1%} | total {eff['total']:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', required=True, help='Path/nama model causal LM')
+    parser.add_argument('--data', default='data/test.jsonl')
+    parser.add_argument('--limit', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--max-new-tokens', type=int, default=64)
+    parser.add_argument('--bucket-width', type=int, default=16)
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    tokenizer.padding_side = 'left'
+    model = AutoModelForCausalLM.from_pretrained(args.model)
+    model.eval()
+
+    questions, references = load_questions(args.data, args.limit)
+
+    print("=" * 110)
+    print(f"BENCHMARK BATCH GENERATION ({len(questions)} pertanyaan, batch {args.batch_size}, "
+          f"max_new_tokens {args.max_new_tokens})")
+    print("=" * 110)
+
+    start = time.time()
+    static, static_stats = generate_answers_batch(
+        model, tokenizer, questions, args.batch_size,
+        max_new_tokens=args.max_new_tokens, return_stats=True)
+    report("Urutan file", time.time() - start, len(questions), static_stats)
+
+    start = time.time()
+    bucketed, bucketed_stats = generate_answers_bucketed(
+        model, tokenizer, questions, args.batch_size, bucket_width=args.bucket_width,
+        max_new_tokens=args.max_new_tokens, return_stats=True)
+    report("Bucket prompt", time.time() - start, len(questions), bucketed_stats)
+
+    start = time.time()
+    with_refs, with_refs_stats = generate_answers_bucketed(
+        model, tokenizer, questions, args.batch_size, references=references,
+        bucket_width=args.bucket_width, max_new_tokens=args.max_new_tokens, return_stats=True)
+    report("Bucket prompt + referensi", time.time() - start, len(questions), with_refs_stats)
+
+    start = time.time()
+    continuous, continuous_stats = generate_answers_continuous(
+        model, tokenizer, questions, args.batch_size, max_new_tokens=args.max_new_tokens, return_stats=True)
+    report("Continuous batching", time.time() - start, len(questions), continuous_stats)
+
+    print("-" * 110)
+    same = sum(a == b for a, b in zip(static, bucketed))
+    same_refs = sum(a == b for a, b in zip(static, with_refs))
+    same_cont = sum(a == b for a, b in zip(static, continuous))
+    print(f"Jawaban identik dengan urutan file: bucket {same}/{len(questions)} | "
+          f"bucket + referensi {same_refs}/{len(questions)} | continuous {same_cont}/{len(questions)}")
+    print("=" * 110)
+
+
+if __name__ == "__main__":
+    main()
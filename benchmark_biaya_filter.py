@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark filter biaya: fungsi lama (scan `in` per keyword + regex) vs KeywordFilter
+Input: train_pmb_augmented.json (format [{"text": "..."}, ...])
+"""
+
+import argparse
+import json
+import re
+import time
+
+from biaya_filter import BIAYA_FILTER, BIAYA_KEYWORDS
+
+
+def legacy_contains_biaya_keywords(text):
+    """Implementasi lama: lowercase lalu satu scan `in` per keyword, plus regex mata uang"""
+    text_lower = text.lower()
+
+    for keyword in BIAYA_KEYWORDS:
+        if keyword in text_lower:
+            return True
+
+    if re.search(r'rp\s*\d', text_lower):
+        return True
+
+    return False
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', default='train_pmb_augmented.json')
+    parser.add_argument('--field', default='text')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        texts = [item.get(args.field, '') for item in json.load(f)]
+
+    legacy_time, legacy = best_of(args.repeat, lambda: [legacy_contains_biaya_keywords(t) for t in texts])
+    match_time, matched = best_of(args.repeat, lambda: [BIAYA_FILTER.matches(t) for t in texts])
+    hits_time, hits = best_of(args.repeat, lambda: [BIAYA_FILTER.hits(t) for t in texts])
+
+    mismatches = sum(a != b for a, b in zip(legacy, matched))
+    mismatches += sum(a != bool(h) for a, h in zip(legacy, hits))
+
+    print("=" * 80)
+    print(f"BENCHMARK FILTER BIAYA ({len(texts)} record, best of {args.repeat})")
+    print("=" * 80)
+    print(f"{'Fungsi lama (in per keyword)':<40} {legacy_time * 1000:>9.1f} ms")
+    print(f"{'KeywordFilter.matches':<40} {match_time * 1000:>9.1f} ms "
+          f"({legacy_time / match_time:.1f}x)")
+    print(f"{'KeywordFilter.hits (audit)':<40} {hits_time * 1000:>9.1f} ms "
+          f"({legacy_time / hits_time:.1f}x)")
+    print("-" * 80)
+    print(f"Record terdeteksi biaya: {sum(legacy)} | Perbedaan keputusan: {mismatches}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark backend Parquet: ukuran file dan waktu load semua file JSON sumber
+(json.load per file, cara script lama) vs satu file Parquet (semua kolom,
+projection Q/A, dan filter category != biaya)
+"""
+
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+from columnar import iter_parquet, write_parquet
+
+
+def best_time(fn, repeat):
+    seconds, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds, result
+
+
+def load_json_all(paths):
+    rows = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rows += sum(len(item['variations']) if 'variations' in item else 1 for item in data)
+    return rows
+
+
+def load_json_filtered(paths):
+    """Cara lama untuk 'tanpa biaya': tetap harus membaca semua file lalu membuang kategori biaya"""
+    rows = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if 'biaya' in os.path.basename(path):
+            continue
+        rows += sum(len(item['variations']) if 'variations' in item else 1 for item in data)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', nargs='+', default=['*_variasi.json', '*_flat.json'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK BACKEND PARQUET")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        for pattern in args.input:
+            paths = sorted(glob.glob(pattern))
+            output = os.path.join(tmp, 'bench.parquet')
+            start = time.perf_counter()
+            rows = write_parquet(paths, output)
+            build_time = time.perf_counter() - start
+
+            json_size = sum(os.path.getsize(p) for p in paths)
+            parquet_size = os.path.getsize(output)
+
+            cases = [
+                ('JSON json.load (semua)', lambda: load_json_all(paths)),
+                ('Parquet semua kolom', lambda: sum(1 for _ in iter_parquet(output))),
+                ('Parquet kolom Q, A', lambda: sum(1 for _ in iter_parquet(output, columns=['Q', 'A']))),
+                ('JSON json.load (tanpa biaya)', lambda: load_json_filtered(paths)),
+                ('Parquet Q, A, category!=biaya',
+                 lambda: sum(1 for _ in iter_parquet(output, ['Q', 'A'], ['category!=biaya']))),
+            ]
+
+            print(f"\n{pattern}: {len(paths)} file, {rows} baris (build {build_time:.2f}s)")
+            print(f"  Ukuran JSON   : {json_size / (1 << 20):7.2f} MB")
+            print(f"  Ukuran Parquet: {parquet_size / (1 << 20):7.2f} MB ({json_size / parquet_size:.1f}x lebih kecil)")
+            for label, fn in cases:
+                seconds, count = best_time(fn, args.repeat)
+                print(f"  {label:<32} {seconds * 1000:8.1f} ms  {count:>6} baris")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark deduplikasi: scan SequenceMatcher O(n²) vs NearDuplicateIndex (MinHash + LSH)
+Input: dataset_combined_all_variations.json (format [{"Q": ..., "A": ...}, ...])
+"""
+
+import argparse
+import json
+import time
+from difflib import SequenceMatcher
+
+from near_duplicate_index import NearDuplicateIndex
+
+
+def dedup_scan(questions, threshold):
+    """Algoritma lama DeduplicationValidator.is_duplicate (scan semua pertanyaan)"""
+    seen = {}
+    decisions = []
+
+    for question in questions:
+        question_lower = question.lower().strip()
+
+        if not seen:
+            seen[question_lower] = question
+            decisions.append(False)
+            continue
+
+        max_similarity = 0
+        for seen_q in seen.keys():
+            sim = SequenceMatcher(None, question_lower, seen_q).ratio()
+            max_similarity = max(max_similarity, sim)
+
+        is_dup = max_similarity >= threshold
+        if not is_dup:
+            seen[question_lower] = question
+        decisions.append(is_dup)
+
+    return decisions
+
+
+def dedup_index(questions, threshold):
+    """Algoritma baru: kandidat dari LSH, re-check eksak hanya pada kandidat"""
+    index = NearDuplicateIndex(threshold=threshold)
+    seen = set()
+    decisions = []
+
+    for question in questions:
+        question_lower = question.lower().strip()
+
+        if question_lower in seen:
+            decisions.append(True)
+            continue
+
+        is_dup = bool(seen) and index.max_similarity(question_lower, threshold) >= threshold
+        if not is_dup:
+            seen.add(question_lower)
+            index.add(question_lower)
+        decisions.append(is_dup)
+
+    return decisions, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', default='dataset_combined_all_variations.json')
+    parser.add_argument('--sizes', default='500,1000,2000,8000',
+                        help='Jumlah pertanyaan per percobaan (dipisah koma)')
+    parser.add_argument('--threshold', type=float, default=0.90)
+    parser.add_argument('--skip-scan-above', type=int, default=2000,
+                        help='Lewati scan O(n²) untuk ukuran di atas nilai ini')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        questions = [item['Q'] for item in json.load(f)]
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print("=" * 90)
+    print(f"BENCHMARK DEDUP (threshold={args.threshold}, total pertanyaan tersedia={len(questions)})")
+    print("=" * 90)
+    print(f"{'N':>7} {'scan (s)':>10} {'index (s)':>10} {'speedup':>9} "
+          f"{'dup scan':>9} {'dup index':>10} {'agree':>8} {'cand/query':>11}")
+    print("-" * 90)
+
+    for n in sizes:
+        subset = questions[:n]
+        n = len(subset)
+
+        start = time.perf_counter()
+        index_decisions, index = dedup_index(subset, args.threshold)
+        index_time = time.perf_counter() - start
+
+        avg_candidates = index.stats['candidates'] / max(index.stats['queries'], 1)
+
+        if n > args.skip_scan_above:
+            print(f"{n:>7} {'-':>10} {index_time:>10.2f} {'-':>9} {'-':>9} "
+                  f"{sum(index_decisions):>10} {'-':>8} {avg_candidates:>11.1f}")
+            continue
+
+        start = time.perf_counter()
+        scan_decisions = dedup_scan(subset, args.threshold)
+        scan_time = time.perf_counter() - start
+
+        agree = sum(a == b for a, b in zip(scan_decisions, index_decisions)) / len(subset)
+        print(f"{n:>7} {scan_time:>10.2f} {index_time:>10.2f} {scan_time / index_time:>8.1f}x "
+              f"{sum(scan_decisions):>9} {sum(index_decisions):>10} {agree:>7.1%} {avg_candidates:>11.1f}")
+
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark parser chat Gemma: regex DOTALL lama (convert_pmb_to_qa.py /
+convert_no_biaya_to_qa.py), str.find lama (yasjks.py) vs gemma_turns
+Input default: train_pmb_augmented.json (text sudah dimuat, hanya parsing yang diukur)
+"""
+
+import argparse
+import time
+
+from gemma_turns import extract_qa_from_text, iter_malformed
+from jsonstream import iter_json_array
+
+USER_PATTERN = r'<start_of_turn>user\n(.*?)<end_of_turn>'
+MODEL_PATTERN = r'<start_of_turn>model\n(.*?)<end_of_turn>'
+
+
+def legacy_regex_extract(text):
+    """Salinan extract_qa_from_text lama di convert_pmb_to_qa.py (dua re.search DOTALL)"""
+    import re
+
+    user_match = re.search(USER_PATTERN, text, re.DOTALL)
+    model_match = re.search(MODEL_PATTERN, text, re.DOTALL)
+    if user_match and model_match:
+        return user_match.group(1).strip(), model_match.group(1).strip()
+    return None, None
+
+
+def legacy_find_extract(text):
+    """Salinan extract_qa_from_text lama di yasjks.py (str.find, jawaban tanpa <end_of_turn> sampai akhir)"""
+    if "<start_of_turn>user\n" in text and "<end_of_turn>" in text:
+        user_start = text.find("<start_of_turn>user\n") + len("<start_of_turn>user\n")
+        user_end = text.find("<end_of_turn>", user_start)
+        question = text[user_start:user_end].strip()
+    else:
+        question = ""
+    if "<start_of_turn>model\n" in text:
+        model_start = text.find("<start_of_turn>model\n") + len("<start_of_turn>model\n")
+        model_end = text.find("<end_of_turn>", model_start)
+        reference = text[model_start:].strip() if model_end == -1 else text[model_start:model_end].strip()
+    else:
+        reference = ""
+    return question, reference
+
+
+def best_time(fn, texts, repeat):
+    seconds, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [fn(text) for text in texts]
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', default='train_pmb_augmented.json')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [item.get('text', '') for item in iter_json_array(args.input)]
+
+    print("=" * 80)
+    print(f"BENCHMARK PARSER CHAT GEMMA ({args.input}, {len(texts)} record)")
+    print("=" * 80)
+    regex_time, regex_result = best_time(legacy_regex_extract, texts, args.repeat)
+    find_time, find_result = best_time(legacy_find_extract, texts, args.repeat)
+    strict_time, strict_result = best_time(extract_qa_from_text, texts, args.repeat)
+    lenient_time, lenient_result = best_time(lambda text: extract_qa_from_text(text, allow_unclosed=True),
+                                             texts, args.repeat)
+
+    # Parser lama mengembalikan "" (yasjks) atau None (regex) untuk record tidak lengkap
+    normalize = lambda pairs: [(q, a) if q and a else (None, None) for q, a in pairs]
+    rows = [
+        ('Regex DOTALL (lama)', regex_time, None),
+        ('str.find yasjks (lama)', find_time, None),
+        ('gemma_turns', strict_time, normalize(strict_result) == normalize(regex_result)),
+        ('gemma_turns allow_unclosed', lenient_time, normalize(lenient_result) == normalize(find_result)),
+    ]
+    print(f"{'Parser':<28} {'Waktu (ms)':>11} {'us/record':>10} {'Speedup':>8}  Output sama")
+    for label, seconds, same in rows:
+        print(f"{label:<28} {seconds * 1000:>11.1f} {seconds * 1e6 / len(texts):>10.2f} "
+              f"{regex_time / seconds:>7.2f}x  {'-' if same is None else ('ya' if same else 'TIDAK')}")
+
+    start = time.perf_counter()
+    malformed = sum(1 for _ in iter_malformed(args.input))
+    print(f"\nValidasi streaming + byte offset: {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{malformed} record rusak")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark pembacaan array JSON besar: json.load (cara script lama) vs
+jsonstream.iter_json_array dari file dan dari memory map
+Peak memori = alokasi Python (tracemalloc, run terpisah); halaman mmap milik OS tidak terhitung
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from jsonstream import iter_json_array
+
+
+def load_all(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in json.load(f))
+
+
+def stream(path, use_mmap=False):
+    return sum(1 for _ in iter_json_array(path, use_mmap=use_mmap))
+
+
+def measure(fn, *args, repeat=5):
+    """(hasil, waktu terbaik dari repeat run, peak memori Python dari run terpisah)"""
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', nargs='+', default=['dataset_combined_all_variations.json',
+                                                       'train_pmb_augmented.json'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK PEMBACA ARRAY JSON")
+    print("=" * 80)
+    for path in args.input:
+        print(f"\n{path} ({os.path.getsize(path) / (1 << 20):.1f} MB)")
+        cases = [
+            ('json.load', load_all, (path,)),
+            ('iter_json_array (file)', stream, (path,)),
+            ('iter_json_array (mmap)', stream, (path, True)),
+        ]
+        for label, fn, fn_args in cases:
+            count, seconds, peak = measure(fn, *fn_args, repeat=args.repeat)
+            print(f"  {label:<24} {seconds * 1000:8.1f} ms  peak {peak / (1 << 20):6.2f} MB  {count:>6} elemen")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
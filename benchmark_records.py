@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark konversi format: cara lama (json.load semua + regex DOTALL per record +
+list hasil + json.dump) vs records.convert (satu pass streaming)
+Input default: train_pmb_augmented.json (format text Gemma)
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_gemma_turns import legacy_regex_extract
+from records import convert, gsm8k_final_answer
+
+SYSTEM_PATTERN = r'<start_of_turn>system\n(.*?)<end_of_turn>'
+
+
+def legacy_convert(input_path, output_path, fmt, system_prompt):
+    """Cara lama: semua record di memori, regex per record, list output penuh"""
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    output = []
+    for item in data:
+        question, answer = legacy_regex_extract(item.get('text', ''))
+        if not (question and answer):
+            continue
+        if fmt == 'qa':
+            output.append({"Q": question, "A": answer})
+        elif fmt == 'messages':
+            # System turn dari text dipertahankan (regex ketiga), default system_prompt
+            system_match = re.search(SYSTEM_PATTERN, item.get('text', ''), re.DOTALL)
+            output.append({"messages": [
+                {"role": "system", "content": system_match.group(1).strip() if system_match else system_prompt},
+                {"role": "user", "content": question},
+                {"role": "assistant", "content": answer},
+            ]})
+        elif fmt == 'gsm8k':
+            output.append({"question": question, "answer": f"{answer} #### {gsm8k_final_answer(answer)}"})
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        if output_path.endswith('.jsonl'):
+            for entry in output:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        else:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+    return len(output)
+
+
+def measure(fn, *args, repeat=3):
+    """(hasil, waktu terbaik dari repeat run, peak memori Python dari run terpisah dengan tracemalloc)"""
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', default='train_pmb_augmented.json')
+    parser.add_argument('--system', default="Anda adalah asisten informasi UNSIQ (Universitas Sains Al-Qur'an).")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    targets = [('qa', 'out.json'), ('messages', 'out.jsonl'), ('gsm8k', 'out_gsm8k.jsonl')]
+    size_mb = os.path.getsize(args.input) / (1 << 20)
+
+    print("=" * 90)
+    print(f"BENCHMARK KONVERSI FORMAT ({args.input}, {size_mb:.1f} MB)")
+    print("=" * 90)
+    print(f"{'Target':<10} {'Lama (s)':>9} {'Peak lama':>11} {'Stream (s)':>11} {'Peak stream':>12} "
+          f"{'Speedup':>8} {'Record':>7}  Output sama")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, name in targets:
+            legacy_path = os.path.join(tmp, 'legacy_' + name)
+            stream_path = os.path.join(tmp, 'stream_' + name)
+            count, legacy_time, legacy_peak = measure(legacy_convert, args.input, legacy_path, fmt, args.system,
+                                                        repeat=args.repeat)
+            stats, stream_time, stream_peak = measure(convert, args.input, stream_path, fmt, 'gemma', args.system,
+                                                    repeat=args.repeat)
+            same = filecmp.cmp(legacy_path, stream_path, shallow=False)
+            print(f"{fmt:<10} {legacy_time:>9.3f} {legacy_peak / (1 << 20):>9.1f}MB {stream_time:>11.3f} "
+                  f"{stream_peak / (1 << 20):>10.1f}MB {legacy_time / stream_time:>7.2f}x "
+                  f"{stats['written']:>7}  {'ya' if same and count == stats['written'] else 'TIDAK'}")
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark validasi semantik: encode per variasi + cosine_similarity sklearn (cara lama di notebook)
+vs SemanticValidator.check_pairs (satu encode + perkalian matriks per chunk)
+(opsional --store: check_pairs dengan EmbeddingStore, run pertama vs run berikutnya)
+Input: pasangan (original_Q, variasi Q) dari file *_variasi.json
+"""
+
+import argparse
+import glob
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from embedding_store import EmbeddingStore
+from semantic_validator import SemanticValidator
+
+
+def load_pairs(pattern, limit=None):
+    pairs = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                for variation in item.get('variations', []):
+                    pairs.append((item['original_Q'], variation['Q']))
+                    if limit and len(pairs) >= limit:
+                        return pairs
+    return pairs
+
+
+def legacy_check(model, threshold, pairs):
+    """Cara lama: embedding asli + variasi di-encode per variasi, similarity 1x1 via sklearn"""
+    results = []
+    for original_q, variation_q in pairs:
+        original_embedding = model.encode([original_q], show_progress_bar=False)[0]
+        variation_embedding = model.encode([variation_q], show_progress_bar=False)[0]
+        similarity = cosine_similarity([original_embedding], [variation_embedding])[0][0]
+        results.append((similarity >= threshold, float(similarity)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='distiluse-base-multilingual-cased-v2',
+                        help='Nama / path model sentence-transformers')
+    parser.add_argument('--input', default='*_variasi.json', help='Glob file variasi')
+    parser.add_argument('--limit', type=int, default=1000, help='Jumlah pasangan')
+    parser.add_argument('--chunk-size', type=int, default=128, help='Jumlah pasangan per chunk (batch pipeline)')
+    parser.add_argument('--threshold', type=float, default=0.60)
+    parser.add_argument('--store', help='Direktori EmbeddingStore (opsional)')
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.input, args.limit)
+    model = SentenceTransformer(args.model, device='cpu')
+    config = SimpleNamespace(semantic_model=args.model, meaning_drift_threshold=args.threshold)
+    validator = SemanticValidator(config, model=model)
+
+    start = time.perf_counter()
+    legacy = legacy_check(model, args.threshold, pairs)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = []
+    for i in range(0, len(pairs), args.chunk_size):
+        chunk = pairs[i:i + args.chunk_size]
+        batched.extend(validator.check_pairs([o for o, _ in chunk], [v for _, v in chunk]))
+    batched_time = time.perf_counter() - start
+
+    store_times = []
+    if args.store:
+        for _ in range(2):
+            store_validator = SemanticValidator(config, model=model, store=EmbeddingStore(args.model, root=args.store))
+            start = time.perf_counter()
+            for i in range(0, len(pairs), args.chunk_size):
+                chunk = pairs[i:i + args.chunk_size]
+                store_validator.check_pairs([o for o, _ in chunk], [v for _, v in chunk])
+            store_times.append((time.perf_counter() - start, store_validator.store.stats))
+
+    decision_diff = sum(a[0] != b[0] for a, b in zip(legacy, batched))
+    max_score_diff = max((abs(a[1] - b[1]) for a, b in zip(legacy, batched)), default=0.0)
+
+    print("=" * 80)
+    print(f"BENCHMARK SEMANTIC VALIDATOR ({len(pairs)} pasangan, chunk {args.chunk_size}, CPU)")
+    print("=" * 80)
+    print(f"{'Per variasi + sklearn (lama)':<40} {legacy_time:>8.2f}s {len(pairs) / legacy_time:>9.1f} pasangan/s")
+    print(f"{'check_pairs (batch)':<40} {batched_time:>8.2f}s {len(pairs) / batched_time:>9.1f} pasangan/s "
+          f"({legacy_time / batched_time:.1f}x)")
+    for label, (seconds, stats) in zip(['check_pairs + store (run 1)', 'check_pairs + store (run 2)'], store_times):
+        print(f"{label:<40} {seconds:>8.2f}s {len(pairs) / seconds:>9.1f} pasangan/s "
+              f"({legacy_time / seconds:.1f}x) | hit {stats['hits']}, encode {stats['encoded']}")
+    print("-" * 80)
+    print(f"Diterima: {sum(v for v, _ in batched)}/{len(pairs)} | Beda keputusan: {decision_diff} | "
+          f"Selisih skor maks: {max_score_diff:.2e}")
+    print(f"Similarity rata-rata: {np.mean([s for _, s in batched]):.4f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark typo batch: k x QuestionVariator.create_typo (loop Python per varian)
+vs typo_batch.generate_typos (satu panggilan NumPy) pada 11 dataset sumber
+"""
+
+import argparse
+import random
+import time
+
+from generate_variasi import FILES_TO_PROCESS, QuestionVariator
+from typo_batch import DEFAULT_RATES, generate_typos, load_pairs
+
+
+def loop_typos(questions, k):
+    variator = QuestionVariator()
+    return [[variator.create_typo(question) for _ in range(k)] for question in questions]
+
+
+def best_time(fn, repeat):
+    seconds, result = float('inf'), None
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        result = fn()
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds, result
+
+
+def describe(questions, variants):
+    """(jumlah varian sama dengan aslinya, rata-rata varian unik per pertanyaan)"""
+    unchanged = sum(variant == question for question, typos in zip(questions, variants) for variant in typos)
+    unique = sum(len(set(typos)) for typos in variants) / max(len(variants), 1)
+    return unchanged, unique
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', nargs='+', default=FILES_TO_PROCESS)
+    parser.add_argument('--k', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    questions = [question for question, _ in load_pairs(args.input)]
+
+    print("=" * 80)
+    print(f"BENCHMARK TYPO BATCH ({len(args.input)} file, {len(questions)} pertanyaan)")
+    print("Rate: " + ', '.join(f"{name}={rate}" for name, rate in DEFAULT_RATES.items()))
+    print("=" * 80)
+    print(f"{'k':>3} {'Metode':<16} {'Waktu (ms)':>11} {'varian/s':>10} {'Sama asli':>10} {'Unik/Q':>7}")
+    for k in args.k:
+        rows = [
+            ('create_typo x k', *best_time(lambda: loop_typos(questions, k), args.repeat)),
+            ('generate_typos', *best_time(lambda: generate_typos(questions, k=k), args.repeat)),
+        ]
+        for label, seconds, variants in rows:
+            unchanged, unique = describe(questions, variants)
+            print(f"{k:>3} {label:<16} {seconds * 1000:>11.1f} {len(questions) * k / seconds:>10.0f} "
+                  f"{unchanged:>10} {unique:>7.1f}")
+        print(f"    Speedup: {rows[0][1] / rows[1][1]:.2f}x")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
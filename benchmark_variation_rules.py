@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark transformasi berbasis aturan (typo, casual, singkat di
+generate_variations_improved.py; casual & singkat di generate_variasi.py):
+versi lama vs versi sekarang pada semua pertanyaan dari 11 dataset sumber.
+
+Regex typo dan variasi singkat dikompilasi sekali (variation_rules.py,
+_TYPO_REGEX); tabel casual dan make_short tetap loop str.replace karena versi
+trie/regex gabungan terukur lebih lambat. Kasus itu tetap diukur di sini supaya
+keputusan tersebut bisa dicek ulang. Setiap transformasi dijalankan dengan seed
+per record yang sama; output dan state random sesudahnya harus identik.
+"""
+
+import argparse
+import random
+import re
+import time
+
+import generate_variasi
+import generate_variations_improved as improved
+from jsonstream import iter_json_array
+from parallel_variations import derive_seed
+
+
+# ---------------------------------------------------------------------------
+# Versi lama (sebelum kompilasi aturan) sebagai referensi
+# ---------------------------------------------------------------------------
+def legacy_typo(text):
+    text_lower = text.lower()
+    applicable_typos = [(orig, typo) for orig, typo in improved.TYPO_PATTERNS if orig in text_lower]
+    if applicable_typos:
+        original, typo = random.choice(applicable_typos)
+        pattern = re.compile(re.escape(original), re.IGNORECASE)
+        text = pattern.sub(typo, text, count=1)
+    return text
+
+
+def legacy_casual(question):
+    q = question.lower().strip('?').strip()
+    for formal, casual in improved.CASUAL_MAP.items():
+        if formal in q:
+            q = q.replace(formal, casual)
+    ending = random.choice(['dong', 'ya', 'kak', 'min', 'nih', 'gan'])
+    q = q.replace('mohon ', '').replace('tolong ', '').replace('saya ', '')
+    return f"{q} {ending}?"
+
+
+def legacy_short(question):
+    q = question.strip('?').strip()
+    for word in ['mohon', 'tolong', 'bisa', 'dapatkah', 'saya ingin', 'bagaimana']:
+        q = re.sub(r'\b' + word + r'\b', '', q, flags=re.IGNORECASE)
+    q = re.sub(r'^apakah\s+', '', q, flags=re.IGNORECASE)
+    q = re.sub(r'^berapa\s+', '', q, flags=re.IGNORECASE)
+    q = re.sub(r'^apa\s+', '', q, flags=re.IGNORECASE)
+    q = re.sub(r'\s+', ' ', q).strip()
+    return f"{q}?"
+
+
+def legacy_variasi_casual(question):
+    result = question.lower()
+    for formal, casuals in generate_variasi.QuestionVariator.CASUAL_REPLACEMENTS.items():
+        if formal in result:
+            result = result.replace(formal, random.choice(casuals))
+    if result.endswith('?'):
+        if random.random() < 0.3:
+            result = result[:-1]
+    else:
+        if random.random() < 0.5:
+            result += ' ya'
+    return result
+
+
+def legacy_variasi_short(question):
+    short = question
+    for word in ['yang', 'untuk', 'dari', 'pada', 'di', 'ke', 'oleh']:
+        if random.random() < 0.4:
+            short = short.replace(f' {word} ', ' ')
+    short = short.replace('semester', 'smt')
+    short = short.replace('program studi', 'prodi')
+    short = short.replace('Pendidikan', 'Pend')
+    return short.strip()
+
+
+VARIATOR = generate_variasi.QuestionVariator()
+CASES = [
+    ('improved typo', legacy_typo, improved.apply_random_typo),
+    ('improved casual', legacy_casual, improved.create_casual_variation),
+    ('improved short', legacy_short, improved.create_short_variation),
+    ('variasi casual', legacy_variasi_casual, VARIATOR.make_casual),
+    ('variasi short', legacy_variasi_short, VARIATOR.make_short),
+]
+
+
+def load_questions(files):
+    questions = []
+    for filename in files:
+        for item in iter_json_array(filename):
+            question = item.get('Q') or item.get('instruction')
+            if question:
+                questions.append(question)
+    return questions
+
+
+def run(fn, questions, seed):
+    """Output + satu angka random sesudah tiap panggilan (membuktikan konsumsi random sama)"""
+    outputs = []
+    for i, question in enumerate(questions):
+        random.seed(derive_seed(seed, i))
+        outputs.append((fn(question), random.random()))
+    return outputs
+
+
+def best_time(fn, questions, repeat):
+    seconds = float('inf')
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        for question in questions:
+            fn(question)
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transformasi variasi berbasis aturan")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    questions = load_questions(improved.INPUT_FILES)
+
+    print("=" * 80)
+    print(f"BENCHMARK TRANSFORMASI VARIASI ({len(improved.INPUT_FILES)} file, {len(questions)} pertanyaan)")
+    print("=" * 80)
+    print(f"{'Transformasi':<18} {'Lama (ms)':>10} {'Sekarang (ms)':>14} {'Speedup':>8}  Output sama")
+    total_legacy = total_current = 0.0
+    for label, legacy, current in CASES:
+        same = run(legacy, questions, args.seed) == run(current, questions, args.seed)
+        legacy_time = best_time(legacy, questions, args.repeat)
+        current_time = best_time(current, questions, args.repeat)
+        total_legacy += legacy_time
+        total_current += current_time
+        print(f"{label:<18} {legacy_time * 1000:>10.1f} {current_time * 1000:>14.1f} "
+              f"{legacy_time / current_time:>7.2f}x  {'ya' if same else 'TIDAK'}")
+    print(f"{'TOTAL':<18} {total_legacy * 1000:>10.1f} {total_current * 1000:>14.1f} "
+          f"{total_legacy / total_current:>7.2f}x")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+BERTScore dengan cache embedding referensi (dipakai yasjks.py)
+
+- Embedding referensi dihitung sekali lalu disimpan ke disk, dengan key
+  (model scorer, jumlah layer) per file dan hash teks per entry
+- Sejumlah sistem kandidat (baseline, fine-tuned, checkpoint lain) dinilai
+  terhadap cache yang sama dengan operasi tensor batch
+- Skor identik dengan bert_score.score(..., lang=..., idf=False) tanpa rescale:
+  greedy matching cosine, bobot [CLS]/[SEP] = 0
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+from bert_score.utils import get_model, get_tokenizer, lang2model, model2layers, sent_encode
+
+CACHE_DIR = ".cache/bertscore"
+
+
+def text_hash(text):
+    """Key cache untuk satu teks (bert_score men-strip teks sebelum tokenisasi)"""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+class CachedBERTScorer:
+    """Scorer BERTScore dengan cache embedding referensi yang persisten"""
+
+    def __init__(self, lang='id', model_type=None, num_layers=None, batch_size=64,
+                 device=None, cache_dir=CACHE_DIR):
+        self.model_type = model_type or lang2model[lang.lower()]
+        self.num_layers = num_layers if num_layers is not None else model2layers[self.model_type]
+        self.batch_size = batch_size
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+
+        self.tokenizer = get_tokenizer(self.model_type, use_fast=False)
+        self.model = get_model(self.model_type, self.num_layers).to(self.device)
+        self.zero_weight_ids = {self.tokenizer.sep_token_id, self.tokenizer.cls_token_id}
+
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', self.model_type)
+        self.cache_path = Path(cache_dir) / f"{safe_name}_L{self.num_layers}.pt"
+        self._cache = {}
+        if self.cache_path.exists():
+            self._cache = torch.load(self.cache_path, map_location='cpu')
+        self.stats = {'ref_cache_hits': 0, 'ref_encoded': 0, 'cand_encoded': 0}
+
+    def _encode(self, texts):
+        """Embedding token (tanpa padding) + bobot per token untuk daftar teks unik"""
+        token_ids = [sent_encode(self.tokenizer, t) for t in texts]
+        # Urutkan berdasarkan panjang agar padding per batch minimal
+        order = sorted(range(len(texts)), key=lambda i: len(token_ids[i]), reverse=True)
+        results = [None] * len(texts)
+
+        with torch.no_grad():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                ids = [torch.tensor(token_ids[i], dtype=torch.long) for i in batch]
+                lens = [len(x) for x in ids]
+                padded = pad_sequence(ids, batch_first=True, padding_value=self.tokenizer.pad_token_id)
+                mask = (torch.arange(padded.size(1)).unsqueeze(0) < torch.tensor(lens).unsqueeze(1)).long()
+                out = self.model(padded.to(self.device), attention_mask=mask.to(self.device))[0].cpu()
+
+                for row, i in enumerate(batch):
+                    weights = torch.tensor(
+                        [0.0 if tok in self.zero_weight_ids else 1.0 for tok in token_ids[i]])
+                    results[i] = (out[row, :lens[row]].float(), weights)
+
+        return results
+
+    def reference_embeddings(self, references):
+        """Ambil embedding referensi dari cache, hitung dan simpan yang belum ada"""
+        keys = [text_hash(r) for r in references]
+        missing = {}
+        for key, ref in zip(keys, references):
+            if key not in self._cache and key not in missing:
+                missing[key] = ref
+
+        self.stats['ref_cache_hits'] += len(set(keys)) - len(missing)
+        if missing:
+            for key, stats in zip(missing, self._encode(list(missing.values()))):
+                self._cache[key] = stats
+            self.stats['ref_encoded'] += len(missing)
+            self.save()
+
+        return [self._cache[k] for k in keys]
+
+    def candidate_embeddings(self, candidates):
+        unique = list(dict.fromkeys(candidates))
+        encoded = dict(zip(unique, self._encode(unique)))
+        self.stats['cand_encoded'] += len(unique)
+        return [encoded[c] for c in candidates]
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        torch.save(self._cache, self.cache_path)
+
+    @staticmethod
+    def _pad(stats):
+        embs, weights = zip(*stats)
+        lens = torch.tensor([e.size(0) for e in embs])
+        emb = pad_sequence(list(embs), batch_first=True, padding_value=2.0)
+        weight = pad_sequence(list(weights), batch_first=True)
+        mask = torch.arange(emb.size(1)).unsqueeze(0) < lens.unsqueeze(1)
+        return emb, mask, weight
+
+    def _greedy_match(self, cand_stats, ref_stats):
+        """P, R, F1 per pasangan (sama dengan bert_score.utils.greedy_cos_idf)"""
+        hyp_emb, hyp_mask, hyp_w = self._pad(cand_stats)
+        ref_emb, ref_mask, ref_w = self._pad(ref_stats)
+        hyp_emb = hyp_emb.to(self.device)
+        ref_emb = ref_emb.to(self.device)
+
+        hyp_emb = hyp_emb / hyp_emb.norm(dim=-1, keepdim=True)
+        ref_emb = ref_emb / ref_emb.norm(dim=-1, keepdim=True)
+
+        sim = torch.bmm(hyp_emb, ref_emb.transpose(1, 2))
+        pair_mask = (hyp_mask.unsqueeze(2) & ref_mask.unsqueeze(1)).float().to(self.device)
+        sim = sim * pair_mask
+
+        hyp_w = (hyp_w / hyp_w.sum(dim=1, keepdim=True)).to(self.device)
+        ref_w = (ref_w / ref_w.sum(dim=1, keepdim=True)).to(self.device)
+
+        P = (sim.max(dim=2)[0] * hyp_w).sum(dim=1)
+        R = (sim.max(dim=1)[0] * ref_w).sum(dim=1)
+        F = 2 * P * R / (P + R)
+
+        # Kalimat kosong hanya berisi [CLS] [SEP]
+        empty = (hyp_mask.sum(dim=1).eq(2) | ref_mask.sum(dim=1).eq(2)).to(self.device)
+        P = P.masked_fill(empty, 0.0)
+        R = R.masked_fill(empty, 0.0)
+        F = F.masked_fill(torch.isnan(F), 0.0)
+        return P.cpu(), R.cpu(), F.cpu()
+
+    def score(self, candidates, references):
+        """Return (P, R, F1) tensor per pasangan, seperti bert_score.score"""
+        if len(candidates) != len(references):
+            raise ValueError("Jumlah kandidat dan referensi harus sama")
+
+        ref_stats = self.reference_embeddings(references)
+        cand_stats = self.candidate_embeddings(candidates)
+
+        outputs = []
+        for start in range(0, len(candidates), self.batch_size):
+            end = start + self.batch_size
+            outputs.append(self._greedy_match(cand_stats[start:end], ref_stats[start:end]))
+
+        P, R, F = (torch.cat(parts) for parts in zip(*outputs))
+        return P, R, F
+
+    def score_systems(self, systems, references):
+        """
+        Nilai beberapa sistem terhadap referensi yang sama.
+
+        systems: dict nama -> list jawaban. Biaya: satu pass referensi (atau
+        nol jika sudah di cache) + satu pass per sistem kandidat.
+        """
+        return {name: self.score(candidates, references) for name, candidates in systems.items()}
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Engine filter keyword biaya (dipakai remove_biaya_entries.py & convert_csv_remove_biaya.py)
+
+- Daftar keyword biaya hanya didefinisikan di sini
+- Keyword dikompilasi sekali menjadi satu regex berbentuk trie
+  (prefix bersama digabung, mis. "semester (?:1|2|...|pertama|...)"),
+  jadi teks cukup di-scan satu kali, bukan ~45 kali `in`
+- hits() mengembalikan keyword yang cocok untuk keperluan audit
+- filter_json_file() memproses file array JSON secara streaming
+"""
+
+import re
+from collections import Counter
+
+from jsonstream import JsonArrayWriter, iter_json_array
+
+# Keywords related to biaya
+BIAYA_KEYWORDS = [
+    'biaya',
+    'harga',
+    'tarif',
+    'rp',
+    'rupiah',
+    'bayar',
+    'pembayaran',
+    'uang',
+    'gratis',
+    'diskon',
+    'cicilan',
+    'tagihan',
+    'lunas',
+    'tunggakan',
+    'ukt',
+    'spp',
+    'dpp',
+    'kip-k',
+    'kip kuliah',
+    'beasiswa',
+    'semester 1',
+    'semester 2',
+    'semester 3',
+    'semester 4',
+    'semester 5',
+    'semester 6',
+    'semester 7',
+    'semester 8',
+    'semester pertama',
+    'semester kedua',
+    'semester ketiga',
+    'semester keempat',
+    'semester kelima',
+    'semester keenam',
+    'semester ketujuh',
+    'semester kedelapan',
+    'smt 1',
+    'smt 2',
+    'smt 3',
+    'smt 4',
+    'smt 5',
+    'smt 6',
+    'smt 7',
+    'smt 8',
+    'seluruh semester',
+    'total biaya',
+    'biaya kuliah',
+]
+
+
+def trie_pattern(words):
+    """Bangun pola regex berbentuk trie dari daftar kata (cocok terpanjang di tiap posisi)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            body = f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class KeywordFilter:
+    """Matcher keyword case-insensitive yang dikompilasi sekali"""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        pattern = trie_pattern(self.keywords)
+        self._search = re.compile(pattern).search
+        # Lookahead agar keyword yang tumpang tindih (mis. "total biaya" & "biaya") tetap terhitung
+        self._finditer = re.compile(f'(?=({pattern}))').finditer
+
+    def matches(self, text):
+        """True jika teks mengandung minimal satu keyword"""
+        return self._search(text.lower()) is not None
+
+    def hits(self, text):
+        """Keyword yang muncul di teks (unik, urut kemunculan pertama)"""
+        text_lower = text.lower()
+        first = self._search(text_lower)
+        if first is None:
+            return []
+        return list(dict.fromkeys(m.group(1) for m in self._finditer(text_lower, first.start())))
+
+    def filter_stream(self, items, get_text):
+        """Yield (item, hits) untuk setiap item; hits kosong berarti item lolos filter"""
+        for item in items:
+            yield item, self.hits(get_text(item))
+
+
+BIAYA_FILTER = KeywordFilter(BIAYA_KEYWORDS)
+
+
+def contains_biaya_keywords(text):
+    """
+    Check if text contains keywords related to biaya/cost.
+
+    Pola mata uang lama (rp\\s*\\d) sudah tercakup oleh keyword 'rp'.
+    """
+    return BIAYA_FILTER.matches(text)
+
+
+def filter_json_file(input_file, output_file, field='text', keyword_filter=BIAYA_FILTER):
+    """
+    Streaming filter file array JSON: item yang mengandung keyword dibuang.
+
+    Return (total, removed, kept, keyword_counts) dengan keyword_counts berupa
+    Counter keyword -> jumlah item yang terbuang karenanya (audit).
+    """
+    total = removed = 0
+    keyword_counts = Counter()
+
+    with open(output_file, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+        items = iter_json_array(input_file)
+        for item, hits in keyword_filter.filter_stream(items, lambda item: item.get(field, '')):
+            total += 1
+            if hits:
+                removed += 1
+                keyword_counts.update(hits)
+            else:
+                writer.write(item)
+
+    return total, removed, total - removed, keyword_counts
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build driver incremental untuk pipeline dataset
+
+Tahapan:
+  1. generate  : dataset_*.json       → *_variasi.json   (per kategori, generate_variations_improved)
+  2. flatten   : *_variasi.json       → *_flat.json      (per kategori, convert_to_flat_format)
+  3. combine   : semua *_flat.json    → dataset_combined_all_variations.json
+  4. prepare   : combined             → data/train.jsonl, eval.jsonl, test.jsonl (prepare_dataset.py,
+                                         split per grup jawaban tanpa kebocoran)
+  5. gsm8k     : combined             → pmb_dataset_gsm8k.jsonl (jsonls.py)
+
+Hash SHA-256 setiap input (termasuk script tahapannya) dan output dicatat di
+.build_manifest.json. Sebuah langkah hanya dijalankan ulang jika hash input
+berubah atau output hilang/berubah, jadi mengubah satu file kategori hanya
+membangun ulang kategori itu plus tahapan gabungan setelahnya.
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from convert_to_flat_format import convert_to_flat
+from generate_variations_improved import INPUT_FILES, make_record, template_chunk_hook
+from grouped_split import category_from_filename
+from jsonstream import JsonArrayWriter, iter_json_array
+from parallel_variations import run_parallel
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+MANIFEST_NAME = ".build_manifest.json"
+COMBINED_FILE = "dataset_combined_all_variations.json"
+TEMPLATE_STRATEGY = "least_used"
+CHUNK_SIZE = 200
+
+
+def file_hash(path):
+    """SHA-256 isi file, None jika file tidak ada"""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Catatan hash input/output per langkah build"""
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / MANIFEST_NAME
+        self.steps = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.steps = json.load(f)
+
+    def _hashes(self, paths):
+        return {self._key(p): file_hash(p) for p in paths}
+
+    def _key(self, path):
+        path = Path(path)
+        try:
+            return str(path.relative_to(self.base_dir))
+        except ValueError:
+            return str(path)
+
+    def is_fresh(self, step, inputs, outputs, params=None):
+        record = self.steps.get(step)
+        if record is None:
+            return False
+        if record.get('params') != (params or {}):
+            return False
+        if record['inputs'] != self._hashes(inputs):
+            return False
+        current_outputs = self._hashes(outputs)
+        return None not in current_outputs.values() and record['outputs'] == current_outputs
+
+    def record(self, step, inputs, outputs, params=None):
+        self.steps[step] = {
+            'params': params or {},
+            'inputs': self._hashes(inputs),
+            'outputs': self._hashes(outputs),
+        }
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.steps, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+class PipelineBuilder:
+    def __init__(self, base_dir, seed=42, force=False, dry_run=False):
+        self.base_dir = Path(base_dir)
+        self.seed = seed
+        self.force = force
+        self.dry_run = dry_run
+        self.manifest = BuildManifest(self.base_dir)
+        self.executed = []
+        self.skipped = []
+
+    def run_step(self, step, inputs, outputs, action, params=None):
+        """Jalankan action() jika input/output berubah sejak build terakhir"""
+        if not self.force and self.manifest.is_fresh(step, inputs, outputs, params):
+            self.skipped.append(step)
+            return False
+
+        print(f"▶ {step}")
+        self.executed.append(step)
+        if self.dry_run:
+            return True
+
+        action()
+        self.manifest.record(step, inputs, outputs, params)
+        # Simpan setelah setiap langkah agar build yang terputus tidak mengulang dari awal
+        self.manifest.save()
+        return True
+
+    def run_script(self, script_name):
+        subprocess.run([sys.executable, str(SCRIPT_DIR / script_name)], cwd=self.base_dir, check=True)
+
+    def build(self):
+        base = self.base_dir
+        generate_code = [SCRIPT_DIR / "generate_variations_improved.py", SCRIPT_DIR / "parallel_variations.py",
+                         SCRIPT_DIR / "template_sampler.py", SCRIPT_DIR / "variation_rules.py",
+                         SCRIPT_DIR / "grouped_split.py", SCRIPT_DIR / "jsonstream.py"]
+        generate_params = {'seed': self.seed, 'templates': TEMPLATE_STRATEGY, 'chunk_size': CHUNK_SIZE}
+        flatten_code = [SCRIPT_DIR / "convert_to_flat_format.py"]
+
+        # Posisi template per kategori dihitung dari semua file input sekaligus
+        jobs = [(base / filename, base / filename.replace('.json', '_variasi.json')) for filename in INPUT_FILES]
+        template_hook = template_chunk_hook(jobs, CHUNK_SIZE, TEMPLATE_STRATEGY, self.seed)
+
+        flat_files, variasi_files = [], []
+        category_inputs = defaultdict(list)
+        for filename in INPUT_FILES:
+            input_path = base / filename
+            if not input_path.exists():
+                print(f"⚠️  File tidak ditemukan, dilewati: {filename}")
+                continue
+
+            # Pilihan template bergantung pada jumlah record file sebelumnya di kategori yang sama
+            earlier = category_inputs[category_from_filename(filename)]
+
+            variasi_path = base / filename.replace('.json', '_variasi.json')
+            flat_path = base / filename.replace('.json', '_flat.json')
+            flat_files.append(flat_path)
+            variasi_files.append(variasi_path)
+
+            self.run_step(
+                f"generate:{filename}", [input_path] + earlier + generate_code, [variasi_path],
+                lambda i=input_path, o=variasi_path: run_parallel(
+                    make_record, [(i, o)], workers=1, master_seed=self.seed, chunk_size=CHUNK_SIZE,
+                    init_chunk=template_hook),
+                params=generate_params,
+            )
+            earlier.append(input_path)
+            self.run_step(
+                f"flatten:{filename}", [variasi_path] + flatten_code, [flat_path],
+                lambda i=variasi_path, o=flat_path: convert_to_flat(i, o),
+            )
+
+        combined_path = base / COMBINED_FILE
+        self.run_step("combine", flat_files, [combined_path],
+                      lambda: self.combine(flat_files, combined_path))
+
+        # Kategori untuk split berstratifikasi diambil dari file flat/variasi
+        self.run_step(
+            "prepare",
+            [combined_path, SCRIPT_DIR / "prepare_dataset.py", SCRIPT_DIR / "grouped_split.py"]
+            + flat_files + variasi_files,
+            [base / "data" / "train.jsonl", base / "data" / "eval.jsonl", base / "data" / "test.jsonl"],
+            lambda: self.run_script("prepare_dataset.py"),
+        )
+        self.run_step(
+            "gsm8k", [combined_path, SCRIPT_DIR / "jsonls.py"], [base / "pmb_dataset_gsm8k.jsonl"],
+            lambda: self.run_script("jsonls.py"),
+        )
+
+    @staticmethod
+    def combine(flat_files, combined_path):
+        """Gabungkan file flat (streaming, format sama dengan json.dump indent=2)"""
+        with open(combined_path, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+            for flat_path in flat_files:
+                for entry in iter_json_array(flat_path):
+                    writer.write(entry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build incremental pipeline dataset")
+    parser.add_argument('--base-dir', default="/root/dataset")
+    parser.add_argument('--seed', type=int, default=42, help='Master seed generator variasi')
+    parser.add_argument('--force', action='store_true', help='Jalankan ulang semua langkah')
+    parser.add_argument('--dry-run', action='store_true', help='Tampilkan langkah yang akan dijalankan saja')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("🔧 BUILD PIPELINE DATASET (INCREMENTAL)")
+    print("="*70)
+
+    start = time.time()
+    builder = PipelineBuilder(args.base_dir, seed=args.seed, force=args.force, dry_run=args.dry_run)
+    builder.build()
+    elapsed = time.time() - start
+
+    print("="*70)
+    print(f"Dijalankan: {len(builder.executed)} langkah | Dilewati (up-to-date): {len(builder.skipped)} langkah")
+    print(f"Waktu: {elapsed:.2f}s{' (dry run)' if args.dry_run else ''}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
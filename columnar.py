@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backend kolumnar (Parquet, opsional: butuh pyarrow) untuk artefak dataset
+
+Kolom: Q, A, category, variation_type, source (+ original_Q untuk baris dari
+*_variasi.json). category/variation_type/source di-dictionary-encode dan
+setiap file sumber ditulis sebagai row group sendiri, jadi filter seperti
+category != biaya melewati row group lewat statistik (predicate pushdown) dan
+hanya kolom yang diminta yang dibaca (projection).
+
+File .parquet dibaca lewat loader yang sama dengan JSON/JSONL
+(records.iter_objects / records.read_records), jadi script konversi yang
+memakai loader itu langsung bisa membaca Parquet.
+
+  python columnar.py build --output dataset_pmb.parquet            # semua *_variasi.json
+  python columnar.py build --output flat.parquet --input '*_flat.json'
+  python columnar.py read dataset_pmb.parquet --where category!=biaya --columns Q A --output tanpa_biaya.json
+"""
+
+import argparse
+import glob
+import re
+from pathlib import Path
+
+from grouped_split import category_from_filename
+from jsonstream import JsonArrayWriter, iter_json_array, iter_jsonl
+
+COLUMNS = ("Q", "A", "category", "variation_type", "source", "original_Q")
+# Urutan variasi dari generate_variations_improved.generate_variations
+VARIATION_TYPES = ("formal", "casual", "typo", "short", "long")
+
+_WHERE_PATTERN = re.compile(r'^\s*(\w+)\s*(==|!=|=|<=|>=|<|>| in | not in )\s*(.+?)\s*$')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Backend Parquet butuh pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def schema():
+    pa = _pyarrow()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("Q", pa.string()),
+        ("A", pa.string()),
+        ("category", dictionary),
+        ("variation_type", dictionary),
+        ("source", dictionary),
+        ("original_Q", pa.string()),
+    ])
+
+
+def file_category(path):
+    """Kategori dari nama file dataset_*.json / dataset-*.json, None untuk file lain"""
+    return category_from_filename(path) if Path(path).name.startswith('dataset') else None
+
+
+def rows_from_file(path):
+    """
+    Baris (dict sesuai COLUMNS) dari satu file JSON/JSONL.
+
+    *_variasi.json: satu baris per variasi (original_Q + variation_type dari
+    posisi variasi); file lain: satu baris per record Q/A (format apa pun
+    yang dikenali records.py).
+    """
+    from records import from_dict
+
+    source = Path(path).name
+    category = file_category(path)
+    items = iter_jsonl(path) if str(path).endswith('.jsonl') else iter_json_array(path)
+    for item in items:
+        if 'variations' in item:
+            variations = item['variations']
+            types = VARIATION_TYPES if len(variations) == len(VARIATION_TYPES) else None
+            for i, variation in enumerate(variations):
+                yield {"Q": variation['Q'], "A": variation['A'], "category": category,
+                       "variation_type": types[i] if types else f"v{i + 1}",
+                       "source": source, "original_Q": item.get('original_Q')}
+            continue
+
+        record = from_dict(item)
+        if record is not None:
+            yield {"Q": record.question, "A": record.answer, "category": category,
+                   "variation_type": None, "source": source, "original_Q": None}
+
+
+def write_parquet(paths, output, batch_rows=65536, compression='zstd'):
+    """
+    Tulis file-file sumber ke satu file Parquet (streaming per batch baris).
+    Setiap file sumber menjadi row group sendiri. Return jumlah baris.
+    """
+    pa = _pyarrow()
+    target_schema = schema()
+    total = 0
+    with pa.parquet.ParquetWriter(output, target_schema, compression=compression) as writer:
+        for path in paths:
+            batch = []
+            for row in rows_from_file(path):
+                batch.append(row)
+                if len(batch) >= batch_rows:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=target_schema))
+                    total += len(batch)
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=target_schema))
+                total += len(batch)
+    return total
+
+
+def parse_where(expressions):
+    """
+    ['category!=biaya', 'variation_type in typo,short'] -> filter pyarrow (AND)
+    Nilai bertipe string; 'null' berarti kolom kosong.
+    """
+    filters = []
+    for expression in expressions or []:
+        match = _WHERE_PATTERN.match(expression)
+        if not match:
+            raise ValueError(f"Filter tidak valid: {expression!r} (contoh: category!=biaya)")
+        column, op, value = match.group(1), match.group(2).strip(), match.group(3)
+        if column not in COLUMNS:
+            raise ValueError(f"Kolom tidak dikenal: {column} (pilihan: {', '.join(COLUMNS)})")
+        if op in ('in', 'not in'):
+            filters.append((column, op, [v.strip() for v in value.split(',')]))
+        else:
+            filters.append((column, '==' if op == '=' else op, None if value == 'null' else value))
+    return filters or None
+
+
+def _expression(filters):
+    """Filter list (column, op, value) -> pyarrow.compute.Expression (AND)"""
+    import pyarrow.compute as pc
+
+    expression = None
+    for column, op, value in filters:
+        field = pc.field(column)
+        if value is None:
+            term = field.is_null() if op == '==' else field.is_valid()
+        elif op == 'in':
+            term = field.isin(value)
+        elif op == 'not in':
+            term = ~field.isin(value)
+        else:
+            term = {'==': field == value, '!=': field != value, '<': field < value,
+                    '<=': field <= value, '>': field > value, '>=': field >= value}[op]
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def iter_parquet(path, columns=None, filters=None, batch_size=8192):
+    """
+    Yield baris (dict) dari file Parquet.
+
+    columns: kolom yang dibaca (projection), default semua.
+    filters: list (kolom, op, nilai) atau list string 'kolom!=nilai' (AND),
+             dievaluasi di pyarrow dengan predicate pushdown per row group.
+    """
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+
+    if filters and isinstance(filters[0], str):
+        filters = parse_where(filters)
+    dataset = ds.dataset(path, format='parquet')
+    scanner = dataset.scanner(columns=list(columns) if columns else None,
+                              filter=_expression(filters) if filters else None,
+                              batch_size=batch_size)
+    for batch in scanner.to_batches():
+        # Kolom dictionary di-decode dulu: to_pylist pada dictionary array jauh lebih lambat
+        arrays = [a.dictionary_decode() if pa.types.is_dictionary(a.type) else a for a in batch.columns]
+        yield from pa.RecordBatch.from_arrays(arrays, names=batch.schema.names).to_pylist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend Parquet untuk artefak dataset")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='JSON/JSONL -> Parquet')
+    build.add_argument('--input', nargs='+', default=['*_variasi.json'], help='File / glob sumber')
+    build.add_argument('--output', required=True)
+    build.add_argument('--compression', default='zstd')
+
+    read = sub.add_parser('read', help='Parquet -> JSON/JSONL (dengan filter & projection)')
+    read.add_argument('input')
+    read.add_argument('--where', nargs='*', default=[], help="Mis. category!=biaya 'variation_type in typo,short'")
+    read.add_argument('--columns', nargs='*', default=None)
+    read.add_argument('--output', default=None, help='.jsonl / .json (default: hanya hitung baris)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        paths = [p for pattern in args.input for p in (sorted(glob.glob(pattern)) or [pattern])]
+        rows = write_parquet(paths, args.output, compression=args.compression)
+        print(f"✅ {len(paths)} file, {rows} baris → {args.output}")
+        return
+
+    rows = iter_parquet(args.input, args.columns, parse_where(args.where))
+    count = 0
+    if args.output and args.output.endswith('.jsonl'):
+        from jsonstream import write_jsonl_line
+
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for row in rows:
+                write_jsonl_line(f, row)
+                count += 1
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+            for row in rows:
+                writer.write(row)
+                count += 1
+    else:
+        count = sum(1 for _ in rows)
+    print(f"✅ {count} baris" + (f" → {args.output}" if args.output else ""))
+
+
+if __name__ == "__main__":
+    main()
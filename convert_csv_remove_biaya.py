@@ -1,75 +1,8 @@
 import csv
 import json
-import re
 from pathlib import Path
 
-def contains_biaya_keywords(text):
-    """
-    Check if text contains keywords related to biaya/cost.
-    """
-    text_lower = text.lower()
-
-    # Keywords related to biaya
-    biaya_keywords = [
-        'biaya',
-        'harga',
-        'tarif',
-        'rp',
-        'rupiah',
-        'bayar',
-        'pembayaran',
-        'uang',
-        'gratis',
-        'diskon',
-        'cicilan',
-        'tagihan',
-        'lunas',
-        'tunggakan',
-        'ukt',
-        'spp',
-        'dpp',
-        'kip-k',
-        'kip kuliah',
-        'beasiswa',
-        'semester 1',
-        'semester 2',
-        'semester 3',
-        'semester 4',
-        'semester 5',
-        'semester 6',
-        'semester 7',
-        'semester 8',
-        'semester pertama',
-        'semester kedua',
-        'semester ketiga',
-        'semester keempat',
-        'semester kelima',
-        'semester keenam',
-        'semester ketujuh',
-        'semester kedelapan',
-        'smt 1',
-        'smt 2',
-        'smt 3',
-        'smt 4',
-        'smt 5',
-        'smt 6',
-        'smt 7',
-        'smt 8',
-        'seluruh semester',
-        'total biaya',
-        'biaya kuliah',
-    ]
-
-    # Check if any keyword exists in text
-    for keyword in biaya_keywords:
-        if keyword in text_lower:
-            return True
-
-    # Check for currency pattern (Rp followed by numbers)
-    if re.search(r'rp\s*\d', text_lower):
-        return True
-
-    return False
+from biaya_filter import contains_biaya_keywords
 
 def csv_to_json_remove_biaya(csv_file, output_json):
     """
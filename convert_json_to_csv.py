@@ -1,7 +1,8 @@
-import json
 import csv
 from pathlib import Path
 
+from jsonstream import iter_json_array
+
 def json_to_csv(json_file, csv_file):
     """
     Convert JSON Q&A format to CSV with Q and A headers.
@@ -11,13 +12,7 @@ def json_to_csv(json_file, csv_file):
     """
     print(f"Reading: {json_file}")
 
-    # Read JSON file
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Total entries: {len(data)}")
-
-    # Write to CSV
+    # Read JSON file (streaming) and write to CSV row by row
     with open(csv_file, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['Q', 'A'])
 
@@ -25,7 +20,12 @@ def json_to_csv(json_file, csv_file):
         writer.writeheader()
 
         # Write data
-        writer.writerows(data)
+        total = 0
+        for item in iter_json_array(json_file):
+            writer.writerow(item)
+            total += 1
+
+    print(f"Total entries: {total}")
 
     print(f"Saved to: {csv_file}")
 
@@ -1,28 +1,7 @@
-import json
-import re
 from pathlib import Path
 
-def extract_qa_from_text(text):
-    """
-    Extract Question and Answer from Gemma chat template format.
-
-    Format in text:
-    <start_of_turn>user\n{question}<end_of_turn>\n<start_of_turn>model\n{answer}<end_of_turn>
-    """
-    # Extract user question
-    user_pattern = r'<start_of_turn>user\n(.*?)<end_of_turn>'
-    user_match = re.search(user_pattern, text, re.DOTALL)
-
-    # Extract model answer
-    model_pattern = r'<start_of_turn>model\n(.*?)<end_of_turn>'
-    model_match = re.search(model_pattern, text, re.DOTALL)
-
-    if user_match and model_match:
-        question = user_match.group(1).strip()
-        answer = model_match.group(1).strip()
-        return question, answer
-
-    return None, None
+from gemma_turns import extract_qa_from_text
+from jsonstream import JsonArrayWriter, iter_json_array
 
 def convert_pmb_to_qa(input_file, output_file):
     """
@@ -33,42 +12,38 @@ def convert_pmb_to_qa(input_file, output_file):
     """
     print(f"Reading: {input_file}")
 
-    # Read input file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Total entries in input: {len(data)}")
-
-    # Convert to Q&A format
-    qa_data = []
+    # Baca dan tulis secara streaming: satu entry di memori, bukan seluruh list
+    total = 0
     skipped = 0
-
-    for i, item in enumerate(data):
-        text = item.get('text', '')
-        question, answer = extract_qa_from_text(text)
-
-        if question and answer:
-            qa_data.append({
-                "Q": question,
-                "A": answer
-            })
-        else:
-            skipped += 1
-            if skipped <= 5:  # Show first 5 skipped entries
-                print(f"  WARNING: Skipped entry {i+1}: Could not extract Q&A")
-
-    print(f"\nSuccessfully converted: {len(qa_data)} entries")
+    samples = []
+
+    with open(output_file, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+        for i, item in enumerate(iter_json_array(input_file)):
+            total += 1
+            text = item.get('text', '')
+            question, answer = extract_qa_from_text(text)
+
+            if question and answer:
+                entry = {
+                    "Q": question,
+                    "A": answer
+                }
+                writer.write(entry)
+                if len(samples) < 3:
+                    samples.append(entry)
+            else:
+                skipped += 1
+                if skipped <= 5:  # Show first 5 skipped entries
+                    print(f"  WARNING: Skipped entry {i+1}: Could not extract Q&A")
+
+    print(f"Total entries in input: {total}")
+    print(f"\nSuccessfully converted: {writer.count} entries")
     print(f"Skipped: {skipped} entries")
-
-    # Save to output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(qa_data, f, ensure_ascii=False, indent=2)
-
     print(f"Saved to: {output_file}")
 
     # Show sample
     print(f"\nSample output (first 3 entries):")
-    for i, item in enumerate(qa_data[:3], 1):
+    for i, item in enumerate(samples, 1):
         print(f"\n{i}. Q: {item['Q'][:80]}...")
         print(f"   A: {item['A'][:80]}...")
 
@@ -3,11 +3,16 @@
 """
 Script untuk konversi dataset variasi ke format flat (siap fine-tuning)
 Output: Format standar Q&A seperti input original
+
+Mode --stream: baca variasi secara incremental dan tulis flat + combined
+sebagai JSONL dalam satu pass (memori konstan, tidak bergantung ukuran korpus)
 """
 
-import json
+import argparse
 from pathlib import Path
 
+from jsonstream import JsonArrayWriter, iter_json_array, write_jsonl_line
+
 OUTPUT_FILES = [
     "dataset_biaya_variasi.json",
     "dataset-biaya2_clean_variasi.json",
@@ -22,32 +27,81 @@ OUTPUT_FILES = [
     "dataset-alur_variasi.json"
 ]
 
-def convert_to_flat(input_file, output_file):
-    """Konversi format variasi ke flat Q&A"""
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def convert_to_flat(input_file, output_file, combined_writer=None):
+    """
+    Konversi format variasi ke flat Q&A (dibaca dan ditulis streaming),
+    opsional sekaligus ditulis ke JsonArrayWriter combined
+    """
+    with open(output_file, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+        for item in iter_json_array(input_file):
+            # Tambahkan pertanyaan original
+            # flat_data.append({
+            #     "Q": item["original_Q"],
+            #     "A": item["variations"][0]["A"]  # Ambil jawaban dari variasi pertama
+            # })
+
+            # Tambahkan semua variasi
+            for variation in item["variations"]:
+                entry = {
+                    "Q": variation["Q"],
+                    "A": variation["A"]
+                }
+                writer.write(entry)
+                if combined_writer is not None:
+                    combined_writer.write(entry)
+
+    return writer.count
+
+def convert_to_flat_stream(input_file, flat_file, combined_file):
+    """Konversi format variasi ke flat Q&A JSONL, sekaligus append ke combined"""
+    count = 0
+
+    with open(flat_file, 'w', encoding='utf-8') as f:
+        for item in iter_json_array(input_file):
+            for variation in item["variations"]:
+                entry = {
+                    "Q": variation["Q"],
+                    "A": variation["A"]
+                }
+                write_jsonl_line(f, entry)
+                write_jsonl_line(combined_file, entry)
+                count += 1
+
+    return count
+
+def main_stream():
+    base_dir = Path("/root/dataset")
+
+    print("="*90)
+    print("KONVERSI DATASET KE FORMAT FLAT JSONL (STREAMING)")
+    print("="*90)
+    print()
 
-    flat_data = []
+    total_entries = 0
+    combined_path = base_dir / "dataset_combined_all_variations.jsonl"
 
-    for item in data:
-        # Tambahkan pertanyaan original
-        # flat_data.append({
-        #     "Q": item["original_Q"],
-        #     "A": item["variations"][0]["A"]  # Ambil jawaban dari variasi pertama
-        # })
+    with open(combined_path, 'w', encoding='utf-8') as combined_file:
+        for filename in OUTPUT_FILES:
+            input_path = base_dir / filename
+            output_path = base_dir / filename.replace('_variasi.json', '_flat.jsonl')
 
-        # Tambahkan semua variasi
-        for variation in item["variations"]:
-            flat_data.append({
-                "Q": variation["Q"],
-                "A": variation["A"]
-            })
+            count = convert_to_flat_stream(input_path, output_path, combined_file)
+            total_entries += count
 
-    # Simpan
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(flat_data, f, ensure_ascii=False, indent=2)
+            print(f"✓ {filename:<45} → {count:>6} entries")
 
-    return len(flat_data)
+    print("-"*90)
+    print(f"✓ {'COMBINED DATASET':<45} → {total_entries:>6} entries")
+    print("="*90)
+    print()
+
+    print(f"✅ File combined tersimpan di: {combined_path}")
+    print(f"✅ Total {total_entries:,} pasangan Q&A siap untuk fine-tuning")
+    print()
+
+    file_size = combined_path.stat().st_size / (1024 * 1024)  # MB
+    print(f"📊 Ukuran file combined: {file_size:.2f} MB")
+    print()
 
 def main():
     base_dir = Path("/root/dataset")
@@ -57,34 +111,26 @@ def main():
     print("="*90)
     print()
 
-    all_data = []
     total_entries = 0
+    combined_path = base_dir / "dataset_combined_all_variations.json"
 
-    for filename in OUTPUT_FILES:
-        input_path = base_dir / filename
-
-        # Nama output
-        flat_filename = filename.replace('_variasi.json', '_flat.json')
-        output_path = base_dir / flat_filename
-
-        # Konversi
-        count = convert_to_flat(input_path, output_path)
-        total_entries += count
+    # Combined ditulis bersamaan dengan file flat (tanpa membaca ulang / menampung semua data)
+    with open(combined_path, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as combined_writer:
+        for filename in OUTPUT_FILES:
+            input_path = base_dir / filename
 
-        # Juga tambahkan ke combined dataset
-        with open(output_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            all_data.extend(data)
+            # Nama output
+            flat_filename = filename.replace('_variasi.json', '_flat.json')
+            output_path = base_dir / flat_filename
 
-        print(f"✓ {filename:<45} → {count:>6} entries")
+            # Konversi
+            count = convert_to_flat(input_path, output_path, combined_writer)
+            total_entries += count
 
-    # Simpan combined dataset
-    combined_path = base_dir / "dataset_combined_all_variations.json"
-    with open(combined_path, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
+            print(f"✓ {filename:<45} → {count:>6} entries")
 
     print("-"*90)
-    print(f"✓ {'COMBINED DATASET':<45} → {len(all_data):>6} entries")
+    print(f"✓ {'COMBINED DATASET':<45} → {combined_writer.count:>6} entries")
     print("="*90)
     print()
 
@@ -98,4 +144,12 @@ def main():
     print()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Konversi dataset variasi ke format flat")
+    parser.add_argument('--stream', action='store_true',
+                        help='Output JSONL secara streaming (memori konstan)')
+    args = parser.parse_args()
+
+    if args.stream:
+        main_stream()
+    else:
+        main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding store persisten untuk pertanyaan (dipakai SemanticValidator & semantic dedup)
+
+Satu direktori per model embedding:
+  vectors.f16  : array float16 [n, dim] (embedding sudah dinormalisasi), dibaca via np.memmap
+  keys.npy     : hash teks (sha256, 16 byte pertama) per baris, uint8 [n, 16]
+  meta.json    : nama model, dim, jumlah baris
+
+Teks yang sudah pernah di-encode (di run mana pun) diambil dari store, hanya
+teks baru yang dikirim ke model. Baris baru di-append ke akhir file; satu
+proses penulis dalam satu waktu.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+STORE_DIR = ".cache/embeddings"
+
+
+def text_key(text):
+    """Key 16 byte untuk satu teks"""
+    return hashlib.sha256(text.encode('utf-8')).digest()[:16]
+
+
+def normalize(emb):
+    emb = np.asarray(emb, dtype=np.float32)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb / np.where(norms == 0, 1.0, norms)
+
+
+class EmbeddingStore:
+    def __init__(self, model_name, root=STORE_DIR):
+        self.model_name = model_name
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.dir = Path(root) / safe_name
+        self.vectors_path = self.dir / "vectors.f16"
+        self.keys_path = self.dir / "keys.npy"
+        self.meta_path = self.dir / "meta.json"
+
+        self.dim = None
+        self.count = 0
+        self._keys = []
+        self._index = {}
+        self._vectors = None
+        self.stats = {'hits': 0, 'encoded': 0}
+
+        if self.meta_path.exists():
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['model'] != model_name:
+                raise ValueError(f"Store {self.dir} berisi embedding model {meta['model']}, bukan {model_name}")
+            self.dim = meta['dim']
+            self.count = meta['count']
+            self._keys = [row.tobytes() for row in np.load(self.keys_path)[:self.count]]
+            self._index = {k: i for i, k in enumerate(self._keys)}
+        self._truncate_orphans()
+
+    def _truncate_orphans(self):
+        """
+        Buang baris vectors.f16 setelah `count`: sisa add() yang terputus sebelum
+        keys.npy / meta.json ditulis. Tanpa ini add() berikutnya meng-append setelah
+        baris yatim, sementara index dimulai dari count (key menunjuk vektor yang salah).
+        """
+        if not self.vectors_path.exists():
+            return
+        expected = self.count * (self.dim or 0) * np.dtype(np.float16).itemsize
+        size = self.vectors_path.stat().st_size
+        if size < expected:
+            raise ValueError(f"{self.vectors_path} hanya {size} byte, meta.json mencatat {self.count} baris "
+                             f"({expected} byte); store rusak")
+        if size > expected:
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(expected)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, text):
+        return text_key(text) in self._index
+
+    @property
+    def vectors(self):
+        """Semua embedding tersimpan sebagai memmap float16 [count, dim] (read-only)"""
+        if self.count == 0:
+            return np.zeros((0, self.dim or 0), dtype=np.float16)
+        if self._vectors is None or self._vectors.shape[0] != self.count:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode='r', shape=(self.count, self.dim))
+        return self._vectors
+
+    def rows(self, texts):
+        """Index baris per teks, -1 untuk teks yang belum ada di store"""
+        return np.array([self._index.get(text_key(t), -1) for t in texts], dtype=np.int64)
+
+    def add(self, texts, embeddings):
+        """Simpan embedding (dinormalisasi dulu) untuk teks yang belum ada di store"""
+        embeddings = normalize(embeddings)
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"Dimensi embedding {embeddings.shape[1]} != {self.dim}")
+
+        new_rows, new_keys = [], {}
+        for text, emb in zip(texts, embeddings):
+            key = text_key(text)
+            if key in self._index or key in new_keys:
+                continue
+            new_keys[key] = self.count + len(new_keys)
+            new_rows.append(emb)
+
+        if not new_keys:
+            return 0
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.vectors_path, 'ab') as f:
+            f.write(np.asarray(new_rows, dtype=np.float16).tobytes())
+        # Index baru dipakai setelah vektornya tertulis
+        self._index.update(new_keys)
+        self._keys.extend(new_keys)
+        self.count += len(new_keys)
+        self._save_index()
+        return len(new_keys)
+
+    def _save_index(self):
+        tmp = self.keys_path.with_suffix('.tmp.npy')
+        # uint8 [n, 16], bukan dtype 'S16' yang membuang byte nol di akhir key
+        np.save(tmp, np.frombuffer(b''.join(self._keys), dtype=np.uint8).reshape(-1, 16))
+        os.replace(tmp, self.keys_path)
+
+        tmp = self.meta_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'model': self.model_name, 'dim': self.dim, 'count': self.count}, f)
+        os.replace(tmp, self.meta_path)
+
+    def ensure(self, texts, encode):
+        """
+        Pastikan semua texts ada di store, return index baris per teks.
+
+        encode: fungsi list teks -> array embedding, hanya dipanggil untuk teks unik
+        yang belum ada di store (sekali per teks untuk semua run).
+        """
+        rows = self.rows(texts)
+        missing = list(dict.fromkeys(t for t, r in zip(texts, rows) if r < 0))
+
+        self.stats['hits'] += len(set(texts)) - len(missing)
+        if missing:
+            self.add(missing, encode(missing))
+            self.stats['encoded'] += len(missing)
+            rows = self.rows(texts)
+        return rows
+
+    def embed(self, texts, encode):
+        """Embedding ternormalisasi (float32) untuk texts sesuai urutan (lihat ensure)"""
+        texts = list(texts)
+        rows = self.ensure(texts, encode)
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        # Normalisasi ulang setelah float16 -> float32 agar dot product tetap cosine
+        return normalize(self.vectors[rows])
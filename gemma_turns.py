@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parser giliran (turn) format chat Gemma, dipakai bersama oleh semua script
+
+  <start_of_turn>system\\n...<end_of_turn>\\n      (opsional)
+  <start_of_turn>user\\n...<end_of_turn>\\n
+  <start_of_turn>model\\n...<end_of_turn>         (boleh berulang: multi-turn)
+
+Text dipindai sekali dari kiri ke kanan dengan str.find (tanpa regex DOTALL
+per field), giliran di-yield lazy sebagai Turn. extract_qa_from_text
+menggantikan tiga salinan lama (yasjks.py, convert_pmb_to_qa.py,
+convert_no_biaya_to_qa.py) dan berhenti memindai begitu user + model ketemu.
+
+File (array JSON / JSONL) dibaca streaming lewat jsonstream, record rusak
+dilaporkan beserta nomor record dan byte offset-nya di file:
+
+  python gemma_turns.py train_pmb_augmented.json
+  python gemma_turns.py train_pmb_no_biaya.json --show 50
+"""
+
+import argparse
+from collections import Counter
+
+from jsonstream import iter_json_array, iter_jsonl
+
+TURN_START = '<start_of_turn>'
+TURN_END = '<end_of_turn>'
+ROLES = ('system', 'user', 'model')
+
+_START_LEN = len(TURN_START)
+_END_LEN = len(TURN_END)
+
+
+class Turn:
+    """
+    Satu giliran: role, isi (belum di-strip) dan posisi karakter [start, end) di text.
+    role None jika header tidak diakhiri newline; closed False jika <end_of_turn> tidak ada.
+    """
+
+    __slots__ = ('role', 'content', 'start', 'end', 'closed')
+
+    def __init__(self, role, content, start, end, closed):
+        self.role = role
+        self.content = content
+        self.start = start
+        self.end = end
+        self.closed = closed
+
+    def __repr__(self):
+        return f"Turn(role={self.role!r}, content={self.content[:40]!r}, closed={self.closed})"
+
+
+def iter_turns(text):
+    """
+    Yield Turn dari text secara lazy, satu pass kiri ke kanan.
+
+    Giliran yang tidak ditutup berakhir di <start_of_turn> berikutnya (atau akhir text).
+    """
+    find = text.find
+    start = find(TURN_START)
+    while start >= 0:
+        body = start + _START_LEN
+        # Awal giliran berikutnya membatasi pencarian <end_of_turn> giliran ini
+        next_start = find(TURN_START, body)
+        limit = next_start if next_start >= 0 else len(text)
+        end = find(TURN_END, body, limit)
+        closed = end >= 0
+        if closed:
+            limit = end
+
+        header_end = find('\n', body, limit)
+        if header_end < 0:
+            turn = Turn(None, text[body:limit], start, limit, closed)
+        else:
+            turn = Turn(text[body:header_end], text[header_end + 1:limit], start, limit, closed)
+        if closed:
+            turn.end = limit + _END_LEN
+        yield turn
+        start = next_start
+
+
+def first_turns(text, allow_unclosed=False):
+    """
+    (system, question, answer) = isi giliran system, user dan model pertama (di-strip).
+
+    Pembagian giliran sama dengan iter_turns; berhenti begitu user dan model
+    ketemu. question/answer None jika salah satunya tidak ada.
+    allow_unclosed=True: giliran model tanpa <end_of_turn> tetap dipakai (isinya
+    sampai akhir text / giliran berikutnya).
+    """
+    # Jalur panas konversi: split di C lalu partition per giliran, tanpa objek Turn
+    system = question = answer = None
+    parts = text.split(TURN_START)
+    for i in range(1, len(parts)):
+        role, newline, rest = parts[i].partition('\n')
+        if not newline:
+            continue
+        end = rest.find(TURN_END)
+        if role == 'user':
+            if question is None and end >= 0:
+                question = rest[:end].strip()
+        elif role == 'model':
+            if answer is None and (end >= 0 or allow_unclosed):
+                answer = (rest[:end] if end >= 0 else rest).strip()
+        elif role == 'system' and system is None and end >= 0:
+            system = rest[:end].strip()
+        if question is not None and answer is not None:
+            return system, question, answer
+    return system, None, None
+
+
+def extract_qa_from_text(text, allow_unclosed=False):
+    """Extract (question, answer) dari format Gemma chat template, (None, None) jika tidak lengkap"""
+    _, question, answer = first_turns(text, allow_unclosed)
+    return question, answer
+
+
+def find_problems(text):
+    """List masalah format dalam satu text (list kosong = valid)"""
+    if not isinstance(text, str):
+        return [f"field text bukan string ({type(text).__name__})"]
+
+    problems = []
+    roles = []
+    pos = 0
+    for turn in iter_turns(text):
+        if text[pos:turn.start].strip():
+            problems.append(f"teks di luar giliran pada karakter {pos}")
+        if turn.role is None:
+            problems.append(f"header giliran tanpa newline pada karakter {turn.start}")
+        elif turn.role not in ROLES:
+            problems.append(f"role tidak dikenal {turn.role!r} pada karakter {turn.start}")
+        if not turn.closed:
+            problems.append(f"giliran {turn.role!r} tidak ditutup {TURN_END} (karakter {turn.start})")
+        elif not turn.content.strip():
+            problems.append(f"giliran {turn.role!r} kosong (karakter {turn.start})")
+        roles.append(turn.role)
+        pos = turn.end
+    if text[pos:].strip():
+        problems.append(f"teks di luar giliran pada karakter {pos}")
+
+    if not roles:
+        problems.append("tidak ada giliran")
+        return problems
+    for role in ('user', 'model'):
+        if role not in roles:
+            problems.append(f"tidak ada giliran {role}")
+    if 'system' in roles and roles[0] != 'system':
+        problems.append("giliran system bukan giliran pertama")
+    return problems
+
+
+def iter_file(path):
+    """
+    Yield (nomor record mulai 1, byte offset record di file, objek) dari array JSON atau JSONL.
+    Objek dibaca satu per satu (streaming).
+    """
+    items = iter_jsonl(path, with_offsets=True) if str(path).endswith('.jsonl') else \
+        iter_json_array(path, with_offsets=True)
+    for index, (offset, obj) in enumerate(items, 1):
+        yield index, offset, obj
+
+
+def iter_malformed(path, field='text'):
+    """Yield (nomor record, byte offset, list masalah) untuk setiap record yang rusak"""
+    for index, offset, obj in iter_file(path):
+        if not isinstance(obj, dict) or field not in obj:
+            yield index, offset, [f"tidak ada field {field!r}"]
+            continue
+        problems = find_problems(obj[field])
+        if problems:
+            yield index, offset, problems
+
+
+def scan_file(path, field='text', show=20):
+    """Validasi satu file: print statistik giliran dan record rusak (maks show), return jumlah record rusak"""
+    shapes = Counter()
+    total = 0
+    malformed = 0
+    for index, offset, obj in iter_file(path):
+        total += 1
+        text = obj.get(field) if isinstance(obj, dict) else None
+        problems = find_problems(text) if text is not None else [f"tidak ada field {field!r}"]
+        if isinstance(text, str):
+            roles = [turn.role for turn in iter_turns(text)]
+            shapes['multi-turn' if roles.count('user') > 1 else 'single-turn'] += 1
+            shapes['dengan system'] += 'system' in roles
+        if problems:
+            malformed += 1
+            if malformed <= show:
+                print(f"   ⚠️  record #{index} @ byte {offset}: {'; '.join(problems)}")
+
+    print(f"📊 {path}: {total} record | {malformed} rusak")
+    print(f"   Single-turn: {shapes['single-turn']} | Multi-turn: {shapes['multi-turn']} | "
+          f"Dengan system: {shapes['dengan system']}")
+    if malformed > show:
+        print(f"   ... {malformed - show} record rusak lainnya tidak ditampilkan (--show)")
+    return malformed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validasi format chat Gemma (record rusak + byte offset)")
+    parser.add_argument('input', nargs='+', help='File array JSON / JSONL berisi field text')
+    parser.add_argument('--field', default='text')
+    parser.add_argument('--show', type=int, default=20, help='Jumlah record rusak yang ditampilkan per file')
+    args = parser.parse_args()
+
+    malformed = sum(scan_file(path, args.field, args.show) for path in args.input)
+    print("✅ Semua record valid" if malformed == 0 else f"❌ Total record rusak: {malformed}")
+    raise SystemExit(1 if malformed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,17 @@
 """
 Script untuk generate 5 variasi pertanyaan semantik dari dataset Q&A
 Setiap variasi: formal, casual, typo, singkat, panjang
+
+Mode paralel: --workers N (lihat parallel_variations.py)
 """
 
+import argparse
 import json
 import os
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from parallel_variations import run_parallel
 
 # File yang akan diproses (exclude dataset_biaya_flat)
 FILES_TO_PROCESS = [
@@ -186,6 +191,31 @@ class QuestionVariator:
         return variations
 
 
+_VARIATOR = QuestionVariator()
+
+
+def make_record(item) -> Optional[Dict]:
+    """Buat entry output (original Q/A + 5 variasi), None jika format item tidak dikenali"""
+    if not isinstance(item, dict):
+        return None
+
+    # Support multiple formats
+    if 'Q' in item and 'A' in item:
+        question = item['Q']
+        answer = item['A']
+    elif 'instruction' in item and 'response' in item:
+        question = item['instruction']
+        answer = item['response']
+    else:
+        return None
+
+    return {
+        "original_Q": question,
+        "original_A": answer,
+        "variations": _VARIATOR.generate_variations(question, answer)
+    }
+
+
 def process_file(input_path: str, output_path: str):
     """Process satu file JSON"""
     print(f"Processing: {input_path}")
@@ -198,7 +228,6 @@ def process_file(input_path: str, output_path: str):
             print(f"  ⚠️  Skipped: Not a list format")
             return
 
-        variator = QuestionVariator()
         results = []
 
         for idx, item in enumerate(data):
@@ -206,27 +235,12 @@ def process_file(input_path: str, output_path: str):
                 print(f"  ⚠️  Skipped item {idx}: Not a dict")
                 continue
 
-            # Support multiple formats
-            question = None
-            answer = None
-
-            if 'Q' in item and 'A' in item:
-                question = item['Q']
-                answer = item['A']
-            elif 'instruction' in item and 'response' in item:
-                question = item['instruction']
-                answer = item['response']
-            else:
+            entry = make_record(item)
+            if entry is None:
                 print(f"  ⚠️  Skipped item {idx}: Invalid format (no Q/A or instruction/response)")
                 continue
 
-            variations = variator.generate_variations(question, answer)
-
-            results.append({
-                "original_Q": question,
-                "original_A": answer,
-                "variations": variations
-            })
+            results.append(entry)
 
             # Progress indicator
             if (idx + 1) % 50 == 0:
@@ -272,5 +286,37 @@ def main():
     print("=" * 60)
 
 
+def main_parallel(workers: Optional[int], seed: int, chunk_size: int):
+    """Main function - mode paralel dengan seed deterministik per record"""
+    print("=" * 60)
+    print("VARIASI PERTANYAAN GENERATOR (PARALEL)")
+    print("=" * 60)
+
+    base_dir = "/root/dataset"
+    jobs = [
+        (os.path.join(base_dir, filename),
+         os.path.join(base_dir, f"{os.path.splitext(filename)[0]}_variasi.json"))
+        for filename in FILES_TO_PROCESS
+    ]
+
+    stats = run_parallel(make_record, jobs, workers=workers, master_seed=seed, chunk_size=chunk_size)
+
+    print("=" * 60)
+    print(f"✓ SELESAI: {stats['files']} file diproses (master seed {seed})")
+    print("=" * 60)
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generator variasi pertanyaan")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Mode paralel: jumlah worker process (0 = jumlah CPU)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Master seed mode paralel (output identik berapa pun jumlah worker)')
+    parser.add_argument('--chunk-size', type=int, default=200,
+                        help='Jumlah record per task, file besar dipecah per chunk')
+    args = parser.parse_args()
+
+    if args.workers is None:
+        main()
+    else:
+        main_parallel(args.workers or None, args.seed, args.chunk_size)
@@ -3,13 +3,18 @@
 """
 Script untuk Generate Variasi Pertanyaan Dataset Q&A
 Menghasilkan 5 variasi semantik untuk setiap pertanyaan dengan jawaban yang identik
+
+Mode paralel: --workers N (lihat parallel_variations.py)
 """
 
+import argparse
 import json
 import os
 import random
 from pathlib import Path
 
+from parallel_variations import run_parallel
+
 # Daftar file input
 INPUT_FILES = [
     "dataset_biaya.json",
@@ -155,6 +160,24 @@ def create_long_version(question):
 
     return random.choice(long_templates)
 
+def make_record(item):
+    """Buat entry output (original_Q + 5 variasi), None jika format item tidak dikenali"""
+    # Handle dua format: {"Q": ..., "A": ...} atau {"instruction": ..., "response": ...}
+    if "Q" in item and "A" in item:
+        question = item["Q"]
+        answer = item["A"]
+    elif "instruction" in item and "response" in item:
+        question = item["instruction"]
+        answer = item["response"]
+    else:
+        return None
+
+    # Generate 5 variasi
+    return {
+        "original_Q": question,
+        "variations": generate_variations(question, answer)
+    }
+
 def process_file(input_path, output_path):
     """Proses satu file JSON dan generate variasi"""
     print(f"📁 Memproses: {input_path}")
@@ -165,25 +188,13 @@ def process_file(input_path, output_path):
 
         results = []
 
-        # Handle dua format: {"Q": ..., "A": ...} atau {"instruction": ..., "response": ...}
         for idx, item in enumerate(data):
-            if "Q" in item and "A" in item:
-                question = item["Q"]
-                answer = item["A"]
-            elif "instruction" in item and "response" in item:
-                question = item["instruction"]
-                answer = item["response"]
-            else:
+            entry = make_record(item)
+            if entry is None:
                 print(f"⚠️  Item {idx} tidak memiliki format yang dikenali, dilewati")
                 continue
 
-            # Generate 5 variasi
-            variations = generate_variations(question, answer)
-
-            results.append({
-                "original_Q": question,
-                "variations": variations
-            })
+            results.append(entry)
 
             # Progress indicator setiap 50 item
             if (idx + 1) % 50 == 0:
@@ -250,5 +261,41 @@ def main():
     print("\n✅ Semua file output tersimpan di: /root/dataset/")
     print("="*70)
 
+def main_parallel(workers, seed, chunk_size):
+    """Main function - mode paralel dengan seed deterministik per record"""
+    print("="*70)
+    print("🚀 GENERATOR VARIASI PERTANYAAN DATASET Q&A (PARALEL)")
+    print("="*70)
+    print()
+
+    base_dir = Path("/root/dataset")
+    jobs = [
+        (base_dir / filename, base_dir / f"{filename.replace('.json', '')}_variasi.json")
+        for filename in INPUT_FILES
+    ]
+
+    stats = run_parallel(make_record, jobs, workers=workers, master_seed=seed, chunk_size=chunk_size)
+
+    print("\n" + "="*70)
+    print("📊 RINGKASAN")
+    print("="*70)
+    print(f"Total file diproses: {len(INPUT_FILES)}")
+    print(f"Berhasil: {stats['files']}")
+    print(f"Gagal: {len(stats['failed_files'])}")
+    print(f"Master seed: {seed}")
+    print("="*70)
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generator variasi pertanyaan")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Mode paralel: jumlah worker process (0 = jumlah CPU)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Master seed mode paralel (output identik berapa pun jumlah worker)')
+    parser.add_argument('--chunk-size', type=int, default=200,
+                        help='Jumlah record per task, file besar dipecah per chunk')
+    args = parser.parse_args()
+
+    if args.workers is None:
+        main()
+    else:
+        main_parallel(args.workers or None, args.seed, args.chunk_size)
@@ -3,14 +3,24 @@
 """
 Script untuk Generate Variasi Pertanyaan Dataset Q&A - VERSION IMPROVED
 Menghasilkan 5 variasi semantik berkualitas tinggi untuk setiap pertanyaan
+
+Mode paralel: --workers N (lihat parallel_variations.py)
 """
 
+import argparse
 import json
 import os
 import random
 import re
+from collections import Counter
+from functools import partial
 from pathlib import Path
 
+from grouped_split import category_from_filename
+from parallel_variations import run_parallel
+from template_sampler import STRATEGIES, TemplateSampler, coverage_report, print_coverage
+from variation_rules import PrefixStripper, WordRemover
+
 # Daftar file input
 INPUT_FILES = [
     "dataset_biaya.json",
@@ -55,6 +65,45 @@ TYPO_PATTERNS = [
     ('pertama', 'prtama'),
 ]
 
+# Template variasi formal ({} = pertanyaan lowercase tanpa tanda tanya)
+FORMAL_TEMPLATES = [
+    "Mohon informasi mengenai {}.",
+    "Saya ingin mengetahui {}.",
+    "Dapatkah dijelaskan {}?",
+    "Saya memerlukan keterangan tentang {}.",
+    "Bisakah diberikan informasi terkait {}?",
+]
+
+# Template variasi panjang/deskriptif
+LONG_TEMPLATES = [
+    "Selamat siang, saya ingin bertanya secara detail mengenai {}. Mohon penjelasannya.",
+    "Saya sedang mencari informasi lengkap tentang {}, bisakah dijelaskan?",
+    "Mohon bantuannya untuk menjelaskan secara rinci mengenai {} untuk keperluan pendaftaran saya.",
+    "Sebagai calon mahasiswa, saya perlu memahami lebih lanjut tentang {}. Terima kasih sebelumnya.",
+    "Untuk kelengkapan data saya, mohon dijelaskan dengan detail mengenai {}. Terima kasih.",
+    "Permisi, saya ingin menanyakan informasi yang cukup spesifik tentang {}. Mohon dibantu.",
+]
+
+# Posisi variasi di output -> (jenis, template), untuk laporan cakupan
+TEMPLATE_SETS = {0: ('formal', FORMAL_TEMPLATES), 4: ('panjang', LONG_TEMPLATES)}
+
+# Pemilih template seimbang per kategori, berdasarkan posisi record (lihat template_sampler.py)
+TEMPLATE_SAMPLER = TemplateSampler('least_used')
+
+# Kata tidak esensial untuk variasi singkat
+REMOVE_WORDS = ['mohon', 'tolong', 'bisa', 'dapatkah', 'saya ingin', 'bagaimana']
+
+# Awalan pertanyaan yang dihapus berurutan untuk variasi singkat
+QUESTION_PREFIXES = ['apakah', 'berapa', 'apa']
+
+# Regex variasi singkat dikompilasi sekali (lihat variation_rules.py)
+SHORT_REMOVER = WordRemover(REMOVE_WORDS)
+SHORT_PREFIXES = PrefixStripper(QUESTION_PREFIXES)
+_SPACES = re.compile(r'\s+')
+
+# Regex typo (case-insensitive) per kata asli, dikompilasi sekali
+_TYPO_REGEX = {orig: re.compile(re.escape(orig), re.IGNORECASE) for orig, _ in TYPO_PATTERNS}
+
 def apply_random_typo(text):
     """Terapkan typo yang realistis"""
     text_lower = text.lower()
@@ -64,8 +113,7 @@ def apply_random_typo(text):
         # Pilih 1 typo saja untuk realistis
         original, typo = random.choice(applicable_typos)
         # Case-insensitive replacement
-        pattern = re.compile(re.escape(original), re.IGNORECASE)
-        text = pattern.sub(typo, text, count=1)
+        text = _TYPO_REGEX[original].sub(typo, text, count=1)
 
     return text
 
@@ -73,25 +121,18 @@ def create_formal_variation(question):
     """Variasi 1: Formal/Akademik"""
     q_lower = question.lower().strip('?').strip()
 
-    formal_templates = [
-        f"Mohon informasi mengenai {q_lower}.",
-        f"Saya ingin mengetahui {q_lower}.",
-        f"Dapatkah dijelaskan {q_lower}?",
-        f"Saya memerlukan keterangan tentang {q_lower}.",
-        f"Bisakah diberikan informasi terkait {q_lower}?",
-    ]
-
-    # Pilih template yang paling cocok
+    # Kata tanya dibuang supaya cocok dengan semua template; strategi random tetap
+    # memakai template yang paling cocok, strategi seimbang meratakan pemakaiannya
     if question.lower().startswith('berapa'):
         q_modified = q_lower.replace('berapa ', '')
-        return f"Mohon informasi mengenai {q_modified}."
+        return TEMPLATE_SAMPLER.choose('formal', FORMAL_TEMPLATES, preferred=0).format(q_modified)
     elif question.lower().startswith('apa'):
         q_modified = q_lower.replace('apa ', '')
-        return f"Saya ingin mengetahui {q_modified}."
+        return TEMPLATE_SAMPLER.choose('formal', FORMAL_TEMPLATES, preferred=1).format(q_modified)
     elif question.lower().startswith('apakah'):
-        return f"Dapatkah dijelaskan {q_lower}?"
+        return TEMPLATE_SAMPLER.choose('formal', FORMAL_TEMPLATES, preferred=2).format(q_lower)
 
-    return random.choice(formal_templates)
+    return TEMPLATE_SAMPLER.choose('formal', FORMAL_TEMPLATES).format(q_lower)
 
 def create_casual_variation(question):
     """Variasi 2: Casual/Santai dengan singkatan"""
@@ -120,17 +161,13 @@ def create_short_variation(question):
     q = question.strip('?').strip()
 
     # Hapus kata tidak esensial
-    remove_words = ['mohon', 'tolong', 'bisa', 'dapatkah', 'saya ingin', 'bagaimana']
-    for word in remove_words:
-        q = re.sub(r'\b' + word + r'\b', '', q, flags=re.IGNORECASE)
+    q = SHORT_REMOVER.apply(q)
 
     # Simplifikasi awalan pertanyaan
-    q = re.sub(r'^apakah\s+', '', q, flags=re.IGNORECASE)
-    q = re.sub(r'^berapa\s+', '', q, flags=re.IGNORECASE)
-    q = re.sub(r'^apa\s+', '', q, flags=re.IGNORECASE)
+    q = SHORT_PREFIXES.apply(q)
 
     # Clean up multiple spaces
-    q = re.sub(r'\s+', ' ', q).strip()
+    q = _SPACES.sub(' ', q).strip()
 
     return f"{q}?"
 
@@ -138,16 +175,7 @@ def create_long_variation(question):
     """Variasi 5: Versi panjang/deskriptif"""
     q_lower = question.lower().strip('?').strip()
 
-    long_templates = [
-        f"Selamat siang, saya ingin bertanya secara detail mengenai {q_lower}. Mohon penjelasannya.",
-        f"Saya sedang mencari informasi lengkap tentang {q_lower}, bisakah dijelaskan?",
-        f"Mohon bantuannya untuk menjelaskan secara rinci mengenai {q_lower} untuk keperluan pendaftaran saya.",
-        f"Sebagai calon mahasiswa, saya perlu memahami lebih lanjut tentang {q_lower}. Terima kasih sebelumnya.",
-        f"Untuk kelengkapan data saya, mohon dijelaskan dengan detail mengenai {q_lower}. Terima kasih.",
-        f"Permisi, saya ingin menanyakan informasi yang cukup spesifik tentang {q_lower}. Mohon dibantu.",
-    ]
-
-    return random.choice(long_templates)
+    return TEMPLATE_SAMPLER.choose('panjang', LONG_TEMPLATES).format(q_lower)
 
 def generate_variations(question, answer):
     """
@@ -187,9 +215,77 @@ def generate_variations(question, answer):
 
     return variations
 
+def record_fields(item):
+    """(pertanyaan, jawaban) dari item, None jika format item tidak dikenali"""
+    # Handle dua format
+    if "Q" in item and "A" in item:
+        return item["Q"], item["A"]
+    if "instruction" in item and "response" in item:
+        return item["instruction"], item["response"]
+    return None
+
+def make_record(item):
+    """Buat entry output (original_Q + 5 variasi), None jika format item tidak dikenali"""
+    fields = record_fields(item)
+    if fields is None:
+        return None
+    question, answer = fields
+
+    # Generate 5 variasi
+    return {
+        "original_Q": question,
+        "variations": generate_variations(question, answer)
+    }
+
+def chunk_positions(jobs, chunk_size):
+    """
+    Posisi record pertama setiap chunk run_parallel di dalam kategorinya, kunci
+    (nama file, start): jumlah record valid sebelumnya di file-file kategori yang
+    sama (urutan jobs), sama seperti urutan mode berurutan. File yang gagal dibaca
+    dilewati, seperti di run_parallel.
+    """
+    totals = Counter()
+    positions = {}
+    for input_path, _ in jobs:
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+
+        filename = Path(input_path).name
+        category = category_from_filename(filename)
+        for start in range(0, len(data), chunk_size):
+            positions[(filename, start)] = totals[category]
+            totals[category] += sum(record_fields(item) is not None for item in data[start:start + chunk_size])
+    return positions
+
+def start_chunk(strategy, seed, positions, filename, start):
+    """
+    Hook run_parallel: sampler template mulai dari posisi chunk di dalam kategorinya,
+    jadi pilihan template tidak bergantung pada jumlah worker maupun ukuran chunk
+    """
+    global TEMPLATE_SAMPLER
+    TEMPLATE_SAMPLER = TemplateSampler(strategy, seed)
+    TEMPLATE_SAMPLER.begin(category_from_filename(filename), positions[(filename, start)])
+
+def template_chunk_hook(jobs, chunk_size, strategy, seed):
+    """init_chunk untuk run_parallel(jobs, chunk_size=chunk_size) dengan strategi template strategy"""
+    return partial(start_chunk, strategy, seed, chunk_positions(jobs, chunk_size))
+
+def report_template_coverage(output_paths, report_path):
+    """Print + simpan laporan cakupan template formal/panjang per kategori"""
+    report = coverage_report([path for path in output_paths if Path(path).exists()], TEMPLATE_SETS)
+    print("\n🧩 CAKUPAN TEMPLATE (jumlah pemakaian per template, per kategori)")
+    print_coverage(report)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 Laporan cakupan: {report_path}")
+
 def process_file(input_path, output_path):
     """Proses satu file JSON dan generate variasi"""
     print(f"📁 Memproses: {input_path}")
+    TEMPLATE_SAMPLER.begin(category_from_filename(input_path))
 
     try:
         with open(input_path, 'r', encoding='utf-8') as f:
@@ -197,25 +293,13 @@ def process_file(input_path, output_path):
 
         results = []
 
-        # Handle dua format
         for idx, item in enumerate(data):
-            if "Q" in item and "A" in item:
-                question = item["Q"]
-                answer = item["A"]
-            elif "instruction" in item and "response" in item:
-                question = item["instruction"]
-                answer = item["response"]
-            else:
+            entry = make_record(item)
+            if entry is None:
                 print(f"⚠️  Item {idx} tidak memiliki format yang dikenali, dilewati")
                 continue
 
-            # Generate 5 variasi
-            variations = generate_variations(question, answer)
-
-            results.append({
-                "original_Q": question,
-                "variations": variations
-            })
+            results.append(entry)
 
             # Progress indicator
             if (idx + 1) % 50 == 0:
@@ -238,8 +322,11 @@ def process_file(input_path, output_path):
         print(f"❌ Error: {e}\n")
         return False
 
-def main():
+def main(templates='least_used', seed=42):
     """Main function"""
+    global TEMPLATE_SAMPLER
+    TEMPLATE_SAMPLER = TemplateSampler(templates, seed)
+
     print("="*70)
     print("🚀 GENERATOR VARIASI PERTANYAAN DATASET Q&A - IMPROVED VERSION")
     print("="*70)
@@ -251,6 +338,7 @@ def main():
 
     success_count = 0
     failed_files = []
+    output_paths = []
 
     for filename in INPUT_FILES:
         input_path = base_dir / filename
@@ -263,6 +351,7 @@ def main():
         # Proses file
         if process_file(input_path, output_path):
             success_count += 1
+            output_paths.append(output_path)
         else:
             failed_files.append(filename)
 
@@ -279,8 +368,52 @@ def main():
         for f in failed_files:
             print(f"  - {f}")
 
+    report_template_coverage(output_paths, base_dir / "template_coverage.json")
+
     print("\n✅ Semua file output tersimpan di: /root/dataset/")
     print("="*70)
 
+def main_parallel(workers, seed, chunk_size, templates='least_used'):
+    """Main function - mode paralel dengan seed deterministik per record"""
+    print("="*70)
+    print("🚀 GENERATOR VARIASI PERTANYAAN DATASET Q&A - IMPROVED VERSION (PARALEL)")
+    print("="*70)
+    print()
+
+    base_dir = Path("/root/dataset")
+    jobs = [
+        (base_dir / filename, base_dir / f"{filename.replace('.json', '')}_variasi.json")
+        for filename in INPUT_FILES
+    ]
+
+    stats = run_parallel(make_record, jobs, workers=workers, master_seed=seed, chunk_size=chunk_size,
+                         init_chunk=template_chunk_hook(jobs, chunk_size, templates, seed))
+
+    print("\n" + "="*70)
+    print("📊 RINGKASAN")
+    print("="*70)
+    print(f"Total file diproses: {len(INPUT_FILES)}")
+    print(f"Berhasil: {stats['files']}")
+    print(f"Gagal: {len(stats['failed_files'])}")
+    print(f"Master seed: {seed}")
+
+    report_template_coverage([output for _, output in jobs], base_dir / "template_coverage.json")
+    print("="*70)
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generator variasi pertanyaan (improved)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Mode paralel: jumlah worker process (0 = jumlah CPU)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Master seed mode paralel (output identik berapa pun jumlah worker) '
+                             'dan urutan template seimbang')
+    parser.add_argument('--chunk-size', type=int, default=200,
+                        help='Jumlah record per task, file besar dipecah per chunk')
+    parser.add_argument('--templates', choices=STRATEGIES, default='least_used',
+                        help='Pemilihan template formal/panjang: seimbang per kategori atau random.choice')
+    args = parser.parse_args()
+
+    if args.workers is None:
+        main(args.templates, args.seed)
+    else:
+        main_parallel(args.workers or None, args.seed, args.chunk_size, args.templates)
@@ -0,0 +1,132 @@
+"""
+Cache jawaban model di disk (SQLite, dipakai yasjks.py)
+
+Key = sha256(fingerprint model, prompt lengkap, parameter decoding):
+- fingerprint model lokal = hash config + file bobot (*.safetensors / *.bin);
+  hasil hash diingat per (path, ukuran, mtime) agar file besar tidak di-hash ulang
+- model dari Hub = nama model + commit sha hasil resolve revision (branch seperti
+  'main' bisa bergeser); jika sha tidak bisa di-resolve (offline dan belum ada di
+  cache huggingface_hub), fingerprint None dan cache tidak dipakai
+Jawaban hanya di-generate untuk pertanyaan baru / berubah, atau jika model,
+system prompt, atau parameter decoding berubah.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+WEIGHT_PATTERNS = ("config.json", "*.safetensors", "*.bin")
+
+
+def resolve_hub_revision(repo_id, revision=None):
+    """Commit sha untuk revision model di Hub (online, lalu cache lokal huggingface_hub), None jika gagal"""
+    revision = revision or 'main'
+    if re.fullmatch(r'[0-9a-f]{40}', revision):
+        return revision
+
+    try:
+        from huggingface_hub import model_info
+        return model_info(repo_id, revision=revision).sha
+    except Exception:
+        pass
+    try:
+        # Offline: snapshot yang sudah diunduh, direktorinya bernama commit sha
+        from huggingface_hub import snapshot_download
+        return Path(snapshot_download(repo_id, revision=revision, local_files_only=True)).name
+    except Exception:
+        return None
+
+
+def generation_key(model_fingerprint, prompt, params):
+    payload = json.dumps([model_fingerprint, prompt, params], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS generations (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                params TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+        """)
+        self.stats = {'hits': 0, 'misses': 0}
+
+    # ------------------------------------------------------------------
+    # Fingerprint model
+    # ------------------------------------------------------------------
+    def _file_hash(self, path):
+        stat = path.stat()
+        row = self.conn.execute(
+            "SELECT sha256 FROM file_hashes WHERE path = ? AND size = ? AND mtime = ?",
+            (str(path), stat.st_size, stat.st_mtime)).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.conn.execute("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                          (str(path), stat.st_size, stat.st_mtime, digest.hexdigest()))
+        self.conn.commit()
+        return digest.hexdigest()
+
+    def model_fingerprint(self, model_name_or_path, revision=None):
+        """Fingerprint untuk key cache, None jika revision model Hub tidak bisa di-resolve"""
+        path = Path(model_name_or_path)
+        if not path.is_dir():
+            sha = resolve_hub_revision(model_name_or_path, revision)
+            return f"hub:{model_name_or_path}@{sha}" if sha else None
+
+        files = sorted({f for pattern in WEIGHT_PATTERNS for f in path.glob(pattern)})
+        digest = hashlib.sha256()
+        for f in files:
+            digest.update(f.name.encode('utf-8'))
+            digest.update(self._file_hash(f.resolve()).encode('ascii'))
+        return f"local:{digest.hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Lookup / simpan
+    # ------------------------------------------------------------------
+    def get_many(self, model_fingerprint, prompts, params):
+        """Return dict prompt -> jawaban untuk prompt yang sudah ada di cache"""
+        found = {}
+        for prompt in dict.fromkeys(prompts):
+            row = self.conn.execute("SELECT answer FROM generations WHERE key = ?",
+                                    (generation_key(model_fingerprint, prompt, params),)).fetchone()
+            if row:
+                found[prompt] = row[0]
+
+        unique = len(set(prompts))
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += unique - len(found)
+        return found
+
+    def put_many(self, model_fingerprint, prompts, answers, params):
+        params_json = json.dumps(params, sort_keys=True)
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?, ?, ?)",
+            [(generation_key(model_fingerprint, p, params), model_fingerprint, p, params_json, a, now)
+             for p, a in zip(prompts, answers)])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
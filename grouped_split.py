@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Split train/eval/test tanpa kebocoran antar split (dipakai prepare_dataset.py)
+
+Split acak per record menaruh variasi dari pertanyaan yang sama di split
+berbeda, sehingga skor test terlalu tinggi. Di sini:
+- Record dikelompokkan berdasarkan jawaban yang dinormalisasi (default) atau
+  berdasarkan original_Q dari file *_variasi.json
+- Grup (bukan record) dibagi ke split, distratifikasi per kategori
+  (kategori diambil dari nama file *_flat.json / *_variasi.json tempat jawaban berasal)
+- Di setiap kategori grup diacak dengan seed lalu diberikan ke split yang
+  paling kurang dari target rasionya (dihitung dalam jumlah record)
+- Input dibaca streaming dua kali, output JSONL ditulis streaming (urutan input)
+"""
+
+import argparse
+import glob
+import json
+import random
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from jsonstream import iter_json_array
+from records import read_records, to_dict
+
+SPLITS = ("train", "eval", "test")
+DEFAULT_RATIOS = (0.8, 0.15, 0.05)
+
+SYSTEM_PROMPT = ("Anda adalah asisten informasi UNSIQ (Universitas Sains Al-Qur'an) yang membantu menjawab "
+                 "pertanyaan tentang biaya kuliah, program studi, dan informasi akademik.")
+
+
+def normalize_text(text):
+    return ' '.join(text.lower().split())
+
+
+def category_from_filename(path):
+    """dataset-biaya2_clean_flat.json -> biaya"""
+    stem = Path(path).stem
+    stem = re.sub(r'_(flat|variasi)$', '', stem)
+    stem = re.sub(r'^dataset[-_]?', '', stem)
+    stem = re.sub(r'_clean$', '', stem)
+    return re.sub(r'\d+$', '', stem) or 'unknown'
+
+
+def convert_to_gemma_format(record):
+    """
+    Konversi Record ke format chat Gemma
+    Format Gemma menggunakan messages dengan roles: system, user, assistant
+    """
+    return to_dict(record, "messages", SYSTEM_PROMPT)
+
+
+def load_categories(*patterns):
+    """Jawaban (dinormalisasi) -> kategori, dari file *_flat.json / *_variasi.json"""
+    categories = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            category = category_from_filename(path)
+            for item in iter_json_array(path):
+                answers = [item.get('original_A', item.get('A', ''))]
+                answers += [v.get('A', '') for v in item.get('variations', [])]
+                for answer in answers:
+                    categories.setdefault(normalize_text(answer), category)
+    return categories
+
+
+def load_original_groups(pattern):
+    """Pertanyaan variasi (dinormalisasi) -> original_Q, dari file *_variasi.json"""
+    groups = {}
+    for path in sorted(glob.glob(pattern)):
+        for item in iter_json_array(path):
+            # File variasi tanpa original_Q (format flat {Q, A}) dikelompokkan per jawaban
+            if 'original_Q' not in item:
+                continue
+            original = item['original_Q']
+            groups.setdefault(normalize_text(original), original)
+            for variation in item.get('variations', []):
+                groups.setdefault(normalize_text(variation['Q']), original)
+    return groups
+
+
+def assign_groups(group_sizes, group_categories, ratios=DEFAULT_RATIOS, seed=42):
+    """
+    Return dict grup -> nama split.
+
+    Per kategori: grup diacak (seed), lalu setiap grup masuk ke split dengan
+    kekurangan terbesar terhadap target (rasio x jumlah record kategori).
+    """
+    by_category = defaultdict(list)
+    for group in group_sizes:
+        by_category[group_categories[group]].append(group)
+
+    rng = random.Random(seed)
+    assignment = {}
+    for category in sorted(by_category):
+        groups = sorted(by_category[category])
+        rng.shuffle(groups)
+
+        total = sum(group_sizes[g] for g in groups)
+        targets = [r * total for r in ratios]
+        filled = [0] * len(ratios)
+        for group in groups:
+            split = max(range(len(ratios)), key=lambda s: (targets[s] - filled[s], -s))
+            assignment[group] = SPLITS[split]
+            filled[split] += group_sizes[group]
+    return assignment
+
+
+def grouped_split(input_file, output_dir="data", group_by="answer", ratios=DEFAULT_RATIOS, seed=42,
+                  flat_pattern="*_flat.json", variasi_pattern="*_variasi.json"):
+    """
+    Split input (format apa pun yang dikenali records.py) ke output_dir/{train,eval,test}.jsonl.
+    Return laporan (dict) jumlah record & grup per split dan per kategori.
+    """
+    categories = load_categories(flat_pattern, variasi_pattern)
+    originals = load_original_groups(variasi_pattern) if group_by == "original" else {}
+
+    # Pass 1: grup & kategori per record (hanya key, bukan record lengkap)
+    record_groups = []
+    group_sizes = Counter()
+    group_categories = {}
+    for record in read_records(input_file):
+        answer_key = normalize_text(record.answer)
+        group = answer_key
+        if group_by == "original":
+            original = originals.get(normalize_text(record.question))
+            group = f"Q:{original}" if original is not None else f"A:{answer_key}"
+
+        record_groups.append(group)
+        group_sizes[group] += 1
+        group_categories.setdefault(group, categories.get(answer_key, 'unknown'))
+
+    assignment = assign_groups(group_sizes, group_categories, ratios, seed)
+
+    # Pass 2: tulis streaming
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = {split: open(output_dir / f"{split}.jsonl", 'w', encoding='utf-8') for split in SPLITS}
+    try:
+        for record, group in zip(read_records(input_file), record_groups):
+            files[assignment[group]].write(json.dumps(convert_to_gemma_format(record), ensure_ascii=False) + '\n')
+    finally:
+        for f in files.values():
+            f.close()
+
+    return split_report(record_groups, assignment, group_categories)
+
+
+def split_report(record_groups, assignment, group_categories):
+    records = Counter(assignment[g] for g in record_groups)
+    groups = Counter(assignment.values())
+    per_category = defaultdict(lambda: {split: {'records': 0, 'groups': 0} for split in SPLITS})
+    for group, split in assignment.items():
+        per_category[group_categories[group]][split]['groups'] += 1
+    for group in record_groups:
+        per_category[group_categories[group]][assignment[group]]['records'] += 1
+
+    return {
+        'records': {split: records[split] for split in SPLITS},
+        'groups': {split: groups[split] for split in SPLITS},
+        'categories': {category: per_category[category] for category in sorted(per_category)},
+    }
+
+
+def print_report(report):
+    total = sum(report['records'].values())
+    print(f"\n{'Split':<8} {'Record':>8} {'%':>7} {'Grup':>7}")
+    for split in SPLITS:
+        n = report['records'][split]
+        print(f"{split:<8} {n:>8} {n / total * 100 if total else 0:>6.1f}% {report['groups'][split]:>7}")
+
+    print(f"\n{'Kategori':<12} " + ' '.join(f"{split + ' (rec/grp)':>20}" for split in SPLITS))
+    for category, splits in report['categories'].items():
+        cells = ' '.join(f"{splits[s]['records']:>12}/{splits[s]['groups']:<7}" for s in SPLITS)
+        print(f"{category:<12} {cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split train/eval/test per grup jawaban (tanpa kebocoran)")
+    parser.add_argument('--input', default='dataset_combined_all_variations.json')
+    parser.add_argument('--output-dir', default='data')
+    parser.add_argument('--group-by', choices=['answer', 'original'], default='answer')
+    parser.add_argument('--ratios', type=float, nargs=3, default=list(DEFAULT_RATIOS), metavar=('TRAIN', 'EVAL', 'TEST'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--flat', default='*_flat.json', help='Glob file flat (kategori)')
+    parser.add_argument('--variasi', default='*_variasi.json', help='Glob file variasi (kategori & group-by original)')
+    parser.add_argument('--report', default=None, help='Simpan laporan JSON')
+    args = parser.parse_args()
+
+    report = grouped_split(args.input, args.output_dir, args.group_by, tuple(args.ratios), args.seed,
+                           args.flat, args.variasi)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
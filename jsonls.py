@@ -1,55 +1,35 @@
 import json
-import re
+
+from records import RecordWriter, read_records, to_dict
 
 # ============================================================
-# 1. LOAD DATA DARI FILE JSON
+# 1. INPUT / OUTPUT
 # ============================================================
 
 input_file = "dataset_combined_all_variations.json"        # ganti sesuai file kamu
 output_file = "pmb_dataset_gsm8k.jsonl"
 
-with open(input_file, 'r', encoding='utf-8') as f:
-    raw_data = json.load(f)        # JSON berisi list objek [{'Q':..., 'A':...}, ...]
-
-gsm8k_data = []
-
 # ============================================================
-# 2. KONVERSI KE FORMAT GSM8K
+# 2. KONVERSI KE FORMAT GSM8K (streaming, satu pass)
 #    answer: [jawaban lengkap] #### [jawaban singkat]
+#    jawaban singkat = nominal uang (Rp...) pertama, atau jawaban lengkap
+#    record rusak (Q/A kosong) dilewati
 # ============================================================
 
-for item in raw_data:
-    # Bisa pakai key 'Q' atau 'question'
-    question = item.get("Q") or item.get("question")
-    answer = item.get("A") or item.get("answer")
-
-    if not question or not answer:
-        continue  # skip kalau ada data rusak
-
-    # Ambil nominal uang sebagai "jawaban singkat"
-    numbers = re.findall(r'Rp[\d\.]+', answer)
-    final_answer = numbers[0] if numbers else answer
-
-    formatted_answer = f"{answer} #### {final_answer}"
-
-    gsm8k_data.append({
-        "question": question,
-        "answer": formatted_answer
-    })
-
+first_record = None
+with RecordWriter(output_file, "gsm8k") as writer:
+    for record in read_records(input_file):
+        writer.write(record)
+        if first_record is None:
+            first_record = record
 
 # ============================================================
-# 3. SIMPAN OUTPUT KE FILE JSONL
+# 3. RINGKASAN
 # ============================================================
 
-with open(output_file, 'w', encoding='utf-8') as f:
-    for entry in gsm8k_data:
-        json.dump(entry, f, ensure_ascii=False)
-        f.write("\n")
-
 print("✅ Berhasil convert!")
 print(f"📦 Output disimpan di: {output_file}")
-print(f"📊 Total data: {len(gsm8k_data)}")
+print(f"📊 Total data: {writer.count}")
 
 print("\n🔍 Contoh data pertama:")
-print(json.dumps(gsm8k_data[0], indent=2, ensure_ascii=False))
+print(json.dumps(to_dict(first_record, "gsm8k"), indent=2, ensure_ascii=False))
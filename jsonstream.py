@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilitas baca/tulis JSON secara streaming
+- iter_json_array: yield elemen array JSON top-level satu per satu (tanpa json.load)
+  dari path, file, memory map atau bytes, opsional beserta byte offset elemen
+- iter_jsonl: yield objek dari file JSONL (opsional beserta byte offset baris)
+- write_jsonl_line: tulis satu objek sebagai satu baris JSONL
+- JsonArrayWriter: tulis array JSON elemen per elemen (format sama dengan json.dump indent=2)
+"""
+
+import codecs
+import io
+import json
+import mmap
+import os
+import re
+from contextlib import ExitStack
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+_BOM = '\ufeff'
+
+# Satu encoder dipakai ulang (json.dumps dengan argumen non-default membuat encoder baru tiap panggilan)
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _binary_reader(source, use_mmap, stack):
+    """(objek dengan .read(n), nama untuk pesan error) dari path, file, mmap atau bytes"""
+    if isinstance(source, (str, os.PathLike)):
+        f = stack.enter_context(open(source, 'rb'))
+        if use_mmap:
+            try:
+                return stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)), source
+            except ValueError:
+                pass  # File kosong tidak bisa di-mmap
+        return f, source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source), '<bytes>'
+    return source, getattr(source, 'name', '<stream>')
+
+
+def iter_json_array(source, chunk_size=1 << 16, with_offsets=False, use_mmap=False):
+    """
+    Yield elemen array JSON top-level satu per satu.
+
+    source: path, file yang sudah dibuka (biner atau teks), mmap.mmap, atau
+    bytes. Hanya satu elemen (plus sisa buffer) yang ada di memori, jadi
+    pemakaian memori tidak bergantung pada ukuran file. use_mmap=True: path
+    dibuka sebagai memory map read-only (halaman file dimuat OS sesuai
+    kebutuhan, tanpa salinan di buffer read Python).
+
+    with_offsets=True: yield (byte offset awal elemen, elemen). Setiap
+    karakter di-encode ulang paling banyak sekali untuk menghitung offset.
+
+    Seperti json.load, data selain whitespace setelah ']' penutup (file
+    tergabung/rusak) menghasilkan ValueError setelah elemen terakhir.
+    """
+    decoder = json.JSONDecoder()
+
+    with ExitStack() as stack:
+        reader, name = _binary_reader(source, use_mmap, stack)
+        # UTF-8 didecode bertahap per chunk biner; \r\n tidak diterjemahkan, jadi posisi karakter sesuai isi file
+        decode = codecs.getincrementaldecoder('utf-8')().decode
+        buf = ''
+        pos = 0
+        eof = False
+        read_size = chunk_size
+        # Byte offset karakter buf[mark] (hanya dipakai jika with_offsets)
+        mark = 0
+        mark_bytes = 0
+
+        def fill():
+            nonlocal buf, pos, eof, read_size, mark, mark_bytes
+            chunk = ''
+            while not chunk and not eof:
+                raw = reader.read(read_size)
+                eof = not raw
+                chunk = raw if isinstance(raw, str) else decode(raw, final=eof)
+            if not chunk:
+                return False
+            if with_offsets:
+                mark_bytes += len(buf[mark:pos].encode('utf-8'))
+                mark = 0
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                match = _NON_WHITESPACE.search(buf, pos)
+                if match:
+                    pos = match.start()
+                    return
+                pos = len(buf)
+                if not fill():
+                    return
+
+        def check_end():
+            # Setelah ']' penutup hanya boleh whitespace sampai EOF (sama seperti json.load)
+            nonlocal pos
+            pos += 1
+            skip_whitespace()
+            if pos < len(buf):
+                raise ValueError(f"{name}: data tambahan {buf[pos]!r} setelah array JSON ditutup")
+
+        skip_whitespace()
+        if buf.startswith(_BOM, pos):
+            pos += 1
+            skip_whitespace()
+        if pos >= len(buf) or buf[pos] != '[':
+            raise ValueError(f"{name}: bukan array JSON (harus diawali '[')")
+        pos += 1
+
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == ']':
+            check_end()
+            return
+
+        # Jalur panas di-inline (tanpa panggilan skip_whitespace); fill hanya di ujung buffer
+        search = _NON_WHITESPACE.search
+        scan_once = decoder.scan_once
+        while True:
+            match = search(buf, pos)
+            if match is None:
+                skip_whitespace()
+            else:
+                pos = match.start()
+            if with_offsets:
+                mark_bytes += len(buf[mark:pos].encode('utf-8'))
+                mark = pos
+            try:
+                item, end = scan_once(buf, pos)
+                # Angka di ujung buffer bisa terpotong, pastikan elemen diikuti pemisah
+                if not eof and (end >= len(buf) or buf[end] not in _DELIMITERS):
+                    raise StopIteration(end)
+            except (StopIteration, json.JSONDecodeError) as e:
+                if eof:
+                    if isinstance(e, StopIteration):
+                        raise json.JSONDecodeError("Expecting value", buf, e.value) from None
+                    raise
+                # Elemen belum lengkap di buffer: baca lagi (ukuran baca digandakan)
+                fill()
+                read_size *= 2
+                continue
+
+            read_size = chunk_size
+            pos = end
+            yield (mark_bytes, item) if with_offsets else item
+
+            match = search(buf, pos)
+            if match is None:
+                skip_whitespace()
+            else:
+                pos = match.start()
+            if pos >= len(buf):
+                raise ValueError(f"{name}: array JSON tidak ditutup")
+            if buf[pos] == ',':
+                pos += 1
+            elif buf[pos] == ']':
+                check_end()
+                return
+            else:
+                raise ValueError(f"{name}: karakter tidak terduga {buf[pos]!r} setelah elemen array")
+
+
+def iter_jsonl(path, with_offsets=False):
+    """
+    Yield objek dari file JSONL (baris kosong dilewati).
+    with_offsets=True: yield (byte offset awal baris di file, objek).
+    """
+    # Dibaca sebagai bytes (json.loads menerima bytes UTF-8), jadi offset = jumlah panjang baris
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                obj = json.loads(line)
+                yield (offset, obj) if with_offsets else obj
+            offset += len(line)
+
+
+def write_jsonl_line(f, obj):
+    """Tulis satu objek sebagai satu baris JSONL"""
+    f.write(_ENCODER.encode(obj) + '\n')
+
+
+class JsonArrayWriter:
+    """
+    Tulis array JSON elemen per elemen ke file yang sudah dibuka.
+
+    Output identik dengan json.dump(list, f, ensure_ascii=False, indent=2),
+    tanpa perlu menampung seluruh list di memori. Jika blok with gagal,
+    penutup ']' tidak ditulis sehingga file setengah jadi tidak terbaca
+    sebagai array JSON yang valid.
+    """
+
+    def __init__(self, f, indent=2):
+        self.f = f
+        self.indent = indent
+        self.count = 0
+
+    def write(self, obj):
+        pad = ' ' * self.indent
+        if isinstance(obj, dict) and obj and all(isinstance(k, str) and isinstance(v, _SCALARS) for k, v in obj.items()):
+            # Jalur cepat untuk objek datar ({Q, A} dsb): tiap nilai di-encode oleh encoder C
+            inner = ',\n'.join(f"{pad}{pad}{_ENCODER.encode(k)}: {_ENCODER.encode(v)}" for k, v in obj.items())
+            text = f"{{\n{inner}\n{pad}}}"
+        else:
+            text = json.dumps(obj, ensure_ascii=False, indent=self.indent)
+            text = text.replace('\n', '\n' + pad)
+        self.f.write(('[\n' if self.count == 0 else ',\n') + pad + text)
+        self.count += 1
+
+    def close(self):
+        self.f.write('\n]' if self.count else '[]')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index near-duplicate untuk pertanyaan variasi (MinHash + LSH)
+
+Menggantikan scan berpasangan SequenceMatcher yang O(n²):
+- Setiap teks dipecah menjadi character n-gram lalu diringkas menjadi signature MinHash
+- Signature dibagi ke beberapa band LSH, teks dengan band identik menjadi kandidat
+- Hanya kandidat yang dicek ulang dengan SequenceMatcher.ratio() (nilai eksak)
+
+Lookup kandidat kira-kira konstan per query, tidak bergantung pada jumlah teks di index.
+"""
+
+import random
+import zlib
+from difflib import SequenceMatcher
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def char_ngrams(text, n=3):
+    """Himpunan character n-gram (dengan padding spasi di kedua sisi)"""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    Index MinHash/LSH dengan re-check SequenceMatcher pada kandidat.
+
+    Default 96 permutasi dalam 32 band (3 baris per band): pasangan dengan
+    Jaccard n-gram >= 0.5 hampir pasti menjadi kandidat, cukup longgar untuk
+    menangkap pasangan dengan SequenceMatcher.ratio() >= 0.90.
+    """
+
+    def __init__(self, threshold=0.90, ngram=3, num_perm=96, bands=32, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) harus kelipatan bands ({bands})")
+
+        self.threshold = threshold
+        self.ngram = ngram
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._texts = []
+        self._buckets = [{} for _ in range(bands)]
+        self.stats = {'queries': 0, 'candidates': 0, 'rechecks': 0}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def clear(self):
+        """Kosongkan index (parameter hash tetap)"""
+        self._texts = []
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def _signature(self, text):
+        hashes = [zlib.crc32(g.encode('utf-8')) for g in char_ngrams(text, self.ngram)]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [tuple(signature[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    def add(self, text):
+        """Tambahkan teks ke index, return id internal"""
+        text_id = len(self._texts)
+        self._texts.append(text)
+
+        for bucket, key in zip(self._buckets, self._band_keys(self._signature(text))):
+            bucket.setdefault(key, []).append(text_id)
+
+        return text_id
+
+    def candidates(self, text):
+        """Id teks yang berbagi minimal satu band LSH dengan `text`"""
+        found = set()
+        for bucket, key in zip(self._buckets, self._band_keys(self._signature(text))):
+            ids = bucket.get(key)
+            if ids:
+                found.update(ids)
+        return found
+
+    def max_similarity(self, text, threshold=None):
+        """
+        SequenceMatcher.ratio() tertinggi antara `text` dan kandidat di index.
+
+        Kandidat yang batas atasnya (real_quick_ratio/quick_ratio) di bawah
+        threshold dilewati, jadi nilai yang dikembalikan eksak untuk semua
+        pasangan >= threshold dan bisa lebih rendah dari nilai sebenarnya di bawahnya.
+        """
+        if threshold is None:
+            threshold = self.threshold
+
+        candidate_ids = self.candidates(text)
+        self.stats['queries'] += 1
+        self.stats['candidates'] += len(candidate_ids)
+
+        max_similarity = 0.0
+        for text_id in candidate_ids:
+            # Urutan argumen sama dengan scan lama: (pertanyaan baru, pertanyaan yang sudah ada)
+            matcher = SequenceMatcher(None, text, self._texts[text_id])
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            self.stats['rechecks'] += 1
+            max_similarity = max(max_similarity, matcher.ratio())
+
+        return max_similarity
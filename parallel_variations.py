@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Eksekusi paralel (process pool) untuk generator variasi pertanyaan
+
+- Daftar file dan file besar (per chunk) disebar ke beberapa worker
+- Seed per record diturunkan dari master seed + nama file + index record,
+  jadi output identik berapa pun jumlah worker dan urutan file
+- Laporan throughput dalam records/sec
+"""
+
+import hashlib
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def derive_seed(master_seed, *parts):
+    """Seed 64-bit deterministik dari master seed dan komponen kunci (nama file, index, ...)"""
+    key = ':'.join(str(part) for part in (master_seed,) + parts)
+    return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+
+def _run_chunk(task):
+    """Jalankan make_record untuk satu chunk; global `random` di-seed ulang per record"""
+    make_record, filename, start, items, master_seed, init_chunk = task
+    results = []
+
+    if init_chunk is not None:
+        init_chunk(filename, start)
+
+    for offset, item in enumerate(items):
+        random.seed(derive_seed(master_seed, filename, start + offset))
+        results.append(make_record(item))
+
+    return results
+
+
+def run_parallel(make_record, jobs, workers=None, master_seed=42, chunk_size=200, init_chunk=None):
+    """
+    Proses beberapa file secara paralel.
+
+    make_record: fungsi module-level item -> entry output (None = item dilewati)
+    jobs: list (input_path, output_path)
+    workers: jumlah proses (None = jumlah CPU, 1 = tanpa process pool)
+    init_chunk: fungsi module-level (filename, start) yang dipanggil di awal setiap chunk,
+        untuk me-reset state per chunk (mis. sampler template) supaya output tidak
+        bergantung pada worker mana yang memproses chunk
+    """
+    tasks = []
+    task_jobs = []
+    results = {}
+    failed = []
+
+    for job_idx, (input_path, output_path) in enumerate(jobs):
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Gagal membaca {input_path}: {e}")
+            failed.append(str(input_path))
+            continue
+
+        results[job_idx] = []
+        filename = Path(input_path).name
+        for start in range(0, len(data), chunk_size):
+            tasks.append((make_record, filename, start, data[start:start + chunk_size], master_seed, init_chunk))
+            task_jobs.append(job_idx)
+
+    start_time = time.perf_counter()
+
+    if workers == 1:
+        chunk_results = map(_run_chunk, tasks)
+        for job_idx, chunk in zip(task_jobs, chunk_results):
+            results[job_idx].extend(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() mempertahankan urutan task, jadi urutan record per file tetap
+            for job_idx, chunk in zip(task_jobs, executor.map(_run_chunk, tasks)):
+                results[job_idx].extend(chunk)
+
+    elapsed = time.perf_counter() - start_time
+
+    total_records = 0
+    total_skipped = 0
+    for job_idx, entries in results.items():
+        output_path = jobs[job_idx][1]
+        kept = [entry for entry in entries if entry is not None]
+        total_records += len(entries)
+        total_skipped += len(entries) - len(kept)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(kept, f, ensure_ascii=False, indent=2)
+
+        print(f"✅ {output_path} ({len(kept)} pertanyaan)")
+
+    stats = {
+        'files': len(results),
+        'failed_files': failed,
+        'records': total_records,
+        'skipped': total_skipped,
+        'chunks': len(tasks),
+        'workers': workers,
+        'seconds': elapsed,
+        'records_per_sec': total_records / elapsed if elapsed > 0 else 0.0,
+    }
+
+    print(f"\n⚡ Throughput: {stats['records']} records dalam {elapsed:.2f}s "
+          f"({stats['records_per_sec']:.1f} records/sec, {len(tasks)} chunk, workers={workers or 'auto'})")
+
+    return stats
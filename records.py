@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Satu tipe record Q&A + reader/writer streaming untuk semua format dataset
+
+Format yang dikenali (per objek, dideteksi dari key-nya):
+  qa          : {"Q": ..., "A": ...}                     (*_flat.json, combined)
+  instruction : {"instruction": ..., "response": ...}
+  gemma       : {"text": "<start_of_turn>user\\n...<end_of_turn>..."}  (train_pmb_*.json)
+  messages    : {"messages": [...], "metadata": {...}}   (data/*.jsonl, clean/jsonl_convert.py)
+  gsm8k       : {"question": ..., "answer": "... #### ..."}  (jsonls.py)
+
+File .jsonl dibaca/ditulis per baris, .parquet dibaca lewat columnar.py
+(opsional, butuh pyarrow), file lain sebagai array JSON (iter_json_array /
+JsonArrayWriter). Konversi file = satu pass streaming: objek dibaca satu per
+satu, diubah ke Record (string tidak disalin), lalu langsung ditulis; tidak
+ada list perantara seukuran file.
+"""
+
+import argparse
+import re
+
+from gemma_turns import TURN_END, TURN_START, first_turns
+from jsonstream import JsonArrayWriter, iter_json_array, iter_jsonl, write_jsonl_line
+
+FORMATS = ("qa", "instruction", "gemma", "messages", "gsm8k")
+
+_RP_PATTERN = re.compile(r'Rp[\d\.]+')
+
+
+class Record:
+    """Satu pasangan tanya-jawab (opsional system prompt & metadata)"""
+
+    __slots__ = ('question', 'answer', 'system', 'metadata')
+
+    def __init__(self, question, answer, system=None, metadata=None):
+        self.question = question
+        self.answer = answer
+        self.system = system
+        self.metadata = metadata
+
+    def __repr__(self):
+        return f"Record(question={self.question[:40]!r}, answer={self.answer[:40]!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Record) and all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+
+def detect_format(obj):
+    if 'messages' in obj:
+        return 'messages'
+    if 'text' in obj:
+        return 'gemma'
+    if 'Q' in obj:
+        return 'qa'
+    if 'instruction' in obj:
+        return 'instruction'
+    if 'question' in obj:
+        return 'gsm8k'
+    raise ValueError(f"Format record tidak dikenali (key: {sorted(obj)})")
+
+
+def parse_gemma_text(text):
+    """(system, question, answer) dari text format chat Gemma (lihat gemma_turns.first_turns)"""
+    return first_turns(text)
+
+
+def from_dict(obj, fmt=None):
+    """Objek JSON -> Record (None jika record rusak / tidak lengkap)"""
+    fmt = fmt or detect_format(obj)
+
+    if fmt == 'qa':
+        question, answer = obj.get('Q'), obj.get('A')
+        return Record(question, answer) if question and answer else None
+
+    if fmt == 'instruction':
+        question, answer = obj.get('instruction'), obj.get('response')
+        return Record(question, answer) if question and answer else None
+
+    if fmt == 'gemma':
+        system, question, answer = parse_gemma_text(obj.get('text', ''))
+        return Record(question, answer, system) if question and answer else None
+
+    if fmt == 'messages':
+        system = question = answer = None
+        for message in obj.get('messages', []):
+            role = message.get('role')
+            if role == 'system' and system is None:
+                system = message.get('content')
+            elif role == 'user' and question is None:
+                question = message.get('content')
+            elif role == 'assistant' and question is not None:
+                answer = message.get('content')
+                break
+        return Record(question, answer, system, obj.get('metadata')) if question and answer else None
+
+    if fmt == 'gsm8k':
+        question, answer = obj.get('question'), obj.get('answer')
+        if not question or not answer:
+            return None
+        # Hapus "#### <jawaban singkat>" yang ditambahkan writer gsm8k
+        return Record(question, answer.rsplit(' #### ', 1)[0])
+
+    raise ValueError(f"Format tidak dikenal: {fmt}")
+
+
+def gsm8k_final_answer(answer):
+    """Jawaban singkat GSM8K: nominal Rp pertama, atau seluruh jawaban"""
+    match = _RP_PATTERN.search(answer)
+    return match.group(0) if match else answer
+
+
+def to_dict(record, fmt, system_prompt=None):
+    """Record -> objek JSON format fmt (system_prompt dipakai jika record tidak punya system)"""
+    system = record.system or system_prompt
+
+    if fmt == 'qa':
+        return {"Q": record.question, "A": record.answer}
+
+    if fmt == 'instruction':
+        return {"instruction": record.question, "response": record.answer}
+
+    if fmt == 'gemma':
+        text = f"{TURN_START}system\n{system}{TURN_END}\n" if system else ""
+        text += (f"{TURN_START}user\n{record.question}{TURN_END}\n"
+                 f"{TURN_START}model\n{record.answer}{TURN_END}")
+        return {"text": text}
+
+    if fmt == 'messages':
+        messages = [{"role": "system", "content": system}] if system else []
+        messages += [
+            {"role": "user", "content": record.question},
+            {"role": "assistant", "content": record.answer},
+        ]
+        obj = {"messages": messages}
+        if record.metadata is not None:
+            obj["metadata"] = record.metadata
+        return obj
+
+    if fmt == 'gsm8k':
+        return {"question": record.question,
+                "answer": f"{record.answer} #### {gsm8k_final_answer(record.answer)}"}
+
+    raise ValueError(f"Format tidak dikenal: {fmt}")
+
+
+def iter_objects(path, filters=None, columns=None):
+    """
+    Objek dari file .jsonl (per baris), .parquet (baris sebagai dict) atau array JSON (streaming).
+    filters/columns hanya untuk Parquet (lihat columnar.iter_parquet).
+    """
+    if str(path).endswith('.parquet'):
+        from columnar import iter_parquet
+
+        return iter_parquet(path, columns, filters)
+    if filters or columns:
+        raise ValueError("filters/columns hanya didukung untuk file .parquet")
+    return iter_jsonl(path) if str(path).endswith('.jsonl') else iter_json_array(path)
+
+
+def read_records(path, fmt=None, stats=None, filters=None):
+    """
+    Yield Record dari file. fmt=None: format dideteksi per objek.
+    stats (dict, opsional) diisi jumlah 'read' dan 'skipped'.
+    filters: filter baris untuk file .parquet, mis. ['category!=biaya'].
+    """
+    if stats is not None:
+        stats.setdefault('read', 0)
+        stats.setdefault('skipped', 0)
+    columns = ('Q', 'A') if str(path).endswith('.parquet') else None
+    for obj in iter_objects(path, filters, columns):
+        record = from_dict(obj, fmt)
+        if stats is not None:
+            stats['read'] += 1
+            if record is None:
+                stats['skipped'] += 1
+        if record is not None:
+            yield record
+
+
+class RecordWriter:
+    """Tulis Record satu per satu ke file .jsonl atau array JSON (indent=2)"""
+
+    def __init__(self, path, fmt, system_prompt=None):
+        self.fmt = fmt
+        self.system_prompt = system_prompt
+        self.jsonl = str(path).endswith('.jsonl')
+        self.f = open(path, 'w', encoding='utf-8')
+        self.array = None if self.jsonl else JsonArrayWriter(self.f)
+        self.count = 0
+
+    def write(self, record):
+        obj = to_dict(record, self.fmt, self.system_prompt)
+        if self.jsonl:
+            write_jsonl_line(self.f, obj)
+        else:
+            self.array.write(obj)
+        self.count += 1
+
+    def close(self, complete=True):
+        # complete=False (konversi gagal): array JSON sengaja tidak ditutup
+        if self.array is not None and complete:
+            self.array.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+
+def convert(input_path, output_path, fmt, input_fmt=None, system_prompt=None, filters=None):
+    """Konversi satu file dalam satu pass streaming, return dict statistik"""
+    stats = {}
+    with RecordWriter(output_path, fmt, system_prompt) as writer:
+        for record in read_records(input_path, input_fmt, stats, filters):
+            writer.write(record)
+    stats['written'] = writer.count
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konversi dataset antar format (qa, instruction, gemma, messages, gsm8k)")
+    parser.add_argument('input')
+    parser.add_argument('output', help='.jsonl = satu objek per baris, lainnya array JSON')
+    parser.add_argument('--to', choices=FORMATS, required=True, help='Format output')
+    parser.add_argument('--from', dest='input_format', choices=FORMATS, default=None,
+                        help='Format input (default: deteksi otomatis per record)')
+    parser.add_argument('--system', default=None, help='System prompt untuk record tanpa system (gemma/messages)')
+    parser.add_argument('--where', nargs='*', default=None, help='Filter untuk input .parquet, mis. category!=biaya')
+    args = parser.parse_args()
+
+    stats = convert(args.input, args.output, args.to, args.input_format, args.system, args.where)
+    print(f"✅ {args.input} → {args.output} ({args.to})")
+    print(f"📊 Dibaca: {stats['read']} | Ditulis: {stats['written']} | Dilewati: {stats['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
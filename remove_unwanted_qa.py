@@ -1,4 +1,4 @@
-import json
+from jsonstream import JsonArrayWriter, iter_json_array
 
 # Kata-kata yang harus dihilangkan dari jawaban
 UNWANTED_KEYWORDS = ["maaf", "konteks", "topik", "Jika Anda ingin tahu", "terlalu umum"]
@@ -16,30 +16,25 @@ def should_remove(answer):
 def filter_qa_dataset(input_file, output_file):
     """
     Filter dataset QA untuk menghapus entries dengan jawaban yang mengandung kata-kata tertentu
-    """
-    # Baca file JSON
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Total entries sebelum filter: {len(data)}")
 
-    # Filter data
-    filtered_data = []
+    File dibaca dan ditulis secara streaming (satu entry di memori), jadi memori
+    tidak bergantung pada ukuran dataset.
+    """
+    total = 0
     removed_count = 0
 
-    for item in data:
-        answer = item.get('A', '')
-        if should_remove(answer):
-            removed_count += 1
-        else:
-            filtered_data.append(item)
+    with open(output_file, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+        for item in iter_json_array(input_file):
+            total += 1
+            answer = item.get('A', '')
+            if should_remove(answer):
+                removed_count += 1
+            else:
+                writer.write(item)
 
+    print(f"Total entries sebelum filter: {total}")
     print(f"Total entries dihapus: {removed_count}")
-    print(f"Total entries setelah filter: {len(filtered_data)}")
-
-    # Simpan hasil filter
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(filtered_data, f, ensure_ascii=False, indent=2)
+    print(f"Total entries setelah filter: {writer.count}")
 
     print(f"\nHasil disimpan ke: {output_file}")
 
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Semantic dedup pertanyaan untuk korpus gabungan (mis. dataset_combined_all_variations.json)
+
+1. Embedding semua pertanyaan (EmbeddingStore: teks yang sudah pernah di-encode tidak di-encode ulang)
+2. Cari pasangan dengan cosine similarity >= threshold:
+   - exact : perkalian matriks per blok baris (tidak pernah membentuk matriks N x N penuh)
+   - lsh   : random-hyperplane LSH (SimHash) beberapa tabel, hanya pasangan dalam
+             bucket yang sama dicek ulang dengan dot product (untuk korpus besar)
+3. Pasangan (array int64 [m, 2]) digabung menjadi cluster secara vektor:
+   hooking ke root terkecil + pointer jumping atas array parent
+4. Di setiap cluster disimpan satu representatif (kemunculan pertama) per jawaban
+   (lexsort atas cluster, jawaban, index); pertanyaan mirip dengan jawaban
+   berbeda tetap disimpan dan dilaporkan
+5. Output ditulis streaming dengan urutan asli + laporan statistik cluster (JSON)
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from embedding_store import STORE_DIR, EmbeddingStore, normalize
+from jsonstream import JsonArrayWriter
+from records import iter_objects
+
+EXACT_MAX_ROWS = 50000
+
+
+_NO_PAIRS = np.zeros((0, 2), dtype=np.int64)
+
+
+def _block_rows(n, memory_mb):
+    """Jumlah baris per blok agar matriks similarity blok x n muat di memory_mb"""
+    return max(1, min(n, int(memory_mb * (1 << 20) / (4 * max(n, 1)))))
+
+
+def exact_pairs(vectors, threshold, memory_mb=256):
+    """Array [m, 2] pasangan (i, j) dengan i < j dan cosine >= threshold, dihitung blok demi blok"""
+    n = vectors.shape[0]
+    vectors = normalize(vectors)
+    block = _block_rows(n, memory_mb)
+    found = []
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        # Hanya segitiga atas: kolom mulai dari start
+        sims = vectors[start:end] @ vectors[start:].T
+        rows, cols = np.nonzero(sims >= threshold)
+        keep = rows < cols
+        found.append(np.stack([start + rows[keep], start + cols[keep]], axis=1).astype(np.int64))
+    return np.concatenate(found) if found else _NO_PAIRS
+
+
+def _pair_sims(vectors, left, right, chunk=65536):
+    """Cosine similarity untuk pasangan baris (left[k], right[k])"""
+    sims = np.empty(len(left), dtype=np.float32)
+    for start in range(0, len(left), chunk):
+        a = normalize(vectors[left[start:start + chunk]])
+        b = normalize(vectors[right[start:start + chunk]])
+        sims[start:start + chunk] = np.einsum('ij,ij->i', a, b)
+    return sims
+
+
+def lsh_pairs(vectors, threshold, bits=16, tables=20, seed=1, chunk_rows=65536, max_bucket=256):
+    """
+    Array [m, 2] pasangan unik (i, j) dengan i < j dan cosine >= threshold:
+    kandidat dari SimHash LSH lalu dicek exact.
+
+    Dengan 16 bit x 20 tabel, pasangan dengan cosine 0.95 (sudut ~18 derajat)
+    lolos sebagai kandidat dengan peluang ~0.98; makin mirip makin pasti.
+    Pasangan dalam bucket dibentuk secara vektor per jarak d di urutan hasil sort;
+    bucket yang lebih besar dari max_bucket dicek per blok.
+    """
+    n, dim = vectors.shape
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((dim, bits * tables)).astype(np.float32)
+    weights = (1 << np.arange(bits, dtype=np.uint32)).astype(np.uint32)
+
+    codes = np.empty((n, tables), dtype=np.uint32)
+    for start in range(0, n, chunk_rows):
+        block = np.asarray(vectors[start:start + chunk_rows], dtype=np.float32)
+        signs = (block @ planes > 0).reshape(len(block), tables, bits)
+        codes[start:start + len(block)] = (signs * weights).sum(axis=2, dtype=np.uint32)
+
+    found = []
+    for t in range(tables):
+        order = np.argsort(codes[:, t], kind='stable')
+        sorted_codes = codes[order, t]
+
+        # Ukuran bucket untuk setiap posisi di urutan sort
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        size_at = np.repeat(sizes, sizes)
+        small = size_at <= max_bucket
+
+        for d in range(1, min(int(sizes.max(initial=1)), max_bucket)):
+            k = np.flatnonzero((sorted_codes[:-d] == sorted_codes[d:]) & small[:-d])
+            if len(k) == 0:
+                break
+            left, right = order[k], order[k + d]
+            sims = _pair_sims(vectors, left, right)
+            hit = sims >= threshold
+            found.append(np.stack([np.minimum(left[hit], right[hit]), np.maximum(left[hit], right[hit])], axis=1))
+
+        for bucket_start, size in zip(starts[sizes > max_bucket], sizes[sizes > max_bucket]):
+            members = order[bucket_start:bucket_start + size]
+            members_vec = normalize(vectors[members])
+            for bstart in range(0, size, max_bucket):
+                sims = members_vec[bstart:bstart + max_bucket] @ members_vec[bstart:].T
+                rows, cols = np.nonzero(sims >= threshold)
+                keep = bstart + rows < bstart + cols
+                i, j = members[bstart + rows[keep]], members[bstart + cols[keep]]
+                found.append(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1))
+
+    if not found:
+        return _NO_PAIRS
+    return np.unique(np.concatenate(found).astype(np.int64), axis=0)
+
+
+def connected_labels(n, pairs):
+    """
+    Label cluster per record = index terkecil di komponen terhubung graf pasangan.
+
+    Setiap putaran: root kedua ujung pasangan yang belum satu cluster di-hook ke
+    root yang lebih kecil (np.minimum.at), lalu pointer jumping sampai setiap
+    parent menunjuk langsung ke root. Pasangan yang sudah satu cluster dibuang,
+    jadi tidak ada loop Python per pasangan atau per record.
+    """
+    parent = np.arange(n, dtype=np.int64)
+    left, right = pairs[:, 0], pairs[:, 1]
+    while len(left):
+        a, b = parent[left], parent[right]
+        pending = a != b
+        left, right, a, b = left[pending], right[pending], a[pending], b[pending]
+        if not len(left):
+            break
+        # Pointer selalu ke index lebih kecil: tidak ada siklus, root = kemunculan pertama
+        np.minimum.at(parent, np.maximum(a, b), np.minimum(a, b))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return parent
+
+
+def find_clusters(vectors, threshold, method='auto', **kwargs):
+    """Return (label cluster per record, jumlah pasangan, metode yang dipakai)"""
+    n = vectors.shape[0]
+    if method == 'auto':
+        method = 'exact' if n <= EXACT_MAX_ROWS else 'lsh'
+
+    pairs = exact_pairs(vectors, threshold) if method == 'exact' else lsh_pairs(vectors, threshold, **kwargs)
+    return connected_labels(n, pairs), len(pairs), method
+
+
+def select_representatives(labels, answers):
+    """Keep mask: satu record per (cluster, jawaban), kemunculan pertama (lexsort label, jawaban, index)"""
+    ids = {}
+    answer_ids = np.fromiter((ids.setdefault(a, len(ids)) for a in answers), dtype=np.int64, count=len(answers))
+    order = np.lexsort((np.arange(len(labels)), answer_ids, labels))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (labels[order][1:] != labels[order][:-1]) | (answer_ids[order][1:] != answer_ids[order][:-1])
+    keep = np.zeros(len(labels), dtype=bool)
+    keep[order[first]] = True
+    return keep
+
+
+def duplicate_clusters(labels):
+    """dict root -> list index anggota (urut naik), hanya cluster dengan lebih dari satu anggota"""
+    order = np.argsort(labels, kind='stable')
+    roots, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+    multi = counts > 1
+    return {int(root): order[start:start + count].tolist()
+            for root, start, count in zip(roots[multi], starts[multi], counts[multi])}
+
+
+def cluster_report(labels, keep, questions, answers, examples=10):
+    multi = list(duplicate_clusters(labels).values())
+    sizes = Counter(len(m) for m in multi)
+    conflicts = [m for m in multi if len({answers[i] for i in m}) > 1]
+    largest = sorted(multi, key=len, reverse=True)[:examples]
+
+    return {
+        'total_records': len(questions),
+        'kept': int(keep.sum()),
+        'removed': int(len(questions) - keep.sum()),
+        'clusters': int(np.count_nonzero(labels == np.arange(len(labels)))),
+        'duplicate_clusters': len(multi),
+        'records_in_duplicate_clusters': sum(len(m) for m in multi),
+        'largest_cluster': max((len(m) for m in multi), default=1),
+        'cluster_size_histogram': {str(k): v for k, v in sorted(sizes.items())},
+        'clusters_with_multiple_answers': len(conflicts),
+        'examples': [
+            {'size': len(m), 'answers': len({answers[i] for i in m}),
+             'questions': [questions[i] for i in m[:5]]}
+            for m in largest
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic dedup pertanyaan (exact blok / LSH)")
+    parser.add_argument('--input', default='dataset_combined_all_variations.json')
+    parser.add_argument('--output', default=None, help='Default: <stem input>_semdedup.json')
+    parser.add_argument('--report', default=None, help='Default: <stem input>_semdedup_report.json')
+    parser.add_argument('--model', default='distiluse-base-multilingual-cased-v2')
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--threshold', type=float, default=0.95)
+    parser.add_argument('--method', choices=['auto', 'exact', 'lsh'], default='auto')
+    parser.add_argument('--question-field', default='Q')
+    parser.add_argument('--answer-field', default='A')
+    args = parser.parse_args()
+
+    # Output selalu JSON array; nama default dari stem input (.json / .jsonl / .parquet)
+    source = Path(args.input)
+    output_file = args.output or str(source.with_name(f"{source.stem}_semdedup.json"))
+    report_file = args.report or str(source.with_name(f"{source.stem}_semdedup_report.json"))
+    for path in (output_file, report_file):
+        if Path(path).resolve() == source.resolve():
+            parser.error(f"output sama dengan input ({args.input}); input akan tertimpa sebelum dibaca ulang")
+
+    print("="*70)
+    print("🔍 SEMANTIC DEDUP")
+    print("="*70)
+
+    questions, answers = [], []
+    for item in iter_objects(args.input):
+        questions.append(item.get(args.question_field, ''))
+        answers.append(item.get(args.answer_field, '').strip())
+    print(f"📂 {args.input}: {len(questions)} record")
+
+    start = time.time()
+    store = EmbeddingStore(args.model, root=args.store_dir)
+    model = None
+
+    def encode(texts):
+        nonlocal model
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(args.model)
+        return model.encode(texts, batch_size=64, show_progress_bar=False)
+
+    rows = store.ensure(questions, encode)
+    print(f"🧮 Embedding: {store.stats['hits']} dari store, {store.stats['encoded']} di-encode "
+          f"({time.time() - start:.1f}s)")
+
+    start = time.time()
+    vectors = store.vectors[rows] if len(rows) else np.zeros((0, store.dim or 0), dtype=np.float16)
+    labels, edges, method = find_clusters(vectors, args.threshold, args.method)
+    keep = select_representatives(labels, answers)
+    print(f"🔗 Pasangan >= {args.threshold}: {edges} (metode {method}, {time.time() - start:.1f}s)")
+
+    with open(output_file, 'w', encoding='utf-8') as f, JsonArrayWriter(f) as writer:
+        for i, item in enumerate(iter_objects(args.input)):
+            if keep[i]:
+                writer.write(item)
+
+    report = cluster_report(labels, keep, questions, answers)
+    report.update({'input': args.input, 'model': args.model, 'threshold': args.threshold,
+                   'method': method, 'pairs': edges})
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("-"*70)
+    print(f"✅ Disimpan: {report['kept']} | Dibuang: {report['removed']}")
+    print(f"📊 Cluster duplikat: {report['duplicate_clusters']} "
+          f"(terbesar {report['largest_cluster']}, beda jawaban {report['clusters_with_multiple_answers']})")
+    print(f"📁 Output: {output_file}")
+    print(f"📁 Laporan: {report_file}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validasi semantik variasi pertanyaan (dipakai A100_PMB_Augmentation_QLoRA.ipynb)
+
+Versi lama meng-encode setiap variasi sendiri-sendiri (batch size 1) lalu
+memanggil cosine_similarity sklearn untuk satu pasangan 1x1. Di sini:
+- Semua pertanyaan asli + variasi dalam satu chunk di-encode dengan satu
+  panggilan model.encode (teks unik saja, embedding sudah dinormalisasi)
+- Similarity semua pasangan dihitung sekaligus sebagai perkalian matriks
+  embedding ternormalisasi (= cosine similarity)
+- Keputusan terima/tolak tetap: similarity >= meaning_drift_threshold
+- Opsional EmbeddingStore: embedding pertanyaan disimpan di disk, jadi setiap
+  teks unik hanya di-encode sekali untuk semua run (dan dipakai ulang dedup)
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from embedding_store import normalize
+
+
+class SemanticValidator:
+    '''Semantic-level validation untuk menjaga makna'''
+
+    def __init__(self, config, model=None, store=None):
+        self.config = config
+        self.store = store
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+
+            print(f'\n📥 Loading semantic model: {config.semantic_model}...')
+            model = SentenceTransformer(config.semantic_model)
+        self.model = model
+        self.batch_size = getattr(config, 'semantic_batch_size', 64)
+        self.stats = defaultdict(int)
+
+    def get_embeddings(self, texts):
+        '''Get semantic embeddings'''
+        return self.model.encode(texts, show_progress_bar=False)
+
+    def get_normalized_embeddings(self, texts):
+        '''Embedding ternormalisasi (float32) untuk daftar teks, satu panggilan encode untuk teks unik'''
+        if self.store is not None:
+            return self.store.embed(texts, self._encode)
+
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        emb = normalize(self._encode(unique))
+        position = {text: i for i, text in enumerate(unique)}
+        return emb[[position[t] for t in texts]]
+
+    def _encode(self, texts):
+        return self.model.encode(texts, batch_size=self.batch_size, show_progress_bar=False)
+
+    def _record(self, is_valid):
+        if is_valid:
+            self.stats['valid'] += 1
+        else:
+            self.stats['rejected'] += 1
+
+    def check_meaning_preservation(self, original_q, variation_q, original_embedding):
+        '''Check jika variation mempertahankan makna core (satu pasangan)'''
+        variation_embedding = np.asarray(self.get_embeddings([variation_q])[0], dtype=np.float32)
+        original_embedding = np.asarray(original_embedding, dtype=np.float32)
+        denom = np.linalg.norm(original_embedding) * np.linalg.norm(variation_embedding)
+        similarity = float(original_embedding @ variation_embedding / denom) if denom else 0.0
+        is_valid = similarity >= self.config.meaning_drift_threshold
+
+        self._record(is_valid)
+        return is_valid, similarity
+
+    def similarities(self, originals, variations):
+        '''Cosine similarity per pasangan (originals[i], variations[i]) dalam satu encode + matmul'''
+        if len(originals) != len(variations):
+            raise ValueError("Jumlah pertanyaan asli dan variasi harus sama")
+        if not originals:
+            return np.zeros(0, dtype=np.float32)
+
+        unique_originals = list(dict.fromkeys(originals))
+        emb = self.get_normalized_embeddings(unique_originals + list(variations))
+        orig_emb, var_emb = emb[:len(unique_originals)], emb[len(unique_originals):]
+
+        # [n_original_unik x n_variasi] lalu ambil kolom pasangan masing-masing
+        sim_matrix = orig_emb @ var_emb.T
+        row = {text: i for i, text in enumerate(unique_originals)}
+        return sim_matrix[[row[o] for o in originals], np.arange(len(variations))]
+
+    def check_pairs(self, originals, variations):
+        '''Versi batch check_meaning_preservation: list (is_valid, similarity) per pasangan'''
+        results = []
+        for similarity in self.similarities(originals, variations):
+            is_valid = bool(similarity >= self.config.meaning_drift_threshold)
+            self._record(is_valid)
+            results.append((is_valid, float(similarity)))
+        return results
+
+    def validate_batch(self, original_q, variations):
+        '''Batch semantic validation'''
+        results = {'valid': [], 'scores': [], 'rejected': []}
+
+        checks = self.check_pairs([original_q] * len(variations), variations)
+        for var, (is_valid, score) in zip(variations, checks):
+            if is_valid:
+                results['valid'].append(var)
+                results['scores'].append(score)
+            else:
+                results['rejected'].append((var, score))
+
+        return results
+
+    def report(self):
+        total = self.stats['valid'] + self.stats['rejected']
+        if total == 0:
+            return '0/0 (0%)'
+        pct = self.stats['valid'] / total * 100
+        return f"{self.stats['valid']}/{total} ({pct:.1f}%)"
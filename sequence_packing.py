@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sequence packing offline untuk dataset SFT (data/train.jsonl, data/eval.jsonl)
+
+Contoh PMB rata-rata jauh di bawah max_length (1024), jadi tanpa packing
+sebagian besar token di setiap step adalah padding. Di sini:
+- Setiap record messages di-render dengan chat template tokenizer dan
+  di-tokenize sekali (lewat cache token_cache.py); default loss atas seluruh
+  contoh (sama dengan TokenizedDataset & qlora config), --completion-only-loss
+  untuk label hanya giliran assistant terakhir (token prompt = -100)
+- Contoh dibin-pack ke sequence sepanjang max_length (best-fit decreasing)
+- position_ids di-reset ke 0 di awal setiap contoh: tanpa attention_mask,
+  transformers membentuk mask causal per contoh dari position_ids, jadi
+  attention tidak menyeberang batas contoh (eager, sdpa maupun flash)
+- Token pertama setiap contoh selalu berlabel -100 (tidak memprediksi
+  token dari contoh sebelumnya)
+- Hasil disimpan sebagai array .npy [n_sequence, max_length] (dibaca via
+  mmap) + meta.json berisi laporan padding sebelum & sesudah packing
+"""
+
+import argparse
+import bisect
+import json
+from pathlib import Path
+
+import numpy as np
+
+from token_cache import CACHE_DIR, IGNORE_INDEX, TokenizedDataset
+
+ARRAYS = ("input_ids", "labels", "position_ids")
+
+
+def pack_lengths(lengths, max_length):
+    """
+    Best-fit decreasing: list bin, setiap bin = list index contoh (total <= max_length).
+
+    Contoh diproses dari yang terpanjang; setiap contoh masuk ke bin dengan sisa
+    ruang terkecil yang masih cukup (dicari dengan bisect), atau bin baru.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: (-lengths[i], i))
+    bins = []
+    # Sisa ruang per bin, terurut: (sisa, id bin)
+    free = []
+    for i in order:
+        length = lengths[i]
+        if length > max_length:
+            raise ValueError(f"Contoh {i} ({length} token) lebih panjang dari max_length {max_length}")
+        k = bisect.bisect_left(free, (length, -1))
+        if k < len(free):
+            space, b = free.pop(k)
+        else:
+            space, b = max_length, len(bins)
+            bins.append([])
+        bins[b].append(i)
+        if space - length > 0:
+            bisect.insort(free, (space - length, b))
+
+    # Urutan contoh di dalam bin mengikuti urutan file
+    return [sorted(b) for b in bins]
+
+
+def build_packed_arrays(examples, bins, max_length, pad_token_id):
+    """Return dict array int32 [n_bin, max_length]: input_ids, labels, position_ids"""
+    n = len(bins)
+    input_ids = np.full((n, max_length), pad_token_id, dtype=np.int32)
+    labels = np.full((n, max_length), IGNORE_INDEX, dtype=np.int32)
+    position_ids = np.zeros((n, max_length), dtype=np.int32)
+
+    for row, members in enumerate(bins):
+        pos = 0
+        for i in members:
+            ids, lab = examples[i]
+            end = pos + len(ids)
+            input_ids[row, pos:end] = ids
+            labels[row, pos:end] = lab
+            labels[row, pos] = IGNORE_INDEX
+            position_ids[row, pos:end] = np.arange(len(ids))
+            pos = end
+        # Sisa padding menjadi satu segmen tersendiri (label -100)
+        position_ids[row, pos:] = np.arange(max_length - pos)
+
+    return {'input_ids': input_ids, 'labels': labels, 'position_ids': position_ids}
+
+
+def padding_report(lengths, bins, max_length, batch_size):
+    """Rasio padding: tanpa packing (pad ke terpanjang per batch / ke max_length) vs packing"""
+    real = int(sum(lengths))
+    dynamic_slots = sum(max(lengths[i:i + batch_size]) * len(lengths[i:i + batch_size])
+                        for i in range(0, len(lengths), batch_size))
+    fixed_slots = len(lengths) * max_length
+    packed_slots = len(bins) * max_length
+
+    def entry(slots, sequences):
+        return {'sequences': sequences, 'slots': int(slots),
+                'padding_ratio': 1 - real / slots if slots else 0.0}
+
+    return {
+        'examples': len(lengths),
+        'real_tokens': real,
+        'max_example_length': int(max(lengths, default=0)),
+        'mean_example_length': real / len(lengths) if lengths else 0.0,
+        'unpacked_dynamic': entry(dynamic_slots, len(lengths)),
+        'unpacked_max_length': entry(fixed_slots, len(lengths)),
+        'packed': entry(packed_slots, len(bins)),
+    }
+
+
+def save_packed(output_dir, arrays, meta):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name in ARRAYS:
+        np.save(output_dir / f"{name}.npy", arrays[name])
+    with open(output_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def pack_file(tokenizer, input_file, output_dir, max_length=1024, batch_size=2, tokenizer_name=None,
+              cache_dir=CACHE_DIR, completion_only_loss=False):
+    """Tokenize (via cache) + pack satu file JSONL messages ke output_dir, return laporan padding"""
+    dataset = TokenizedDataset.from_jsonl(tokenizer, input_file, cache_dir, max_length, tokenizer_name,
+                                          completion_only_loss)
+    examples = [dataset.example(i) for i in range(len(dataset))]
+    lengths = [len(ids) for ids, _ in examples]
+    bins = pack_lengths(lengths, max_length)
+
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    arrays = build_packed_arrays(examples, bins, max_length, pad_token_id)
+    report = padding_report(lengths, bins, max_length, batch_size)
+    save_packed(output_dir, arrays, {
+        'input_file': str(input_file),
+        'tokenizer': tokenizer_name or getattr(tokenizer, 'name_or_path', None),
+        'max_length': max_length,
+        'pad_token_id': pad_token_id,
+        'completion_only_loss': completion_only_loss,
+        'report': report,
+    })
+    return report
+
+
+class PackedDataset:
+    """Dataset hasil pack_file (array dibaca via mmap, tanpa menyalin ke RAM)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode='r') for name in ARRAYS}
+
+    def __len__(self):
+        return self.arrays['input_ids'].shape[0]
+
+    def __getitem__(self, idx):
+        import torch
+
+        return {name: torch.from_numpy(np.asarray(self.arrays[name][idx], dtype=np.int64)) for name in ARRAYS}
+
+
+def packed_collator(features):
+    """
+    Stack batch packed. Sengaja tanpa attention_mask: batas contoh dibaca
+    dari position_ids (lihat docstring modul). Model harus dipanggil dengan
+    use_cache=False (setting training).
+    """
+    import torch
+
+    return {name: torch.stack([f[name] for f in features]) for name in ARRAYS}
+
+
+def print_report(report, label=""):
+    print(f"\n📊 Padding {label}({report['examples']} contoh, {report['real_tokens']} token, "
+          f"rata-rata {report['mean_example_length']:.1f}, maks {report['max_example_length']})")
+    rows = [
+        ('Tanpa packing (pad per batch)', report['unpacked_dynamic']),
+        ('Tanpa packing (pad ke max_length)', report['unpacked_max_length']),
+        ('Packing', report['packed']),
+    ]
+    for name, entry in rows:
+        print(f"  {name:<36} {entry['sequences']:>7} seq {entry['slots']:>11} slot  "
+              f"padding {entry['padding_ratio'] * 100:5.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequence packing offline untuk dataset SFT")
+    parser.add_argument('--tokenizer', default='google/gemma-3-1b-it', help='Nama / path tokenizer')
+    parser.add_argument('--input', nargs='+', default=['data/train.jsonl', 'data/eval.jsonl'])
+    parser.add_argument('--output-dir', default='data/packed', help='Output: <output-dir>/<nama file>/')
+    parser.add_argument('--max-length', type=int, default=1024)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Direktori cache token (token_cache.py)')
+    parser.add_argument('--batch-size', type=int, default=2,
+                        help='per_device_train_batch_size untuk laporan padding tanpa packing')
+    parser.add_argument('--completion-only-loss', action='store_true',
+                        help='Label hanya untuk jawaban assistant terakhir (default: seluruh contoh)')
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+
+    print("="*70)
+    print(f"📦 SEQUENCE PACKING (max_length {args.max_length})")
+    print("="*70)
+    for input_file in args.input:
+        output_dir = Path(args.output_dir) / Path(input_file).stem
+        report = pack_file(tokenizer, input_file, output_dir, args.max_length, args.batch_size, args.tokenizer,
+                           args.cache_dir, args.completion_only_loss)
+        print_report(report, f"{input_file} ")
+        print(f"📁 Output: {output_dir}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
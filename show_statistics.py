@@ -4,9 +4,10 @@
 Script untuk menampilkan statistik dataset variasi
 """
 
-import json
 from pathlib import Path
 
+from jsonstream import iter_json_array
+
 OUTPUT_FILES = [
     "dataset_biaya_variasi.json",
     "dataset-biaya2_clean_variasi.json",
@@ -22,12 +23,14 @@ OUTPUT_FILES = [
 ]
 
 def count_variations(filepath):
-    """Hitung jumlah pertanyaan dan variasi"""
+    """Hitung jumlah pertanyaan dan variasi (jumlah variasi sebenarnya di setiap record)"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        num_questions = len(data)
-        num_variations = num_questions * 5
+        # Dihitung streaming, tanpa memuat seluruh file
+        num_questions = 0
+        num_variations = 0
+        for item in iter_json_array(filepath):
+            num_questions += 1
+            num_variations += len(item.get('variations', [])) if isinstance(item, dict) else 0
         return num_questions, num_variations
     except:
         return 0, 0
@@ -65,6 +68,7 @@ def main():
     print(f"  - Jenis variasi: Formal, Casual, Typo, Singkat, Panjang")
     print(f"  - Semua variasi memiliki jawaban yang identik")
     print(f"  - Format output: JSON dengan struktur standar")
+    print(f"  - Keragaman variasi (distinct-n, self-BLEU, template): python variation_metrics.py")
     print()
 
     # Contoh penggunaan
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sampler template yang sadar tabrakan untuk variasi formal & panjang
+
+random.choice per pertanyaan membuat ribuan pertanyaan memakai pembungkus
+yang sama secara tidak merata. Dengan strategi seimbang, template dipilih
+dari posisi record di dalam kategorinya (jumlah record valid sebelumnya di
+file-file kategori itu, urutan INPUT_FILES), bukan dari state yang
+terkumpul selama run:
+
+- least_used : urutan template tetap (permutasi ber-seed per kategori &
+               jenis variasi) diputar sesuai posisi, jadi template berikutnya
+               selalu salah satu yang paling jarang dipakai
+- stratified : setiap putaran (len(templates) record) memakai permutasi
+               ber-seed yang baru
+- random     : perilaku lama: template pilihan tetap (preferred) jika ada,
+               selain itu random.choice (tanpa penyeimbangan)
+
+Untuk least_used & stratified selisih pemakaian antar template maks 1 per
+(kategori, jenis) di seluruh korpus, dan hasilnya sama untuk mode berurutan
+maupun paralel berapa pun jumlah worker dan ukuran chunk. Setiap pemilihan
+O(1) (permutasi berukuran len(templates) dibuat sekali per putaran).
+
+Laporan cakupan dihitung dari file output *_variasi.json:
+
+  python template_sampler.py dataset_biaya_variasi.json dataset-alur_variasi.json
+"""
+
+import argparse
+import json
+import random
+from collections import Counter, defaultdict
+
+from grouped_split import category_from_filename
+from jsonstream import iter_json_array
+from parallel_variations import derive_seed
+
+STRATEGIES = ('least_used', 'stratified', 'random')
+
+
+class TemplateSampler:
+    """
+    Pemilih template per kategori. begin(kategori, posisi) sebelum record dari
+    file kategori itu, lalu choose(kind, templates) sekali per jenis per record.
+    """
+
+    def __init__(self, strategy='least_used', seed=42):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Strategi template tidak dikenal: {strategy!r} (pilihan: {', '.join(STRATEGIES)})")
+        self.strategy = strategy
+        self.seed = seed
+        self.category = 'unknown'
+        self._start = {}
+        self._next = {}
+        self._orders = {}
+
+    def begin(self, category, position=None):
+        """
+        Ganti kategori aktif. position: posisi record berikutnya di dalam kategori
+        (mode paralel, awal chunk); None = lanjut dari record terakhir kategori itu.
+        """
+        self.category = category
+        if position is not None:
+            self._start[category] = position
+            for key in [key for key in self._next if key[0] == category]:
+                del self._next[key]
+
+    def choose(self, kind, templates, preferred=None):
+        """
+        Template untuk record berikutnya dari list templates.
+        preferred: index template tetap untuk strategi random (perilaku lama),
+        strategi seimbang mengabaikannya supaya cakupan tetap rata.
+        """
+        if self.strategy == 'random':
+            return templates[preferred] if preferred is not None else random.choice(templates)
+
+        key = (self.category, kind)
+        position = self._next.get(key, self._start.get(self.category, 0))
+        self._next[key] = position + 1
+
+        size = len(templates)
+        rotation = 0 if self.strategy == 'least_used' else position // size
+        cached = self._orders.get(key)
+        if cached is None or cached[0] != (rotation, size):
+            order = list(range(size))
+            random.Random(derive_seed(self.seed, self.category, kind, rotation)).shuffle(order)
+            cached = self._orders[key] = ((rotation, size), order)
+        return templates[cached[1][position % size]]
+
+
+def identify_template(text, templates):
+    """Index template (format '...{}...') yang dipakai text, atau None"""
+    for index, template in enumerate(templates):
+        prefix, _, suffix = template.partition('{}')
+        if text.startswith(prefix) and text.endswith(suffix) and len(text) >= len(prefix) + len(suffix):
+            return index
+    return None
+
+
+def coverage_report(paths, template_sets):
+    """
+    Cakupan template per kategori dari file *_variasi.json.
+
+    template_sets: {posisi variasi: (nama jenis, list template)}, mis. {0: ('formal', FORMAL_TEMPLATES)}.
+    Return {kategori: {jenis: {'per_template': [...], 'lainnya', 'min', 'max', 'selisih'}}}.
+    """
+    counts = defaultdict(lambda: defaultdict(Counter))
+    for path in paths:
+        category = category_from_filename(path)
+        for item in iter_json_array(path):
+            variations = item.get('variations', []) if isinstance(item, dict) else []
+            for position, (kind, templates) in template_sets.items():
+                if position < len(variations):
+                    index = identify_template(variations[position].get('Q', ''), templates)
+                    counts[category][kind][index] += 1
+
+    report = {}
+    for category, kinds in counts.items():
+        report[category] = {}
+        for kind, counter in kinds.items():
+            templates = dict(template_sets.values())[kind]
+            per_template = [counter[index] for index in range(len(templates))]
+            report[category][kind] = {
+                'per_template': per_template,
+                'lainnya': counter[None],
+                'min': min(per_template),
+                'max': max(per_template),
+                'selisih': max(per_template) - min(per_template),
+            }
+    return report
+
+
+def print_coverage(report):
+    print(f"{'Kategori':<12} {'Jenis':<9} {'Per template':<40} {'Lain':>5} {'Selisih':>8}")
+    for category in sorted(report):
+        for kind, row in report[category].items():
+            print(f"{category:<12} {kind:<9} {' '.join(f'{n:>4}' for n in row['per_template']):<40} "
+                  f"{row['lainnya']:>5} {row['selisih']:>8}")
+
+
+def main():
+    from generate_variations_improved import TEMPLATE_SETS
+
+    parser = argparse.ArgumentParser(description="Laporan cakupan template variasi formal & panjang")
+    parser.add_argument('input', nargs='+', help='File *_variasi.json')
+    parser.add_argument('--output', default=None, help='Simpan laporan sebagai JSON')
+    args = parser.parse_args()
+
+    report = coverage_report(args.input, TEMPLATE_SETS)
+    print_coverage(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ Laporan cakupan: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
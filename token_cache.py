@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache dataset SFT yang sudah di-tokenize (dipakai notebook training & sequence_packing.py)
+
+Notebook training me-render chat template dan men-tokenize data/train.jsonl &
+data/eval.jsonl di setiap awal sesi. Di sini hasil tokenisasi disimpan sekali:
+  input_ids.i32 : semua token semua contoh disambung, int32 (np.memmap)
+  loss_mask.u8  : 1 untuk token giliran assistant terakhir (dipakai jika completion_only_loss)
+  offsets.npy   : int64 [n + 1], contoh i = token offsets[i]:offsets[i + 1]
+  meta.json     : sumber, tokenizer, fingerprint, jumlah contoh & token
+
+Direktori cache diberi key hash dari isi file sumber, fingerprint tokenizer
+(vocab/merges, token spesial), chat template dan max_length, jadi perubahan
+salah satunya otomatis membuat cache baru. TokenizedDataset membaca array via
+memmap: worker DataLoader berbagi page cache OS, bukan salinan data.
+
+Objective loss dipilih saat membaca, bukan saat membangun cache:
+- completion_only_loss=False (default): loss atas seluruh sequence, sama
+  dengan SFTTrainer(dataset_text_field='text') yang dipakai sebelumnya
+- completion_only_loss=True: loss hanya untuk jawaban assistant terakhir
+  (token prompt = -100); ini mengubah objective training
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from jsonstream import iter_jsonl
+
+CACHE_DIR = ".cache/tokens"
+FORMAT_VERSION = 1
+IGNORE_INDEX = -100
+
+
+def tokenize_messages(tokenizer, messages, max_length=None):
+    """
+    Return (input_ids, labels) untuk satu percakapan.
+
+    Label = token giliran assistant terakhir; prompt (system/user dan header
+    giliran model) di-mask dengan IGNORE_INDEX.
+    """
+    prompt_text = tokenizer.apply_chat_template(messages[:-1], tokenize=False, add_generation_prompt=True)
+    full_text = tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=False)
+    if not full_text.startswith(prompt_text):
+        raise ValueError("Chat template: prompt bukan prefix dari percakapan lengkap")
+
+    # Template sudah berisi token spesial (bos), jadi tidak ditambah lagi
+    prompt_ids = tokenizer(prompt_text, add_special_tokens=False)['input_ids']
+    answer_ids = tokenizer(full_text[len(prompt_text):], add_special_tokens=False)['input_ids']
+
+    input_ids = prompt_ids + answer_ids
+    labels = [IGNORE_INDEX] * len(prompt_ids) + answer_ids
+    if max_length:
+        input_ids, labels = input_ids[:max_length], labels[:max_length]
+    return input_ids, labels
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer):
+    """Hash isi tokenizer (bukan nama/path-nya): vocab, merges, normalizer, token spesial"""
+    h = hashlib.sha256(type(tokenizer).__name__.encode('utf-8'))
+    backend = getattr(tokenizer, 'backend_tokenizer', None)
+    if backend is not None:
+        h.update(backend.to_str().encode('utf-8'))
+    else:
+        h.update(json.dumps(sorted(tokenizer.get_vocab().items())).encode('utf-8'))
+    h.update(json.dumps(tokenizer.special_tokens_map, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def cache_key(source_hash, tokenizer_hash, chat_template, max_length):
+    payload = json.dumps({
+        'version': FORMAT_VERSION,
+        'source': source_hash,
+        'tokenizer': tokenizer_hash,
+        'chat_template': chat_template,
+        'max_length': max_length,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_path(tokenizer, source, root=CACHE_DIR, max_length=None):
+    """Direktori cache untuk (file sumber, tokenizer, chat template, max_length)"""
+    key = cache_key(file_hash(source), tokenizer_fingerprint(tokenizer), tokenizer.chat_template, max_length)
+    return Path(root) / f"{Path(source).stem}-{key[:16]}"
+
+
+def build_token_cache(tokenizer, source, root=CACHE_DIR, max_length=None, tokenizer_name=None):
+    """
+    Tokenize file JSONL messages ke cache (jika belum ada), return direktori cache.
+
+    Ditulis streaming ke direktori sementara lalu di-rename, jadi cache yang
+    setengah jadi (proses terputus) tidak pernah terbaca.
+    """
+    path = cache_path(tokenizer, source, root, max_length)
+    if (path / "meta.json").exists():
+        return path
+
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    offsets = [0]
+    with open(tmp / "input_ids.i32", 'wb') as ids_file, open(tmp / "loss_mask.u8", 'wb') as mask_file:
+        for item in iter_jsonl(source):
+            input_ids, labels = tokenize_messages(tokenizer, item['messages'], max_length)
+            ids_file.write(np.asarray(input_ids, dtype=np.int32).tobytes())
+            mask_file.write((np.asarray(labels) != IGNORE_INDEX).astype(np.uint8).tobytes())
+            offsets.append(offsets[-1] + len(input_ids))
+    np.save(tmp / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+    with open(tmp / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump({
+            'source': str(source),
+            'tokenizer': tokenizer_name or getattr(tokenizer, 'name_or_path', None),
+            'tokenizer_fingerprint': tokenizer_fingerprint(tokenizer),
+            'max_length': max_length,
+            'examples': len(offsets) - 1,
+            'tokens': offsets[-1],
+            'version': FORMAT_VERSION,
+        }, f, ensure_ascii=False, indent=2)
+
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # Proses lain sudah menulis cache yang sama
+        shutil.rmtree(tmp)
+    return path
+
+
+class TokenizedDataset:
+    """
+    Dataset map-style di atas cache token (input_ids, labels per contoh).
+
+    Memmap dibuka malas di proses yang memakainya, jadi aman dipakai worker
+    DataLoader (fork maupun spawn) tanpa menyalin array.
+    """
+
+    def __init__(self, path, completion_only_loss=False):
+        self.path = Path(path)
+        self.completion_only_loss = completion_only_loss
+        with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.offsets = np.load(self.path / "offsets.npy")
+        self._ids = None
+        self._mask = None
+
+    @classmethod
+    def from_jsonl(cls, tokenizer, source, root=CACHE_DIR, max_length=None, tokenizer_name=None,
+                   completion_only_loss=False):
+        return cls(build_token_cache(tokenizer, source, root, max_length, tokenizer_name), completion_only_loss)
+
+    def _open(self):
+        if self._ids is None:
+            n_tokens = int(self.offsets[-1])
+            # memmap tidak bisa untuk file kosong
+            if n_tokens == 0:
+                self._ids = np.zeros(0, dtype=np.int32)
+                self._mask = np.zeros(0, dtype=np.uint8)
+            else:
+                self._ids = np.memmap(self.path / "input_ids.i32", dtype=np.int32, mode='r', shape=(n_tokens,))
+                self._mask = np.memmap(self.path / "loss_mask.u8", dtype=np.uint8, mode='r', shape=(n_tokens,))
+
+    def __getstate__(self):
+        # Memmap tidak ikut di-pickle (worker spawn membuka ulang)
+        state = self.__dict__.copy()
+        state['_ids'] = state['_mask'] = None
+        return state
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def example(self, idx):
+        """(input_ids, labels) sebagai array int64 (labels sesuai completion_only_loss)"""
+        self._open()
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        input_ids = np.asarray(self._ids[start:end], dtype=np.int64)
+        if not self.completion_only_loss:
+            return input_ids, input_ids.copy()
+        labels = np.where(self._mask[start:end] == 1, input_ids, IGNORE_INDEX)
+        return input_ids, labels
+
+    def __getitem__(self, idx):
+        import torch
+
+        input_ids, labels = self.example(idx)
+        return {'input_ids': torch.from_numpy(input_ids), 'labels': torch.from_numpy(labels)}
+
+
+class PadCollator:
+    """Padding kanan per batch ke contoh terpanjang (labels padding = -100) + attention_mask"""
+
+    def __init__(self, pad_token_id, pad_to_multiple_of=None):
+        self.pad_token_id = pad_token_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, features):
+        import torch
+
+        length = max(len(f['input_ids']) for f in features)
+        if self.pad_to_multiple_of:
+            length = -(-length // self.pad_to_multiple_of) * self.pad_to_multiple_of
+
+        batch = {
+            'input_ids': torch.full((len(features), length), self.pad_token_id, dtype=torch.long),
+            'attention_mask': torch.zeros((len(features), length), dtype=torch.long),
+            'labels': torch.full((len(features), length), IGNORE_INDEX, dtype=torch.long),
+        }
+        for row, f in enumerate(features):
+            n = len(f['input_ids'])
+            batch['input_ids'][row, :n] = f['input_ids']
+            batch['attention_mask'][row, :n] = 1
+            batch['labels'][row, :n] = f['labels']
+        return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenize dataset SFT ke cache memmap")
+    parser.add_argument('--tokenizer', default='google/gemma-3-1b-it', help='Nama / path tokenizer')
+    parser.add_argument('--input', nargs='+', default=['data/train.jsonl', 'data/eval.jsonl'])
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--max-length', type=int, default=1024)
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    for source in args.input:
+        dataset = TokenizedDataset.from_jsonl(tokenizer, source, args.cache_dir, args.max_length, args.tokenizer)
+        print(f"✅ {source}: {len(dataset)} contoh, {dataset.meta['tokens']} token → {dataset.path}")
+
+
+if __name__ == "__main__":
+    main()
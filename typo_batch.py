@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generator typo batch (NumPy) untuk data robustness: k varian typo per pertanyaan
+
+Pelengkap QuestionVariator.create_typo (generate_variasi.py) yang mengedit satu
+kata per pertanyaan dengan loop Python. Di sini satu kolom pertanyaan
+di-encode sekali menjadi array codepoint (UTF-32), disalin k kali, lalu semua
+edit diundi dan diterapkan sekaligus dengan operasi array:
+
+- adjacent : huruf diganti tetangganya di keyboard QWERTY (huruf besar tetap besar)
+- delete   : huruf dihapus
+- double   : huruf digandakan
+- swap     : dua huruf berurutan ditukar
+- merge    : spasi antar kata dihapus (dua kata menyatu)
+
+Rate = peluang per karakter yang memenuhi syarat (merge: per spasi antar
+kata). Hanya huruf ASCII di kata dengan panjang >= min_word_len yang diedit,
+huruf pertama kata tidak diubah. Varian tanpa edit diundi ulang dengan rate
+yang dinaikkan (maks max_rounds kali).
+
+Hasil deterministik untuk seed + urutan input yang sama.
+
+  python typo_batch.py --k 20 --output dataset_typo_variants.json
+  python typo_batch.py --input dataset-alur.json --k 50 --rate delete=0.03 --rate merge=0
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from jsonstream import iter_json_array
+
+DEFAULT_RATES = {
+    'adjacent': 0.02,
+    'delete': 0.015,
+    'double': 0.015,
+    'swap': 0.01,
+    'merge': 0.05,
+}
+
+# Tetangga setiap huruf di keyboard QWERTY (baris yang sama + baris atas/bawah)
+ADJACENT_KEYS = {
+    'q': 'was', 'w': 'qeasd', 'e': 'wrsdf', 'r': 'etdfg', 't': 'ryfgh',
+    'y': 'tughj', 'u': 'yihjk', 'i': 'uojkl', 'o': 'ipkl', 'p': 'ol',
+    'a': 'qwszx', 's': 'weadzxc', 'd': 'ersfxcv', 'f': 'rtdgcvb', 'g': 'tyfhvbn',
+    'h': 'yugjbnm', 'j': 'uihknm', 'k': 'iojlm', 'l': 'opk',
+    'z': 'asx', 'x': 'sdzc', 'c': 'dfxv', 'v': 'fgcb', 'b': 'ghvn', 'n': 'hjbm', 'm': 'jkn',
+}
+
+_SPACE = ord(' ')
+_LOWER_A = ord('a')
+_CASE_BIT = 0x20
+
+# Tabel lookup [26, maks tetangga] (codepoint huruf kecil) + jumlah tetangga per huruf
+_WIDTH = max(len(keys) for keys in ADJACENT_KEYS.values())
+_NEIGHBORS = np.zeros((26, _WIDTH), dtype=np.uint32)
+_NEIGHBOR_COUNT = np.zeros(26, dtype=np.int64)
+for _letter, _keys in ADJACENT_KEYS.items():
+    _NEIGHBORS[ord(_letter) - _LOWER_A, :len(_keys)] = [ord(key) for key in _keys]
+    _NEIGHBOR_COUNT[ord(_letter) - _LOWER_A] = len(_keys)
+
+
+def _encode(texts):
+    """list str -> (array codepoint uint32 gabungan, array panjang per text)"""
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype='<u4').astype(np.uint32)
+    return codes, lengths
+
+
+def _decode(codes, lengths):
+    """Kebalikan _encode: satu decode untuk seluruh batch, lalu dipotong per baris"""
+    text = codes.astype('<u4').tobytes().decode('utf-32-le')
+    ends = np.cumsum(lengths).tolist()
+    starts = [0] + ends[:-1]
+    return [text[start:end] for start, end in zip(starts, ends)]
+
+
+def _structure(codes, lengths, min_word_len):
+    """
+    Posisi yang bisa diedit, dihitung sekali per pertanyaan (bukan per varian):
+    editable = huruf ASCII, bukan huruf pertama kata, di kata dengan >= min_word_len huruf;
+    between = spasi tunggal di antara dua kata.
+    """
+    size = len(codes)
+    row_start = np.zeros(size + 1, dtype=bool)
+    row_start[np.cumsum(lengths) - lengths] = True
+    row_start[size] = True
+
+    lower = codes | _CASE_BIT
+    letter = (lower >= _LOWER_A) & (lower <= ord('z'))
+    space = codes == _SPACE
+    token = ~space
+
+    # Kata = run karakter non-spasi di dalam satu baris, panjang kata = jumlah hurufnya
+    after_space = np.ones(size, dtype=bool)
+    after_space[1:] = space[:-1]
+    word_start = token & (row_start[:-1] | after_space)
+    word_id = np.cumsum(word_start)[token] - 1
+    word_len = np.zeros(size, dtype=np.int64)
+    word_len[token] = np.bincount(word_id, weights=letter[token]).astype(np.int64)[word_id]
+    editable = letter & ~word_start & (word_len >= min_word_len)
+
+    between = space & ~row_start[:-1] & ~row_start[1:]
+    between[1:] &= token[:-1]
+    between[:-1] &= token[1:]
+    return editable, between
+
+
+def _gather(starts, lengths, rows):
+    """Index posisi karakter untuk menyalin baris `rows` (boleh berulang) dari array gabungan"""
+    row_lengths = lengths[rows]
+    total = int(row_lengths.sum())
+    offsets = np.cumsum(row_lengths) - row_lengths
+    return np.arange(total) - np.repeat(offsets - starts[rows], row_lengths)
+
+
+def _bernoulli(rng, n, rate):
+    """Index terurut dari n percobaan Bernoulli(rate) yang berhasil, lewat jarak geometrik (~n * rate undian)"""
+    if n == 0 or rate <= 0:
+        return np.empty(0, dtype=np.int64)
+    if rate >= 1:
+        return np.arange(n)
+    hits = []
+    last = -1
+    while last < n:
+        expected = int(n * rate + 4 * np.sqrt(n * rate)) + 16
+        positions = last + np.cumsum(rng.geometric(rate, expected))
+        hits.append(positions)
+        last = int(positions[-1])
+    positions = np.concatenate(hits)
+    return positions[positions < n]
+
+
+def _sample(rng, candidates, rate, used):
+    """Posisi dari candidates yang kena operasi (rate per posisi), tanpa posisi yang sudah diedit"""
+    picked = candidates[_bernoulli(rng, len(candidates), rate)]
+    return picked[~used[picked]]
+
+
+def _apply_edits(codes, editable, between, lengths, rates, rng):
+    """
+    Satu putaran edit untuk semua baris sekaligus (setiap posisi diedit maks sekali).
+    Return (codes baru, panjang baru per baris, jumlah edit per baris).
+    """
+    size = len(codes)
+    ends = np.cumsum(lengths)
+    candidates = np.flatnonzero(editable)
+    used = np.zeros(size + 1, dtype=bool)
+    codes = codes.copy()
+
+    # swap: huruf i+1 juga harus bisa diedit (berarti satu kata) dan berbeda; pasangan bertumpuk dibuang
+    swap = _sample(rng, candidates, rates['swap'], used)
+    swap = swap[editable[np.minimum(swap + 1, size - 1)] & (swap + 1 < size)]
+    swap = swap[~np.isin(swap - 1, swap) & (codes[swap] != codes[np.minimum(swap + 1, size - 1)])]
+    codes[swap], codes[swap + 1] = codes[swap + 1], codes[swap].copy()
+    used[swap] = used[swap + 1] = True
+
+    # adjacent: tetangga keyboard dipilih acak, huruf besar tetap besar
+    adjacent = _sample(rng, candidates, rates['adjacent'], used)
+    letters = (codes[adjacent] | _CASE_BIT) - _LOWER_A
+    pick = rng.integers(0, _NEIGHBOR_COUNT[letters])
+    replacement = _NEIGHBORS[letters, pick]
+    upper = codes[adjacent] < _LOWER_A
+    codes[adjacent] = np.where(upper, replacement & ~np.uint32(_CASE_BIT), replacement)
+    used[adjacent] = True
+
+    # delete / double / merge lewat jumlah salinan per karakter (0, 1 atau 2)
+    delete = _sample(rng, candidates, rates['delete'], used)
+    used[delete] = True
+    double = _sample(rng, candidates, rates['double'], used)
+    used[double] = True
+    merge = _sample(rng, np.flatnonzero(between), rates['merge'], used)
+    counts = np.ones(size, dtype=np.intp)
+    counts[delete] = 0
+    counts[merge] = 0
+    counts[double] = 2
+
+    # Panjang baru per baris = panjang lama - hapus - merge + gandakan
+    row_of = lambda positions: np.bincount(np.searchsorted(ends, positions, side='right'), minlength=len(lengths))
+    removed = row_of(np.concatenate([delete, merge]))
+    doubled = row_of(double)
+    edits = row_of(np.concatenate([swap, adjacent])) + removed + doubled
+    return np.repeat(codes, counts), lengths - removed + doubled, edits
+
+
+def _check_rates(rates):
+    merged = dict(DEFAULT_RATES)
+    for name, rate in (rates or {}).items():
+        if name not in DEFAULT_RATES:
+            raise ValueError(f"Operasi typo tidak dikenal: {name!r} (pilihan: {', '.join(DEFAULT_RATES)})")
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Rate {name} harus di antara 0 dan 1, dapat {rate}")
+        merged[name] = rate
+    return merged
+
+
+def generate_typos(questions, k=10, rates=None, seed=42, min_word_len=4, max_rounds=8, batch_size=5000):
+    """
+    k varian typo untuk setiap pertanyaan -> list (per pertanyaan) berisi list k string.
+
+    rates: override DEFAULT_RATES per operasi, mis. {'merge': 0, 'delete': 0.03}.
+    Pertanyaan diproses per batch_size pertanyaan (memori ~ batch_size * k * panjang * 16 byte).
+    Varian tanpa posisi yang bisa diedit (mis. semua kata pendek) tetap sama dengan aslinya.
+    """
+    rates = _check_rates(rates)
+    if k < 1:
+        raise ValueError("k minimal 1")
+    rng = np.random.default_rng(seed)
+    questions = list(questions)
+    results = []
+
+    for offset in range(0, len(questions), batch_size):
+        batch = questions[offset:offset + batch_size]
+        codes, lengths = _encode(batch)
+        starts = np.cumsum(lengths) - lengths
+        editable, between = _structure(codes, lengths, min_word_len)
+        editable_before = np.concatenate([[0], np.cumsum(editable | between)])
+        has_candidates = (editable_before[starts + lengths] - editable_before[starts]) > 0
+
+        # Baris = pertanyaan i varian j (urutan per pertanyaan); struktur kata cukup disalin
+        rows = np.repeat(np.arange(len(batch)), k)
+        index = _gather(starts, lengths, rows)
+        new_codes, new_lengths, edits = _apply_edits(codes[index], editable[index], between[index],
+                                                     lengths[rows], rates, rng)
+        variants = _decode(new_codes, new_lengths)
+
+        # Undi ulang varian tanpa edit dengan rate dinaikkan bertahap (x2, x3, ...), supaya
+        # pertanyaan pendek juga kebagian typo tanpa langsung diedit berlebihan
+        for round_ in range(1, max_rounds + 1):
+            retry = np.flatnonzero((edits == 0) & has_candidates[rows])
+            if not len(retry):
+                break
+            index = _gather(starts, lengths, rows[retry])
+            boosted = {name: min(rate * (round_ + 1), 1.0) for name, rate in rates.items()}
+            new_codes, new_lengths, edits[retry] = _apply_edits(codes[index], editable[index], between[index],
+                                                                lengths[rows[retry]], boosted, rng)
+            for i, variant in zip(retry.tolist(), _decode(new_codes, new_lengths)):
+                variants[i] = variant
+
+        results.extend(variants[i:i + k] for i in range(0, len(variants), k))
+    return results
+
+
+def load_pairs(files):
+    """(question, answer) dari file array JSON (format Q/A atau instruction/response), streaming"""
+    pairs = []
+    for filename in files:
+        for item in iter_json_array(filename):
+            if not isinstance(item, dict):
+                continue
+            question = item.get('Q', item.get('instruction'))
+            answer = item.get('A', item.get('response'))
+            if question and answer:
+                pairs.append((question, answer))
+    return pairs
+
+
+def _parse_rate(value):
+    name, _, rate = value.partition('=')
+    try:
+        return name, float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format rate: operasi=angka (mis. delete=0.03), dapat {value!r}")
+
+
+def main():
+    from generate_variasi import FILES_TO_PROCESS
+
+    parser = argparse.ArgumentParser(description="Generator k varian typo per pertanyaan (batch NumPy)")
+    parser.add_argument('--input', nargs='+', default=FILES_TO_PROCESS,
+                        help='File array JSON Q/A (default: 11 file generate_variasi.py)')
+    parser.add_argument('--output', default='dataset_typo_variants.json')
+    parser.add_argument('--k', type=int, default=10, help='Jumlah varian typo per pertanyaan')
+    parser.add_argument('--rate', type=_parse_rate, action='append', default=[],
+                        help=f"Override rate per operasi, boleh berulang ({', '.join(DEFAULT_RATES)})")
+    parser.add_argument('--min-word-len', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rates = _check_rates(dict(args.rate))
+    pairs = load_pairs(args.input)
+    print(f"📂 {len(pairs)} pertanyaan dari {len(args.input)} file")
+    print("⚙️  Rate: " + ', '.join(f"{name}={rate}" for name, rate in rates.items()))
+
+    variants = generate_typos([question for question, _ in pairs], k=args.k, rates=rates,
+                              seed=args.seed, min_word_len=args.min_word_len)
+
+    records = []
+    unchanged = 0
+    for (question, answer), typos in zip(pairs, variants):
+        for typo in typos:
+            unchanged += typo == question
+            records.append({"Q": typo, "A": answer})
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ {len(records)} varian typo ({args.k} per pertanyaan) disimpan ke {args.output}")
+    if unchanged:
+        print(f"⚠️  {unchanged} varian sama dengan aslinya (tidak ada kata yang bisa diedit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,15 @@
 """
 Script untuk menggabungkan semua file variasi menjadi satu file flat
 Format output: [{"Q": "...", "A": "..."}, ...]
+Mode --stream: output JSONL, file variasi dibaca incremental (memori konstan)
 """
 
+import argparse
 import json
 import os
 
+from jsonstream import iter_json_array, write_jsonl_line
+
 # File yang akan digabungkan
 # Untuk biaya: hanya yang ada "clean" nya
 FILES_TO_UNIFY = [
@@ -63,5 +67,47 @@ def main():
     print(f"✓ OUTPUT: {output_path}")
     print("="*70)
 
+def main_stream():
+    base_dir = "/root/dataset"
+    output_path = os.path.join(base_dir, "dataset_all_variasi_unified.jsonl")
+    total = 0
+
+    print("="*70)
+    print("UNIFIKASI SEMUA FILE VARIASI (STREAMING JSONL)")
+    print("="*70)
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for filename in FILES_TO_UNIFY:
+            filepath = os.path.join(base_dir, filename)
+
+            if not os.path.exists(filepath):
+                print(f"⚠️  File tidak ditemukan: {filename}")
+                continue
+
+            count = 0
+            for item in iter_json_array(filepath):
+                for variation in item['variations']:
+                    write_jsonl_line(out, {
+                        "Q": variation['Q'],
+                        "A": variation['A']
+                    })
+                    count += 1
+
+            total += count
+            print(f"✓ {filename:45s} : {count:5d} pairs")
+
+    print("="*70)
+    print(f"✓ TOTAL Q&A PAIRS: {total}")
+    print(f"✓ OUTPUT: {output_path}")
+    print("="*70)
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Gabungkan semua file variasi")
+    parser.add_argument('--stream', action='store_true',
+                        help='Output JSONL secara streaming (memori konstan)')
+    args = parser.parse_args()
+
+    if args.stream:
+        main_stream()
+    else:
+        main()
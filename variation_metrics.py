@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrik keragaman variasi pertanyaan (file *_variasi.json) dalam satu pass streaming
+
+show_statistics.py hanya menghitung jumlah variasi; notebook augmentasi
+membandingkan pasangan dengan SequenceMatcher (O(n²)). Di sini semua file
+dibaca sekali secara streaming: token tiap variasi disimpan sebagai id
+integer, lalu semua metrik dihitung dengan hash n-gram (NumPy) sekaligus:
+
+- distinct-n   : jumlah n-gram unik / total n-gram (n = 1..4), per jenis & kategori
+- self-BLEU    : aproksimasi dengan hitungan n-gram ter-hash. Sebuah n-gram dianggap
+                 cocok jika muncul di kalimat lain dalam kelompok yang sama (corpus
+                 per jenis variasi, atau 5 variasi dari pertanyaan yang sama);
+                 clipping ke jumlah maksimum di referensi diabaikan. Presisi n > 1
+                 di-smoothing add-one. Makin tinggi = makin mirip
+- template     : prefix template variasi formal & long (teks sebelum pertanyaan
+                 asli di dalam variasi; tiga kata pertama jika pertanyaan asli tidak
+                 ditemukan), jumlah variasi yang berbagi prefix dan peluang dua
+                 variasi acak memakai prefix yang sama
+- per kategori : jumlah record, variasi, variasi yang sama persis dengan aslinya
+
+Memori linear terhadap jumlah token corpus; di luar pembacaan file, biaya
+terbesar adalah sort NumPy atas array hash (tanpa perbandingan berpasangan).
+Report ditulis sebagai JSON:
+
+  python variation_metrics.py
+  python variation_metrics.py dataset_biaya_variasi.json --output metrics_biaya.json
+"""
+
+import argparse
+import json
+import re
+import time
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from columnar import VARIATION_TYPES
+from grouped_split import category_from_filename, normalize_text
+from jsonstream import iter_json_array
+
+TEMPLATE_TYPES = ('formal', 'long')
+MAX_N = 4
+
+_TOKEN = re.compile(r'\w+|[^\w\s]')
+# Konstanta hash polinomial n-gram (mod 2^64) dan pencampur id kelompok
+_BASE = np.uint64(1000003)
+_GROUP_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def variation_type(index):
+    return VARIATION_TYPES[index] if index < len(VARIATION_TYPES) else f'variasi_{index + 1}'
+
+
+def template_prefix(variation, original):
+    """Teks sebelum pertanyaan asli di dalam variasi (lowercase), atau tiga kata pertama"""
+    text = normalize_text(variation)
+    base = normalize_text(original).rstrip('?').strip()
+    pos = text.find(base) if base else -1
+    if pos >= 0:
+        return text[:pos].strip()
+    return ' '.join(text.split()[:3])
+
+
+class DiversityStats:
+    """
+    Akumulator satu pass. add_record() per record {original_Q, variations}, lalu report().
+    Yang disimpan per variasi hanya id token + id jenis/kategori/record (array integer).
+    """
+
+    def __init__(self, max_n=MAX_N):
+        self.max_n = max_n
+        self.vocab = {}
+        self.tokens = array('q')
+        self.lengths = array('q')
+        self.types = array('q')
+        self.categories = array('q')
+        self.records = array('q')
+        self.type_names = {}
+        self.category_names = {}
+        self.counts = defaultdict(Counter)
+        self.prefixes = defaultdict(Counter)
+
+    def _id(self, names, name):
+        return names.setdefault(name, len(names))
+
+    def add_record(self, item, category):
+        if not isinstance(item, dict):
+            return
+        original = item.get('original_Q', '')
+        counts = self.counts[category]
+        record_id = counts['records']
+        counts['records'] += 1
+        category_id = self._id(self.category_names, category)
+        record_key = (category_id << 32) | record_id
+
+        seen = set()
+        vocab = self.vocab
+        for index, variation in enumerate(item.get('variations', [])):
+            question = variation.get('Q', '') if isinstance(variation, dict) else ''
+            kind = variation_type(index)
+            normalized = normalize_text(question)
+            counts['variations'] += 1
+            counts[f'jenis:{kind}'] += 1
+            counts['sama_dengan_asli'] += normalized == normalize_text(original)
+            counts['duplikat_dalam_record'] += normalized in seen
+            seen.add(normalized)
+            if kind in TEMPLATE_TYPES:
+                self.prefixes[(category, kind)][template_prefix(question, original)] += 1
+
+            ids = [vocab.setdefault(token, len(vocab)) for token in _TOKEN.findall(question.lower())]
+            self.tokens.extend(ids)
+            self.lengths.append(len(ids))
+            self.types.append(self._id(self.type_names, kind))
+            self.categories.append(category_id)
+            self.records.append(record_key)
+
+    def add_file(self, path):
+        category = category_from_filename(path)
+        for item in iter_json_array(path):
+            self.add_record(item, category)
+
+    # ------------------------------------------------------------------
+    # Perhitungan akhir (vektor NumPy di atas seluruh corpus)
+    # ------------------------------------------------------------------
+    def _ngrams(self):
+        """{n: (hash n-gram, id kalimat)} untuk semua n-gram di corpus"""
+        tokens = np.frombuffer(self.tokens, dtype=np.int64).astype(np.uint64) + np.uint64(1)
+        lengths = np.frombuffer(self.lengths, dtype=np.int64)
+        sentence = np.repeat(np.arange(len(lengths)), lengths)
+        remaining = np.repeat(np.cumsum(lengths), lengths) - np.arange(len(tokens))
+
+        grams = {}
+        hashes = np.zeros(len(tokens), dtype=np.uint64)
+        for n in range(1, self.max_n + 1):
+            # hash n-gram di posisi i = hash (n-1)-gram di i * BASE + token[i + n - 1]
+            hashes = hashes[:len(tokens) - n + 1] * _BASE + tokens[n - 1:]
+            valid = remaining[:len(hashes)] >= n
+            grams[n] = (hashes[valid], sentence[:len(hashes)][valid])
+        return grams
+
+    @staticmethod
+    def _distinct(hashes, selected):
+        total = int(selected.sum())
+        return round(len(np.unique(hashes[selected])) / total, 4) if total else None
+
+    def _self_bleu(self, grams, groups, n_sentences):
+        """Self-BLEU per kalimat (aproksimasi hash), kalimat dibandingkan dengan kalimat lain di kelompoknya"""
+        log_precision = np.zeros(n_sentences)
+        orders = np.zeros(n_sentences)
+        for n, (hashes, sentence) in grams.items():
+            keys = hashes ^ (groups[sentence].astype(np.uint64) * _GROUP_MIX)
+            # Jumlah kalimat berbeda di kelompok yang memuat n-gram ini (urut key lalu kalimat)
+            order = np.lexsort((sentence, keys))
+            sorted_keys, sorted_sentence = keys[order], sentence[order]
+            new_pair = np.ones(len(order), dtype=bool)
+            new_pair[1:] = (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_sentence[1:] != sorted_sentence[:-1])
+            unique_keys, frequency = np.unique(sorted_keys[new_pair], return_counts=True)
+            matched = frequency[np.searchsorted(unique_keys, keys)] >= 2
+
+            total = np.bincount(sentence, minlength=n_sentences)
+            hits = np.bincount(sentence, weights=matched, minlength=n_sentences)
+            has = total > 0
+            smooth = 0 if n == 1 else 1
+            with np.errstate(divide='ignore'):
+                log_precision[has] += np.log((hits[has] + smooth) / (total[has] + smooth))
+            orders += has
+        return np.where(orders > 0, np.exp(log_precision / np.maximum(orders, 1)), np.nan)
+
+    def report(self):
+        n_sentences = len(self.lengths)
+        types = np.frombuffer(self.types, dtype=np.int64)
+        categories = np.frombuffer(self.categories, dtype=np.int64)
+        records = np.frombuffer(self.records, dtype=np.int64)
+        grams = self._ngrams()
+
+        corpus_bleu = self._self_bleu(grams, types, n_sentences) if n_sentences else np.zeros(0)
+        record_bleu = self._self_bleu(grams, records, n_sentences) if n_sentences else np.zeros(0)
+
+        def summarize(mask):
+            """distinct-n + rata-rata self-BLEU untuk subset kalimat"""
+            summary = {f'distinct_{n}': self._distinct(hashes, mask[sentence]) for n, (hashes, sentence) in
+                       grams.items()}
+            for label, scores in (('self_bleu_jenis', corpus_bleu), ('self_bleu_dalam_record', record_bleu)):
+                values = scores[mask]
+                values = values[~np.isnan(values)]
+                summary[label] = round(float(values.mean()), 4) if len(values) else None
+            return summary
+
+        everything = np.ones(n_sentences, dtype=bool)
+        totals = sum(self.counts.values(), Counter())
+        report = {
+            'total': {
+                'records': totals['records'],
+                'variasi': totals['variations'],
+                'sama_dengan_asli': totals['sama_dengan_asli'],
+                'duplikat_dalam_record': totals['duplikat_dalam_record'],
+                **summarize(everything),
+            },
+            'per_jenis': {},
+            'per_kategori': {},
+            'template': {},
+        }
+        for kind, type_id in self.type_names.items():
+            report['per_jenis'][kind] = {'variasi': int((types == type_id).sum()), **summarize(types == type_id)}
+        for category, category_id in self.category_names.items():
+            counts = self.counts[category]
+            report['per_kategori'][category] = {
+                'records': counts['records'],
+                'variasi': counts['variations'],
+                'sama_dengan_asli': counts['sama_dengan_asli'],
+                'per_jenis': {key.split(':', 1)[1]: value for key, value in counts.items() if key.startswith('jenis:')},
+                **summarize(categories == category_id),
+            }
+
+        for kind in TEMPLATE_TYPES:
+            merged = Counter()
+            per_category = {}
+            for (category, template_kind), prefixes in self.prefixes.items():
+                if template_kind == kind:
+                    merged.update(prefixes)
+                    per_category[category] = template_collisions(prefixes)
+            if merged:
+                report['template'][kind] = {**template_collisions(merged, top=10), 'per_kategori': per_category}
+        return report
+
+
+def template_collisions(prefixes, top=0):
+    """
+    prefix -> jumlah variasi. berbagi_prefix = porsi variasi yang prefix-nya dipakai variasi lain;
+    peluang_tabrakan = peluang dua variasi acak (berbeda) memakai prefix yang sama.
+    """
+    total = sum(prefixes.values())
+    shared = sum(count for count in prefixes.values() if count > 1)
+    pairs = total * (total - 1)
+    collision = sum(count * (count - 1) for count in prefixes.values()) / pairs if pairs else 0.0
+    summary = {
+        'variasi': total,
+        'prefix_unik': len(prefixes),
+        'berbagi_prefix': round(shared / total, 4) if total else 0.0,
+        'peluang_tabrakan': round(collision, 4),
+    }
+    if top:
+        summary['prefix_terbanyak'] = prefixes.most_common(top)
+    return summary
+
+
+def compute_metrics(paths, max_n=MAX_N):
+    stats = DiversityStats(max_n)
+    for path in paths:
+        stats.add_file(path)
+    return stats.report()
+
+
+def main():
+    from show_statistics import OUTPUT_FILES
+
+    parser = argparse.ArgumentParser(description="Metrik keragaman variasi (distinct-n, self-BLEU, template)")
+    parser.add_argument('input', nargs='*', default=OUTPUT_FILES, help='File *_variasi.json')
+    parser.add_argument('--output', default='variation_metrics.json')
+    parser.add_argument('--max-n', type=int, default=MAX_N)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = compute_metrics(args.input, args.max_n)
+    seconds = time.perf_counter() - start
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    total = report['total']
+    print("=" * 90)
+    print("METRIK KERAGAMAN VARIASI")
+    print("=" * 90)
+    print(f"📊 {total['records']:,} pertanyaan | {total['variasi']:,} variasi | "
+          f"{total['sama_dengan_asli']:,} sama dengan asli | {total['duplikat_dalam_record']:,} duplikat dalam record")
+    print(f"\n{'Jenis':<12} {'Variasi':>8} {'dist-1':>7} {'dist-2':>7} {f'dist-{args.max_n}':>7} "
+          f"{'sBLEU jenis':>12} {'sBLEU record':>13}")
+    rows = list(report['per_jenis'].items()) + [('TOTAL', total)]
+    for kind, row in rows:
+        print(f"{kind:<12} {row['variasi']:>8,} {row['distinct_1'] or 0:>7.3f} {row.get('distinct_2') or 0:>7.3f} "
+              f"{row.get(f'distinct_{args.max_n}') or 0:>7.3f} {row['self_bleu_jenis'] or 0:>12.3f} "
+              f"{row['self_bleu_dalam_record'] or 0:>13.3f}")
+
+    for kind, row in report['template'].items():
+        print(f"\n🧩 Template {kind}: {row['prefix_unik']} prefix untuk {row['variasi']:,} variasi | "
+              f"berbagi prefix {row['berbagi_prefix']:.1%} | peluang tabrakan {row['peluang_tabrakan']:.1%}")
+        for prefix, count in row['prefix_terbanyak'][:5]:
+            print(f"   {count:>5}  {prefix[:70]!r}")
+
+    print(f"\n✅ Report: {args.output} ({seconds:.2f} s)")
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    main()
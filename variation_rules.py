@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regex variasi singkat yang dikompilasi sekali (dipakai generate_variations_improved.py)
+
+create_short_variation lama membangun ulang regex untuk setiap kata dan awalan
+di setiap panggilan (re.sub(r'\\b' + word + r'\\b', ...)). Di sini:
+
+- WordRemover    : hapus kata utuh (\\bkata\\b, case-insensitive), satu pola
+                   gabungan jika kata-kata tidak bisa saling memengaruhi
+- PrefixStripper : hapus awalan pertanyaan berurutan (^apakah\\s+, ...) dengan
+                   satu pola ber-anchor
+
+Hasilnya identik dengan loop re.sub lama. Regex typo dikompilasi sekali per
+kata di generate_variations_improved._TYPO_REGEX. Tabel str.replace kecil
+(casual, make_short) tetap memakai loop biasa: `in` + str.replace di C lebih
+cepat daripada scan regex dengan callback Python untuk belasan aturan
+(diukur di benchmark_variation_rules.py).
+"""
+
+import re
+
+
+class WordRemover:
+    """
+    Ekuivalen dengan: for word in words: text = re.sub(r'\\b' + word + r'\\b', '', text, flags=flags)
+
+    Satu pola gabungan jika kata-kata tidak bisa saling memengaruhi (kata diawali &
+    diakhiri huruf, dan tidak ada kata yang tumpang tindih di level token).
+    """
+
+    def __init__(self, words, flags=re.IGNORECASE):
+        self.words = list(words)
+        self.flags = flags
+        self.combined = self._independent(self.words)
+        if self.combined:
+            alternatives = sorted(self.words, key=len, reverse=True)
+            self._pattern = re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', flags)
+        else:
+            self._patterns = [re.compile(r'\b' + word + r'\b', flags) for word in self.words]
+
+    @staticmethod
+    def _independent(words):
+        plain = re.compile(r'\w+(?: \w+)*')
+        if not all(plain.fullmatch(word) for word in words):
+            return False
+        tokens = [word.lower().split(' ') for word in words]
+        for i, a in enumerate(tokens):
+            for j, b in enumerate(tokens):
+                if i == j:
+                    continue
+                # b di dalam a, atau akhir a == awal b (kemunculan bisa tumpang tindih)
+                if any(a[k:k + len(b)] == b for k in range(len(a) - len(b) + 1)):
+                    return False
+                if any(a[-k:] == b[:k] for k in range(1, min(len(a), len(b)))):
+                    return False
+        return True
+
+    def apply(self, text):
+        if self.combined:
+            return self._pattern.sub('', text)
+        for pattern in self._patterns:
+            text = pattern.sub('', text)
+        return text
+
+
+class PrefixStripper:
+    """Ekuivalen dengan: for prefix in prefixes: text = re.sub(r'^' + prefix + r'\\s+', '', text, flags=flags)"""
+
+    def __init__(self, prefixes, flags=re.IGNORECASE):
+        # Setiap re.sub berikutnya melihat awal teks sisa -> grup opsional berurutan
+        self._pattern = re.compile('^' + ''.join(rf'(?:{prefix}\s+)?' for prefix in prefixes), flags)
+
+    def apply(self, text):
+        return self._pattern.sub('', text, count=1)
@@ -2,17 +2,32 @@
 Script untuk test model dengan pertanyaan dari test_pmb.json
 Membandingkan Baseline (Gemma-3-1B) vs Fine-tuned Model
 Evaluasi dengan BERT Score saja (BATCH MODE - SIMPLE & FAST)
+
+Subcommand:
+  generate --system baseline|finetuned|all : generate jawaban, satu model dimuat sekaligus
+  score                                    : hitung BERT score dari jawaban tersimpan (tanpa model LM)
+  compare                                  : generate (yang belum ada) lalu score
+
+Jawaban di-cache di OUTPUT_DIR/generation_cache.sqlite dengan key (model, prompt,
+parameter decoding) dan disimpan per chunk, jadi run ulang / run yang terputus
+hanya generate pertanyaan yang baru atau berubah. Snapshot jawaban untuk test
+set ada di OUTPUT_DIR/generations/<sistem>.jsonl (dibaca oleh score).
 """
 
+import argparse
+import gc
 import time
 import json
 import random
 import numpy as np
 from datetime import datetime
 from pathlib import Path
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import torch
-from bert_score import score as bert_score
+from batch_generation import (SYSTEM_PROMPT, build_prompt, generate_answers_batch, generate_answers_bucketed,
+                              generate_answers_continuous, padding_efficiency)
+from gemma_turns import extract_qa_from_text
+from generation_cache import GenerationCache
+from jsonstream import iter_json_array
 
 # Set seed
 random.seed(42)
@@ -29,157 +44,232 @@ FINETUNED_MODEL_PATH = "../outputs/gemma-pmb_merged_final"
 TEST_DATA_PATH = "data/test_pmb.json"
 OUTPUT_DIR = "../outputs"
 BATCH_SIZE = 8  # Batch size
+BUCKET_WIDTH = 16  # Lebar bucket panjang prompt (token)
+GENERATION_MODE = "bucketed"  # static | bucketed | continuous
+GENERATION_CHUNK = 64  # Jawaban disimpan ke cache setiap chunk (untuk resume)
+MAX_NEW_TOKENS = 256
 
-SYSTEM_PROMPT = """Anda adalah asisten virtual untuk Penerimaan Mahasiswa Baru (PMB) di Universitas Sains Al-Qur'an."""
+# Bagian dari key cache generasi: ubah salah satunya -> jawaban di-generate ulang
+DECODING_PARAMS = {"max_new_tokens": MAX_NEW_TOKENS, "do_sample": False, "max_length": 2048}
 
-# ============================================================================
-# LOAD MODELS
-# ============================================================================
-print("="*80)
-print("  LOADING BASELINE & FINE-TUNED MODELS")
-print("="*80)
-
-print(f"\n📂 Loading BASELINE model: {BASE_MODEL_NAME}")
-tokenizer_base = AutoTokenizer.from_pretrained(BASE_MODEL_NAME)
-model_base = AutoModelForCausalLM.from_pretrained(
-    BASE_MODEL_NAME,
-    torch_dtype=torch.float16,
-    device_map="auto"
-)
-model_base.eval()
-print(f"✅ Baseline model loaded!")
-
-print(f"\n📂 Loading FINE-TUNED model: {FINETUNED_MODEL_PATH}")
-tokenizer_ft = AutoTokenizer.from_pretrained(FINETUNED_MODEL_PATH)
-model_ft = AutoModelForCausalLM.from_pretrained(
-    FINETUNED_MODEL_PATH,
-    torch_dtype=torch.float16,
-    device_map="auto"
-)
-model_ft.eval()
-print(f"✅ Fine-tuned model loaded!")
+SYSTEMS = {
+    "baseline": BASE_MODEL_NAME,
+    "finetuned": FINETUNED_MODEL_PATH,
+}
 
 # ============================================================================
 # LOAD TEST DATA
 # ============================================================================
-print(f"\n📂 Loading test data: {TEST_DATA_PATH}")
+def load_test_data(path=TEST_DATA_PATH):
+    print(f"\n📂 Loading test data: {path}")
 
-def extract_qa_from_text(text):
-    """Extract question dan answer dari format Gemma chat template"""
     try:
-        # Extract user question
-        if "<start_of_turn>user\n" in text and "<end_of_turn>" in text:
-            user_start = text.find("<start_of_turn>user\n") + len("<start_of_turn>user\n")
-            user_end = text.find("<end_of_turn>", user_start)
-            question = text[user_start:user_end].strip()
-        else:
-            question = ""
-        
-        # Extract model answer (reference)
-        if "<start_of_turn>model\n" in text:
-            model_start = text.find("<start_of_turn>model\n") + len("<start_of_turn>model\n")
-            model_end = text.find("<end_of_turn>", model_start)
-            if model_end == -1:
-                reference = text[model_start:].strip()
-            else:
-                reference = text[model_start:model_end].strip()
-        else:
-            reference = ""
-        
-        return question, reference
-    
-    except Exception as e:
-        print(f"⚠️  Error extracting Q&A: {e}")
-        return "", ""
+        test_data = []
+        skipped = 0
 
-try:
-    with open(TEST_DATA_PATH, 'r', encoding='utf-8') as f:
-        test_data_raw = json.load(f)
-    
-    test_data = []
-    skipped = 0
-    
-    for idx, item in enumerate(test_data_raw, 1):
-        text = item.get("text", "")
-        if not text:
-            skipped += 1
-            continue
-        
-        question, reference = extract_qa_from_text(text)
-        if not question or not reference:
-            skipped += 1
-            continue
-        
-        test_data.append({
-            "question": question,
-            "reference": reference
-        })
-    
-    print(f"✅ Test data loaded: {len(test_data)} questions")
-    print(f"⚠️  Skipped: {skipped}")
-    
-    if len(test_data) == 0:
-        print("❌ ERROR: No valid test data!")
+        for idx, item in enumerate(iter_json_array(path), 1):
+            text = item.get("text", "")
+            if not text:
+                skipped += 1
+                continue
+
+            # Lenient: jawaban model tanpa <end_of_turn> tetap dipakai sampai akhir text
+            question, reference = extract_qa_from_text(text, allow_unclosed=True)
+            if not question or not reference:
+                skipped += 1
+                continue
+
+            test_data.append({
+                "question": question,
+                "reference": reference
+            })
+
+        print(f"✅ Test data loaded: {len(test_data)} questions")
+        print(f"⚠️  Skipped: {skipped}")
+
+        if len(test_data) == 0:
+            print("❌ ERROR: No valid test data!")
+            exit(1)
+
+    except Exception as e:
+        print(f"❌ ERROR: {e}")
         exit(1)
 
-except Exception as e:
-    print(f"❌ ERROR: {e}")
-    exit(1)
+    return test_data
+
+# ============================================================================
+# MODEL LOADING (satu model sekaligus)
+# ============================================================================
+def load_model(model_path):
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+
+    print(f"\n📂 Loading model: {model_path}")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    tokenizer.padding_side = "left"  # decoder-only: prompt harus rata kanan untuk batch generate
+    model = AutoModelForCausalLM.from_pretrained(
+        model_path,
+        torch_dtype=torch.float16,
+        device_map="auto"
+    )
+    model.eval()
+    print(f"✅ Model loaded!")
+    return model, tokenizer
 
-print("="*80)
+
+def release_memory():
+    """
+    Kosongkan memori setelah referensi model dilepas pemanggil (del model, tokenizer),
+    sebelum model berikutnya dimuat
+    """
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
 
 # ============================================================================
-# BATCH INFERENCE FUNCTION - SIMPLE VERSION
+# GENERATION (cache SQLite + resume)
 # ============================================================================
-def generate_answers_batch(model, tokenizer, questions, batch_size=8):
-    """Generate answers in batches - SIMPLE & CLEAN"""
-    all_answers = []
-    total = len(questions)
-    
-    for i in range(0, total, batch_size):
-        batch_q = questions[i:i+batch_size]
-        print(f"   Processing {i+1}-{min(i+batch_size, total)}/{total}...", end='\r')
-        
-        # Build prompts
-        prompts = [
-            f"<start_of_turn>system\n{SYSTEM_PROMPT}<end_of_turn>\n"
-            f"<start_of_turn>user\n{q}<end_of_turn>\n"
-            f"<start_of_turn>model\n"
-            for q in batch_q
-        ]
-        
-        # Tokenize
-        inputs = tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=2048).to(model.device)
-        
-        # Generate
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_new_tokens=256,
-                do_sample=False,  # Greedy
-                pad_token_id=tokenizer.eos_token_id
-            )
-        
-        # Decode - SIMPLE METHOD (seperti script original)
-        for output in outputs:
-            full_response = tokenizer.decode(output, skip_special_tokens=True)
-            
-            # Extract response setelah "model\n" (simple split)
-            if "<start_of_turn>model\n" in full_response:
-                response = full_response.split("<start_of_turn>model\n")[-1].strip()
-            else:
-                response = full_response.strip()
-            
-            response = response.replace("<end_of_turn>", "").strip()
-            all_answers.append(response)
-    
-    print()  # newline
-    return all_answers
+def generations_path(system):
+    return Path(OUTPUT_DIR) / "generations" / f"{system}.jsonl"
+
+
+def load_generations(system):
+    """
+    Jawaban tersimpan untuk sebuah sistem: dict question -> answer, dict question -> model
+    yang menghasilkannya, plus metadata run
+    """
+    path = generations_path(system)
+    answers, models = {}, {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    answers[record['question']] = record['answer']
+                    models[record['question']] = record.get('model')
+
+    meta_path = path.with_suffix('.meta.json')
+    meta = {'seconds': 0.0, 'batch_stats': {}, 'cache': {'hits': 0, 'misses': 0}}
+    if meta_path.exists():
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta.update(json.load(f))
+    return answers, models, meta
+
+
+def run_generation(model, tokenizer, questions, references, mode):
+    if mode == "continuous":
+        return generate_answers_continuous(model, tokenizer, questions, BATCH_SIZE, system_prompt=SYSTEM_PROMPT,
+                                           max_new_tokens=MAX_NEW_TOKENS, return_stats=True)
+    if mode == "static":
+        return generate_answers_batch(model, tokenizer, questions, BATCH_SIZE, system_prompt=SYSTEM_PROMPT,
+                                      max_new_tokens=MAX_NEW_TOKENS, return_stats=True)
+    return generate_answers_bucketed(model, tokenizer, questions, BATCH_SIZE, references=references,
+                                     system_prompt=SYSTEM_PROMPT, max_new_tokens=MAX_NEW_TOKENS,
+                                     bucket_width=BUCKET_WIDTH, return_stats=True)
+
+
+def generate_system(system, test_data, mode=GENERATION_MODE):
+    """
+    Ambil jawaban dari cache, generate hanya yang belum ada (model dimuat hanya jika perlu),
+    lalu tulis snapshot jawaban untuk test set ini ke generations/<sistem>.jsonl
+    """
+    model_path = SYSTEMS[system]
+    cache = GenerationCache(Path(OUTPUT_DIR) / "generation_cache.sqlite")
+    fingerprint = cache.model_fingerprint(model_path)
+
+    unique = {build_prompt(item['question'], SYSTEM_PROMPT): item for item in test_data}
+    print(f"\n🤖 {system}: {model_path}")
+    if fingerprint is None:
+        # Tanpa commit sha, jawaban lama bisa berasal dari versi model yang lain
+        print("   ⚠️  Revision model tidak bisa di-resolve ke commit sha: cache generasi tidak dipakai")
+        cached = {}
+        cache.stats['misses'] = len(unique)
+    else:
+        cached = cache.get_many(fingerprint, list(unique), DECODING_PARAMS)
+    todo = [(prompt, item) for prompt, item in unique.items() if prompt not in cached]
+
+    print(f"   Cache: {cache.stats['hits']} hit | {cache.stats['misses']} miss (perlu generate)")
+
+    meta = {'seconds': 0.0, 'batch_stats': {}, 'cache': dict(cache.stats)}
+    if todo:
+        model, tokenizer = load_model(model_path)
+        try:
+            for start in range(0, len(todo), GENERATION_CHUNK):
+                chunk = todo[start:start + GENERATION_CHUNK]
+                print(f"   Chunk {start + 1}-{start + len(chunk)}/{len(todo)}")
+
+                chunk_start = time.time()
+                chunk_answers, batch_stats = run_generation(
+                    model, tokenizer, [item['question'] for _, item in chunk],
+                    [item['reference'] for _, item in chunk], mode)
+                meta['seconds'] += time.time() - chunk_start
+                for key, value in batch_stats.items():
+                    meta['batch_stats'][key] = meta['batch_stats'].get(key, 0) + value
+
+                # Disimpan per chunk: run yang terputus dilanjutkan dari cache
+                if fingerprint is not None:
+                    cache.put_many(fingerprint, [prompt for prompt, _ in chunk], chunk_answers, DECODING_PARAMS)
+                cached.update((prompt, answer) for (prompt, _), answer in zip(chunk, chunk_answers))
+        finally:
+            # Referensi di fungsi ini yang menahan model; harus dilepas sebelum gc/empty_cache
+            del model, tokenizer
+            release_memory()
+    cache.close()
+
+    path = generations_path(system)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for prompt, item in unique.items():
+            f.write(json.dumps({"question": item['question'], "answer": cached[prompt],
+                                "model": model_path}, ensure_ascii=False) + '\n')
+    with open(path.with_suffix('.meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ {system} done: {meta['seconds']:.2f}s generation time")
+    if todo:
+        padding = padding_efficiency(meta['batch_stats'])
+        print(f"   Padding efficiency: {padding['total']:.1%} "
+              f"(prompt {padding['prompt']:.1%}, generation {padding['generation']:.1%})")
+
+
+def collect_answers(system, test_data):
+    """
+    Jawaban tersimpan sesuai urutan test data, error jika ada yang belum di-generate
+    atau di-generate dengan model lain dari SYSTEMS[system]
+    """
+    answers, models, meta = load_generations(system)
+    missing = sum(1 for item in test_data if item['question'] not in answers)
+    if missing:
+        print(f"❌ ERROR: {missing} pertanyaan belum punya jawaban {system}. Jalankan: generate --system {system}")
+        exit(1)
+
+    expected = SYSTEMS[system]
+    stale = sorted({models[item['question']] for item in test_data} - {expected}, key=str)
+    if stale:
+        print(f"❌ ERROR: jawaban {system} di-generate dengan model {', '.join(map(str, stale))}, "
+              f"bukan {expected}. Jalankan: generate --system {system}")
+        exit(1)
+    return [answers[item['question']] for item in test_data], meta
 
 # ============================================================================
-# MAIN EVALUATION
+# COMMANDS
 # ============================================================================
-def main():
+def generate_command(args):
+    test_data = load_test_data(args.test_data)
+    systems = list(SYSTEMS) if args.system == "all" else [args.system]
+    for system in systems:
+        generate_system(system, test_data, args.mode)
+
+
+def compare_command(args):
+    generate_command(args)
+    score_command(args)
+
+
+def score_command(args):
+    from bertscore_cache import CachedBERTScorer
+
+    test_data = load_test_data(args.test_data)
+
     print("\n" + "="*80)
     print("  BASELINE vs FINE-TUNED COMPARISON (BATCH MODE)")
     print("  BERT SCORE EVALUATION")
@@ -187,42 +277,38 @@ def main():
     print(f"📅 Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"📊 Total questions: {len(test_data)}")
     print(f"🔢 Batch size: {BATCH_SIZE}")
-    print(f"🤖 Baseline: {BASE_MODEL_NAME}")
-    print(f"🤖 Fine-tuned: {FINETUNED_MODEL_PATH}")
+    print(f"🤖 Baseline: {SYSTEMS['baseline']}")
+    print(f"🤖 Fine-tuned: {SYSTEMS['finetuned']}")
     print("="*80)
-    
+
     questions = [item['question'] for item in test_data]
     references = [item['reference'] for item in test_data]
-    
-    # Generate baseline answers
-    print("\n🔵 Generating BASELINE answers...")
-    start = time.time()
-    baseline_answers = generate_answers_batch(model_base, tokenizer_base, questions, BATCH_SIZE)
-    baseline_time = time.time() - start
-    print(f"✅ Baseline done: {baseline_time:.2f}s ({len(questions)/baseline_time:.2f} q/s)")
-    
-    # Generate fine-tuned answers
-    print("\n🟢 Generating FINE-TUNED answers...")
-    start = time.time()
-    finetuned_answers = generate_answers_batch(model_ft, tokenizer_ft, questions, BATCH_SIZE)
-    finetuned_time = time.time() - start
-    print(f"✅ Fine-tuned done: {finetuned_time:.2f}s ({len(questions)/finetuned_time:.2f} q/s)")
-    
+
+    baseline_answers, baseline_meta = collect_answers("baseline", test_data)
+    finetuned_answers, finetuned_meta = collect_answers("finetuned", test_data)
+    baseline_time = baseline_meta['seconds']
+    finetuned_time = finetuned_meta['seconds']
+    baseline_padding = padding_efficiency(baseline_meta['batch_stats'])
+    finetuned_padding = padding_efficiency(finetuned_meta['batch_stats'])
+
     # ========================================================================
     # CALCULATE BERT SCORES
     # ========================================================================
     print(f"\n{'='*80}")
     print("  CALCULATING BERT SCORES...")
     print(f"{'='*80}")
-    
-    # Baseline BERT Score
-    print("\n🔵 Calculating BASELINE BERT scores...")
-    P_base, R_base, F1_base = bert_score(baseline_answers, references, lang='id', verbose=False)
-    
-    # Fine-tuned BERT Score
-    print("🟢 Calculating FINE-TUNED BERT scores...")
-    P_ft, R_ft, F1_ft = bert_score(finetuned_answers, references, lang='id', verbose=False)
-    
+
+    # Embedding referensi dihitung sekali (dan di-cache ke disk), lalu dipakai semua sistem
+    print("\n🔵🟢 Calculating BASELINE & FINE-TUNED BERT scores...")
+    scorer = CachedBERTScorer(lang='id', cache_dir=f"{OUTPUT_DIR}/bertscore_cache")
+    scores = scorer.score_systems(
+        {"baseline": baseline_answers, "finetuned": finetuned_answers},
+        references
+    )
+    P_base, R_base, F1_base = scores["baseline"]
+    P_ft, R_ft, F1_ft = scores["finetuned"]
+    print(f"   Reference cache: {scorer.stats['ref_cache_hits']} hit, {scorer.stats['ref_encoded']} encoded")
+
     # Build results
     results = []
     for i in range(len(test_data)):
@@ -264,12 +350,14 @@ def main():
     print(f"   BERT Precision: {avg_base_p:.4f}")
     print(f"   BERT Recall:    {avg_base_r:.4f}")
     print(f"   Time:           {baseline_time:.2f}s")
+    print(f"   Gen. cache:     {baseline_meta['cache']['hits']} hit | {baseline_meta['cache']['misses']} miss")
     
     print(f"\n🟢 FINE-TUNED")
     print(f"   BERT F1:        {avg_ft_f1:.4f}")
     print(f"   BERT Precision: {avg_ft_p:.4f}")
     print(f"   BERT Recall:    {avg_ft_r:.4f}")
     print(f"   Time:           {finetuned_time:.2f}s")
+    print(f"   Gen. cache:     {finetuned_meta['cache']['hits']} hit | {finetuned_meta['cache']['misses']} miss")
     
     print(f"\n📈 IMPROVEMENT")
     print(f"   Δ F1:           {improvement:+.4f} ({improvement_pct:+.2f}%)")
@@ -289,22 +377,26 @@ def main():
     
     summary_data = {
         "timestamp": datetime.now().isoformat(),
-        "baseline_model": BASE_MODEL_NAME,
-        "finetuned_model": FINETUNED_MODEL_PATH,
-        "test_data": TEST_DATA_PATH,
+        "baseline_model": SYSTEMS["baseline"],
+        "finetuned_model": SYSTEMS["finetuned"],
+        "test_data": args.test_data,
         "total_questions": len(test_data),
         "batch_size": BATCH_SIZE,
         "baseline_metrics": {
             "avg_bert_f1": float(avg_base_f1),
             "avg_bert_precision": float(avg_base_p),
             "avg_bert_recall": float(avg_base_r),
-            "time_seconds": baseline_time
+            "time_seconds": baseline_time,
+            "padding_efficiency": baseline_padding,
+            "generation_cache": baseline_meta['cache']
         },
         "finetuned_metrics": {
             "avg_bert_f1": float(avg_ft_f1),
             "avg_bert_precision": float(avg_ft_p),
             "avg_bert_recall": float(avg_ft_r),
-            "time_seconds": finetuned_time
+            "time_seconds": finetuned_time,
+            "padding_efficiency": finetuned_padding,
+            "generation_cache": finetuned_meta['cache']
         },
         "improvement": {
             "delta_f1": float(improvement),
@@ -341,5 +433,38 @@ def main():
     print("✅ EVALUATION COMPLETE!")
     print(f"{'='*80}\n")
 
+def main():
+    global OUTPUT_DIR, BATCH_SIZE
+
+    parser = argparse.ArgumentParser(description="Evaluasi Baseline vs Fine-tuned dengan BERT Score")
+    parser.add_argument('--test-data', default=TEST_DATA_PATH)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--baseline-model', default=BASE_MODEL_NAME)
+    parser.add_argument('--finetuned-model', default=FINETUNED_MODEL_PATH)
+    # Tanpa subcommand: perilaku lama (evaluasi lengkap)
+    parser.set_defaults(func=compare_command, system='all', mode=GENERATION_MODE)
+    subparsers = parser.add_subparsers(dest='command')
+
+    generate_parser = subparsers.add_parser('generate', help='Generate jawaban (resume dari yang tersimpan)')
+    generate_parser.add_argument('--system', choices=list(SYSTEMS) + ['all'], default='all')
+    generate_parser.add_argument('--mode', choices=['static', 'bucketed', 'continuous'], default=GENERATION_MODE)
+    generate_parser.set_defaults(func=generate_command)
+
+    score_parser = subparsers.add_parser('score', help='Hitung BERT score dari jawaban tersimpan')
+    score_parser.set_defaults(func=score_command)
+
+    compare_parser = subparsers.add_parser('compare', help='Generate yang belum ada lalu score')
+    compare_parser.add_argument('--mode', choices=['static', 'bucketed', 'continuous'], default=GENERATION_MODE)
+    compare_parser.set_defaults(func=compare_command, system='all')
+
+    args = parser.parse_args()
+    OUTPUT_DIR = args.output_dir
+    BATCH_SIZE = args.batch_size
+    SYSTEMS["baseline"] = args.baseline_model
+    SYSTEMS["finetuned"] = args.finetuned_model
+
+    args.func(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()